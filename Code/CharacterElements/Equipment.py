@@ -1,19 +1,29 @@
+import sys
+
+
 class Equipment:
     """A class representing a piece of equipment."""
 
-    # a static dictionary that stores all the equipment item names within their appropriate tags.
-    tagGroups = {
-        "Ammunition": [], "Arcane focus": [], "Armor": [], "Artisan's tools": [], "Bludgeoning": [],  "Combat": [],
-        "Communication": [], "Consumable": [], "Container": [], "Control": [], "Currency": [], "Damage": [],
-        "Deception": [], "Detection": [], "Druidic focus": [], "Exploration": [], "Finesse": [], "Gaming set": [],
-        "Healing": [], "Heavy": [], "Heavy armor": [], "Holy symbol": [], "Light": [], "Light armor": [], "Loading": [],
-        "Martial": [], "Medium armor": [], "Melee": [], "Metal": [], "Movement": [], "Outerwear": [], "Instrument": [],
-        "Piercing": [], "Ranged": [], "Reach": [], "Simple": [], "Special": [], "Slashing": [], "Social": [],
-        "Stealth disadv": [], "Str limit": [], "Thrown": [], "Two-handed": [], "Utility": [], "Versatile": [],
-        "Warding": []
-    }
-    # a static array holding each equipment object, to avoid the need for repeated objects
+    __slots__ = ("range", "name", "tags", "description", "dice", "armorClass", "strLimit", "weight", "value")
+
+    # a static dictionary that stores all the equipment item names within sets for their appropriate tags.
+    tagGroups = {tag: set() for tag in [
+        "Ammunition", "Arcane focus", "Armor", "Artisan's tools", "Bludgeoning", "Combat", "Communication",
+        "Consumable", "Container", "Control", "Currency", "Damage", "Deception", "Detection", "Druidic focus",
+        "Exploration", "Finesse", "Gaming set", "Healing", "Heavy", "Heavy armor", "Holy symbol", "Light",
+        "Light armor", "Loading", "Martial", "Medium armor", "Melee", "Metal", "Movement", "Outerwear", "Instrument",
+        "Piercing", "Ranged", "Reach", "Simple", "Special", "Slashing", "Social", "Stealth disadv", "Str limit",
+        "Thrown", "Two-handed", "Utility", "Versatile", "Warding"
+    ]}
+    # an unchangeable copy of each tag group that's been requested, discarded whenever a group changes
+    frozenTagGroups = dict()
+    # the names of every martial or simple weapon, built upon first use and discarded whenever a weapon is added
+    weaponNames = None
+    # a static array holding each equipment object, to avoid the need for repeated objects. it's filled once, by
+    # DataConverter.load_catalogues while holding it's lock, and only read from then on
     allEquipment = []
+    # links each equipment name to the first object built with it
+    equipmentNames = dict()
 
     def __init__(self, name, tags, description,
                  dice="d", armor_class=0, weight=0, value="0cp", str_limit=0, item_range=None):
@@ -41,7 +51,7 @@ class Equipment:
         if item_range is None:
             item_range = [5, 5]
         self.range = item_range
-        self.name = name
+        self.name = sys.intern(name)
         self.tags = tags
         self.description = description
         if dice != "d":
@@ -56,29 +66,35 @@ class Equipment:
         self.value = value
 
         Equipment.allEquipment.append(self)
+        Equipment.equipmentNames.setdefault(name, self)
         self.sort_to_tags()
 
     def sort_to_tags(self):
         """
-        Adds a pointer to the object in the tagGroups dictionaries array for each of the objects tags.
+        Adds the object's name to the tagGroups dictionaries set for each of the objects tags.
         """
         for tag in self.tags:
-            Equipment.tagGroups[tag] = Equipment.tagGroups[tag] + [self.name]
+            Equipment.tagGroups[tag].add(self.name)
+            Equipment.frozenTagGroups.pop(tag, None)
+            if tag in ("Martial", "Simple"):
+                Equipment.weaponNames = None
 
-    def setup_armor_class(self, dex):
+    def get_armor_class(self, dex):
         """
-        Calculates the armor class based on the passed string and the character's dexterity.
+        Calculates the armor class the item provides, based on the passed string and the character's dexterity.
+        The stored armor class is left unchanged, as each item's object is shared by every character with the item.
         :param dex: the dexterity score of the character in possession of this item
         :type dex: int
+        :return: the int armor class
         """
         try:
-            self.armorClass = int(self.armorClass)
+            return int(self.armorClass)
         except ValueError:
-            self.armorClass = str(self.armorClass)
-            if "MAX" in self.armorClass:
-                self.armorClass = int(self.armorClass[:2]) + min(dex, int(self.armorClass[-2]))
+            armorClass = str(self.armorClass)
+            if "MAX" in armorClass:
+                return int(armorClass[:2]) + min(dex, int(armorClass[-2]))
             else:
-                self.armorClass = int(self.armorClass[:2]) + dex
+                return int(armorClass[:2]) + dex
 
 
     def __eq__(self, other):
@@ -152,20 +168,36 @@ def get_equipment(equipment_name):
     :type equipment_name: str
     :return: the equipment object matching the name
     """
-    for equipment in Equipment.allEquipment:
-        if equipment.name == equipment_name:
-            return equipment
-    return
+    return Equipment.equipmentNames.get(equipment_name)
 
 
 def get_tag_group(tag):
     """
-    Returns a specified tag array from the tagGroups class variable
+    Returns a specified tag group from the tagGroups class variable
     :param tag: the tag to get the group for
     :type tag: str
-    :return an array of strings
+    :return a frozenset of equipment name strings, or None if the tag isn't stored
+    """
+    if tag not in Equipment.tagGroups:
+        return None
+    # the group is kept in a local, as another thread may discard the stored copy between it being stored and returned
+    frozenGroup = Equipment.frozenTagGroups.get(tag)
+    if frozenGroup is None:
+        frozenGroup = frozenset(Equipment.tagGroups[tag])
+        Equipment.frozenTagGroups[tag] = frozenGroup
+    return frozenGroup
+
+
+def get_weapon_names():
+    """
+    Returns the names of every martial and simple weapon, as used to check weapon proficiencies.
+    :return: a frozenset of equipment name strings
     """
-    return Equipment.tagGroups.get(tag)
+    weaponNames = Equipment.weaponNames
+    if weaponNames is None:
+        weaponNames = get_tag_group("Martial") | get_tag_group("Simple")
+        Equipment.weaponNames = weaponNames
+    return weaponNames
 
 
 def get_all_tags():
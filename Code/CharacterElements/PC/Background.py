@@ -1,6 +1,11 @@
+import sys
+
+
 class Background:
     """A class representing a character's background."""
 
+    __slots__ = ("name", "proficiencies", "languages")
+
     def __init__(self, name, proficiencies, languages):
         """
         Sets up the core data the background contains.
@@ -11,7 +16,7 @@ class Background:
         :param languages: The languages this background provides.
         :type languages: list
         """
-        self.name = name
+        self.name = sys.intern(name)
         self.proficiencies = proficiencies
         self.languages = languages
 
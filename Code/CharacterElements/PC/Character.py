@@ -1,8 +1,11 @@
 import itertools
 import math
 
+import numpy as np
+
 from Code.CharacterElements import Equipment
 from Code.CharacterElements.PC import Magic
+from Code.Database import CoreDatabase as Db
 
 # a 2D array, storing all skills within their relative ability scores
 character_skills = [["Athletics"],  # strength
@@ -15,12 +18,117 @@ character_skills = [["Athletics"],  # strength
 # an array storing all the abilities' shortened names
 character_abilities = ["STR", "DEX", "CON", "INT", "WIS", "CHA"]
 
+# the filters held in a genome as the database id of their row, or 0 if the character doesn't have one
+genome_ids = ["Race", "Subrace", "Class", "Subclass", "Background"]
+# the filters held in a genome as a bitset over every row of a table, linked to that table
+genome_bitsets = {"Skills": "Proficiency", "Proficiencies": "Proficiency", "Languages": "Language"}
+# the filters held in a genome as a count of every row of a table, linked to that table, as characters can hold
+# more than one of the same spell, equipment item or trait, and each spell and trait held is evaluated
+# traits aren't part of a character's filters, but are included as the traits chosen when building change it's fitness
+genome_counts = {"Spells": "Spell", "Equipment": "Equipment", "Traits": "Trait"}
+genome_word_bits = 32
+genome_count_bits = 8
+
+# the layout of each bitset and count within a genome, and the database snapshot it was built from
+genomeLayout = dict()
+layoutSnapshot = None
+
+
+def get_genome_layout():
+    """
+    Gets where each bitset and count is held within a genome, building the layout if the database has changed since.
+    Genomes are only comparable with others encoded from the same database.
+    :return: a dictionary linking each bitset and count filter to it's first word, it's word amount, the bits each of
+             it's elements take up, and a dictionary linking each of it's table's row names to it's position
+    """
+    global layoutSnapshot
+    if Db.get_snapshot() is not layoutSnapshot:
+        genomeLayout.clear()
+        layoutSnapshot = Db.get_snapshot()
+
+        # the ids and ability scores take up the first words, with the bitsets and then the counts following in order
+        start = len(genome_ids) + len(character_abilities)
+        for elementBits, tables in [(1, genome_bitsets), (genome_count_bits, genome_counts)]:
+            for heading, table in tables.items():
+                names = list(Db.get_table_snapshot(table)["names"].keys())
+                wordAmnt = max(math.ceil(len(names) * elementBits / genome_word_bits), 1)
+                genomeLayout[heading] = (start, wordAmnt, elementBits,
+                                         {name: position for position, name in enumerate(names)})
+                start += wordAmnt
+    return genomeLayout
+
+
+def filters_to_genome(filters):
+    """
+    Encodes a character's filters, in the layout from Character.get_data_as_filters, as an integer genome.
+    The order of each list's elements isn't kept. Skills, proficiencies and languages are held as sets, while the
+    amount of each spell, equipment item and trait is kept, up to the most a count can hold. Any elements that aren't
+    rows of their table are left out, as they can never be chosen when building a character.
+    :param filters: the character's filters, optionally with the names of it's traits under "Traits"
+    :type filters: dict
+    :return: a numpy array of ints, laid out as the genome_ids, the ability scores in character_abilities
+             order, then each of the genome_bitsets and genome_counts
+    """
+    layout = get_genome_layout()
+    genome = np.zeros(sum(wordAmnt for (_, wordAmnt, _, _) in layout.values()) + len(genome_ids)
+                      + len(character_abilities), dtype=np.int32)
+
+    for index, heading in enumerate(genome_ids):
+        name = filters.get(heading)
+        genome[index] = 0 if name is None else Db.get_id(name, heading)
+
+    for index, ability in enumerate(character_abilities):
+        genome[len(genome_ids) + index] = filters["Abilities"][ability][0]
+
+    maxCount = 2 ** genome_count_bits - 1
+    for heading, (start, wordAmnt, elementBits, positions) in layout.items():
+        counts = np.zeros(wordAmnt * genome_word_bits // elementBits, dtype=np.int32)
+        for name in filters.get(heading, []):
+            if name in positions:
+                counts[positions[name]] += 1
+        if elementBits == 1:
+            words = np.packbits(counts > 0, bitorder="little")
+        else:
+            words = np.minimum(counts, maxCount).astype(np.uint8)
+        genome[start:start + wordAmnt] = words.view(np.int32)
+    return genome
+
+
+def genome_to_filters(genome):
+    """
+    Decodes an integer genome back into a character's filters.
+    Each list holds it's elements in the order of their table's rows, and the upper bound of each ability score is 17,
+    matching Character.get_data_as_filters.
+    :param genome: the genome, as from filters_to_genome
+    :type genome: class: `numpy.ndarray`
+    :return: the character's filters, in the layout from Character.get_data_as_filters, with the names of it's traits
+             under "Traits"
+    """
+    filters = dict()
+    for index, heading in enumerate(genome_ids):
+        if genome[index] != 0:
+            filters[heading] = Db.get_name(int(genome[index]), heading)
+
+    filters["Abilities"] = {ability: [int(genome[len(genome_ids) + index]), 17]
+                            for index, ability in enumerate(character_abilities)}
+
+    for heading, (start, wordAmnt, elementBits, positions) in get_genome_layout().items():
+        words = np.ascontiguousarray(genome[start:start + wordAmnt]).view(np.uint8)
+        if elementBits == 1:
+            counts = np.unpackbits(words, bitorder="little")
+        else:
+            counts = words
+        names = list(positions.keys())
+        filters[heading] = [names[position] for position in np.flatnonzero(counts[:len(names)])
+                            for _ in range(counts[position])]
+    return filters
+
 
 class Character:
     """A class representing a built character."""
 
-    armorClass = 0
-    health = 0
+    __slots__ = ("race", "chrClass", "background", "proficiencyBonus", "abilityScores", "languages", "traits",
+                 "proficiencies", "magic", "armorClass", "health")
 
     def __init__(self, race, chr_class, background, ability_scores):
         """
@@ -46,6 +154,7 @@ class Character:
         self.magic = self.setup_magic()
 
         # calculates the characters armor class and health
+        self.armorClass = 0
         self.setup_armor_class()
         self.setup_health()
 
@@ -66,8 +175,7 @@ class Character:
                 if "Shield" in eq.name:
                     self.armorClass += eq.armorClass
                 else:
-                    eq.setup_armor_class(self.abilityScores["DEX"] // 2 - 5)
-                    self.armorClass = eq.armorClass
+                    self.armorClass = eq.get_armor_class(self.abilityScores["DEX"] // 2 - 5)
         if self.armorClass == 0:
             self.armorClass = 10 + self.abilityScores["DEX"]//2 - 5
 
@@ -112,7 +220,7 @@ class Character:
                 saving_throws.append(proficiency)
             elif "armor" in proficiency or proficiency.lower() == "shield":
                 armor.append(proficiency)
-            elif proficiency in Equipment.get_tag_group("Martial") + Equipment.get_tag_group("Simple"):
+            elif proficiency in Equipment.get_weapon_names():
                 weapons.append(proficiency)
             elif proficiency in itertools.chain(*skills):
                 skills.append(proficiency)
@@ -173,9 +281,9 @@ class Character:
         """
         results = dict()
 
-        # gets basic information
+        # gets basic information. the lists are copied, as the filters are changed when mutating a chromosome
         results.update({'Race': self.race.raceName, 'Class': self.chrClass.className,
-                        'Background': self.background.name, 'Languages': self.languages})
+                        'Background': self.background.name, 'Languages': list(self.languages)})
 
         # gets equipment and spells
         results['Equipment'] = [e.name for e in self.chrClass.equipment]
@@ -185,7 +293,7 @@ class Character:
         profLayout = []
         for profType, proficiencies in self.proficiencies.items():
             if profType == "Skills":
-                results['Skills'] = proficiencies
+                results['Skills'] = list(proficiencies)
             else:
                 profLayout += proficiencies
         results['Proficiencies'] = profLayout
@@ -204,6 +312,16 @@ class Character:
 
         return results
 
+    def get_genome(self):
+        """
+        Encodes the character's data, including it's traits, as an integer genome, which can be decoded back into it's
+        filters with genome_to_filters.
+        :return: the genome, as a numpy array of ints
+        """
+        filters = self.get_data_as_filters()
+        filters["Traits"] = [trait[0] for trait in self.traits]
+        return filters_to_genome(filters)
+
     def __eq__(self, other):
         """
         Compares the character object with another character.
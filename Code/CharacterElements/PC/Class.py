@@ -1,10 +1,15 @@
 import itertools
+import sys
 
 from Code.CharacterElements.PC import Character
 
 
 class Class:
     """A python class representing a character's class."""
+
+    __slots__ = ("name", "className", "traits", "proficiencies", "equipment", "mainAbility", "secondAbility",
+                 "savingThrows", "hitDice", "magic", "languages", "level", "hasSubclass", "subclassItems")
+
     def __init__(self, name, traits, proficiencies, equipment, main_ability, second_ability, saving_throws, hit_dice,
                  languages, level, magic=None, subclass=None):
         """
@@ -36,8 +41,8 @@ class Class:
         """
         if languages is None:
             languages = []
-        self.name = name
-        self.className = name  # this is used for retaining the class name in cases of subclasses
+        self.name = sys.intern(name)
+        self.className = self.name  # this is used for retaining the class name in cases of subclasses
         self.traits = sorted(traits)
         self.proficiencies = sorted(proficiencies)
         self.equipment = sorted(equipment)
@@ -2,7 +2,8 @@
 class Magic:
     """A class representing all details of magic that a character class might require."""
 
-    preparedSpellAmnt = 0
+    __slots__ = ("spellAmount", "spellSlot", "knownSpells", "areSpellsPrepared", "preparedSpellCalculation",
+                 "preparedSpellOptions", "preparedSpellAmnt", "spellcasting")
 
     def __init__(self, spell_slot, are_spells_prepared, spell_amount=-1, known_spells=None,
                  prepared_spell_calculation=None, prepared_spell_options=None,
@@ -40,6 +41,7 @@ class Magic:
         self.areSpellsPrepared = are_spells_prepared
         self.preparedSpellCalculation = prepared_spell_calculation
         self.preparedSpellOptions = prepared_spell_options
+        self.preparedSpellAmnt = 0
 
         self.spellcasting = dict()
         if casting_abilities is not None:
@@ -1,6 +1,12 @@
+import sys
+
+
 class Race:
     """A class representing a character's race."""
 
+    __slots__ = ("name", "raceName", "languages", "proficiencies", "abilityScores", "traits", "speed", "size",
+                 "darkvision", "spellMod", "resistance", "hasSubrace", "spells")
+
     def __init__(self, name, languages, proficiencies, ability_scores, traits, speed=30, size="Medium",
                  darkvision=False, spells=None, spell_modifier=None, resistance=None, subrace=None):
         """
@@ -31,8 +37,8 @@ class Race:
         :type subrace: Race, optional
         """
 
-        self.name = name
-        self.raceName = name  # this is used for retaining the race name in cases of subraces
+        self.name = sys.intern(name)
+        self.raceName = self.name  # this is used for retaining the race name in cases of subraces
         self.languages = languages
         self.proficiencies = proficiencies
         self.abilityScores = ability_scores
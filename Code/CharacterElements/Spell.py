@@ -1,11 +1,19 @@
+import sys
+import threading
+
 from Code.Database import DataExtractor
 
 
 class Spell:
     """A class used to represent a singular spell."""
 
-    # all spells currently built in the system
-    builtSpells = []
+    __slots__ = ("name", "level", "castingTime", "duration", "range", "description", "area", "components", "school",
+                 "tags", "damage", "attack", "save", "__chrLevel")
+
+    # all spells currently built in the system, linked to by their (name, character level). a spell is never changed
+    # once built, so every thread can share them, and buildLock ensures each is only built once
+    builtSpells = dict()
+    buildLock = threading.Lock()
 
     def __init__(self, name, level, casting_time, duration, spell_range, components, school, tags, description,
                  damage=None, attack=None, save=None, area=None, chr_level=1):
@@ -41,7 +49,7 @@ class Spell:
         :type chr_level: int, optional
         """
 
-        self.name = name
+        self.name = sys.intern(name)
         self.level = level
         self.castingTime = casting_time
         self.duration = duration
@@ -57,7 +65,6 @@ class Spell:
         self.__chrLevel = chr_level
 
         self.cantrip_damage()
-        self.builtSpells.append(self)
 
     def update_chr_level(self, new_level):
         """
@@ -146,24 +153,33 @@ class Spell:
 
 def get_spell(spell_name, chr_level=1):
     """
-    Gets a specified spell from the array of built spells, or adds it if it currently isn't in there.
+    Gets a specified spell from the built spells, or builds it if it currently isn't in there.
     This is done to save building a substantial amount of objects for each spell.
     :param spell_name: the name of the spell to return
     :type spell_name: str
     :param chr_level: the level of the current character, relevant for cantrips
     :type chr_level: int
-    :return: the spell object, pointed to from the array
+    :return: the spell object, pointed to from the built spells
+    """
+    spell = Spell.builtSpells.get((spell_name, chr_level))
+    if spell is None:
+        with Spell.buildLock:
+            # another thread may have built it while this one waited
+            spell = Spell.builtSpells.get((spell_name, chr_level))
+            if spell is None:
+                spell = Spell(*DataExtractor.spell_info(spell_name, chr_level))
+                Spell.builtSpells[(spell_name, chr_level)] = spell
+    return spell
+
+
+def preload_spells(chr_level=1):
+    """
+    Builds every spell in the database for a character level, so later calls to get_spell don't query the database.
+    :param chr_level: the level of the characters the spells are for, relevant for cantrips
+    :type chr_level: int, optional
     """
-    # determines if the spell is built
-    spellIndex = -1
-    spellArray = Spell.builtSpells
-    for x in range(0, len(spellArray)):
-        if spellArray[x].name == spell_name:
-            spellIndex = x
-
-    if spellIndex == -1:
-        Spell.builtSpells.append(Spell(*DataExtractor.spell_info(spell_name, chr_level)))
-        spellIndex = len(Spell.builtSpells) - 1
-
-    return Spell.builtSpells[spellIndex]
+    with Spell.buildLock:
+        for spellInfo in DataExtractor.all_spell_info(chr_level):
+            if (spellInfo[0], chr_level) not in Spell.builtSpells:
+                Spell.builtSpells[(spellInfo[0], chr_level)] = Spell(*spellInfo)
 
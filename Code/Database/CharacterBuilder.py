@@ -4,8 +4,7 @@ from collections import Counter
 import numpy as np
 
 from Code.CharacterElements.PC import Character
-from Code.Database import CoreDatabase as Db, DataConverter
-from Code.Optimisation import ChromosomeController
+from Code.Database import CoreDatabase as Db, DataConverter, QueryCatalogue as Queries
 
 
 def take_choices(choices):
@@ -49,38 +48,28 @@ def extract_choice(choice, choice_loc, places_from):
     """
     options = []
     choiceLocLower = choice_loc.lower()
-    choice = choice.replace("'", "''")
     for place in places_from:
         basePlace = place[0].lower() + place[1:]
         place = place.replace("Options", "")
 
-        call = f"SELECT {basePlace}Id FROM {place}{choice_loc} WHERE {choiceLocLower}Id IN (" \
-               f"SELECT {choiceLocLower}Id FROM {choice_loc} WHERE {choiceLocLower}Name='{choice}'))"
-
         if "Options" in basePlace:
-            call = f"SELECT {place.lower()}Name FROM {place} WHERE {place.lower()}Id IN (" \
-                   f"SELECT {place.lower()}Id FROM {basePlace.capitalize()} WHERE {basePlace}Id IN (" + call + ")"
+            results = Queries.fetch_all("choiceOptionsNames", (choice,), base=basePlace, place=place,
+                                        placeLower=place.lower(), optionsTable=basePlace.capitalize(),
+                                        choiceTable=choice_loc, choiceLower=choiceLocLower)
         elif choice_loc == "Equipment":
-            call = f"SELECT className FROM Class WHERE classId IN (" \
-                   f"SELECT classId FROM EquipmentOption WHERE equipOptionId IN (" \
-                   f"SELECT equipmentOptionId FROM EquipmentIndivOption WHERE equipmentId=(" \
-                   f"SELECT equipmentId FROM Equipment WHERE equipmentName='{choice}')))"
+            results = Queries.fetch_all("equipmentClasses", (choice,))
         elif choice_loc == "Spell":
-            call = f"SELECT {basePlace}Name FROM {place} WHERE {basePlace}Id IN ("
             if place == "Race":
-                call += "SELECT raceId FROM RaceOptions WHERE raceOptionsId IN (" \
-                        "SELECT raceOptionsId FROM RaceSpell WHERE spellId IN ("
+                results = Queries.fetch_all("spellRaceNames", (choice,))
             else:
-                call += "SELECT classId FROM Magic WHERE magicId IN (" \
-                        "SELECT magicId FROM ClassSpell WHERE spellId IN ("
-            call += f"SELECT spellId FROM Spell WHERE spellName='{choice}')))"
+                results = Queries.fetch_all("spellClassNames", (choice,))
         else:
-            call = f"SELECT {basePlace}Name FROM {place} WHERE {basePlace}Id IN (" + call
+            results = Queries.fetch_all("choiceNames", (choice,), base=basePlace, place=place,
+                                        choiceTable=choice_loc, choiceLower=choiceLocLower)
 
-        Db.cursor.execute(call)
-        for result in itertools.chain(*Db.cursor.fetchall()):
+        for result in itertools.chain(*results):
             options.append(place + ": " + result)
-    return {choice.replace("''", "'"): options}
+    return {choice: options}
 
 
 def option_combos(options, option_counter):
@@ -136,7 +125,7 @@ def order_outputs(selections):
     return selectionDict
 
 
-def change_filter(character, filters, element, modifier):
+def change_filter(character, filters, element, modifier, const_filters):
     """
     Modifies one filter in a dictionary of chromosome filters.
     :param character: the character that is being adjusted
@@ -147,6 +136,8 @@ def change_filter(character, filters, element, modifier):
     :type element: str
     :param modifier: the modifier number produced, used to help randomise adjustment
     :type modifier: int
+    :param const_filters: the constant filters of the run, which must all still be met after the change
+    :type const_filters: dict
     :return: newly modified filters
     """
     # Race, Class, Background - any option
@@ -158,17 +149,17 @@ def change_filter(character, filters, element, modifier):
 
     while not validResults:
         if element in ("Race", "Class", "Subrace", "Subclass"):
-            modifiedFilters = change_core_filter(filters, element, modifier, character)
+            modifiedFilters = change_core_filter(filters, element, modifier, character, const_filters)
 
         elif element == "Background":
             modifiedFilters = change_background_filter(filters, character, modifier)
 
         elif element == "Spells":
-            modifiedFilters = change_spell_filter(character, filters, modifier)
+            modifiedFilters = change_spell_filter(character, filters, modifier, const_filters)
 
         elif element == "Equipment":
             currentEquip = [e.name for e in character.chrClass.equipment]
-            modifiedFilters = change_equipment_filter(currentEquip, filters, modifier)
+            modifiedFilters = change_equipment_filter(currentEquip, filters, modifier, const_filters)
 
         else:
             # languages, proficiencies or skills
@@ -176,17 +167,18 @@ def change_filter(character, filters, element, modifier):
                 elementSingular = "Proficiency"
             else:
                 elementSingular = element[:-1]
-            modifiedFilters = change_basic_filter(character, filters, modifier, element, elementSingular)
+            modifiedFilters = change_basic_filter(character, filters, modifier, element, elementSingular,
+                                                  const_filters)
 
         # makes sure all must-have filters are used
         # this is also checked wherever possible during the change process, but cannot be done everywhere
-        matchedFilters = [x for x in modifiedFilters if x in ChromosomeController.constFilters]
-        validResults = len(matchedFilters) == len(ChromosomeController.constFilters)
+        matchedFilters = [x for x in modifiedFilters if x in const_filters]
+        validResults = len(matchedFilters) == len(const_filters)
 
     return modifiedFilters
 
 
-def change_core_filter(filters, element, modifier, character, subset=None):
+def change_core_filter(filters, element, modifier, character, const_filters, subset=None):
     """
     Modifies a core filter, trying to keep all other filters as similar as possible in the process.
     A core filter refers to Race, Class and Background - the three top-end elements.
@@ -199,36 +191,39 @@ def change_core_filter(filters, element, modifier, character, subset=None):
     :type modifier: int
     :param character: the character that is being adjusted
     :type character: class: `CharacterElements.Character`
+    :param const_filters: the constant filters of the run, which the change mustn't remove
+    :type const_filters: dict
     :param subset: a subset of options the new change must be from
     :type subset: list, optional
     :return: newly modified filters
     """
     # if no subset is provided, set it to all potential options that aren't the current option
     if subset is None:
-        sqlCall = f"SELECT {element.lower()}Name FROM {element} " \
-                  f"WHERE {element.lower()}Name != '{filters[element]}'"
         if "Sub" in element:
             parentTable = element.replace('Sub', '')
-            Db.cursor.execute(f"SELECT {parentTable}Id FROM {element} "
-                              f"WHERE {element.lower()}Name = '{filters[element]}'")
-            sqlCall = sqlCall + f" AND {parentTable}Id=" + str(Db.cursor.fetchone()[0])
-        Db.cursor.execute(sqlCall)
-        subset = list(itertools.chain(*Db.cursor.fetchall()))
+            parentId = Queries.fetch_one("subParentId", (filters[element],), parent=parentTable, element=element,
+                                         elementLower=element.lower())[0]
+            results = Queries.fetch_all("otherSubNames", (filters[element], parentId), parent=parentTable,
+                                        element=element, elementLower=element.lower())
+        else:
+            results = Queries.fetch_all("otherCoreNames", (filters[element],), element=element,
+                                        elementLower=element.lower())
+        subset = list(itertools.chain(*results))
 
     # get the value at the modifier position if there is one, or choose a random one otherwise
     # avoids overwriting const filters
-    if len(set(filters[element]) - set(ChromosomeController.constFilters.get(element, []))) == 0:
+    if len(set(filters[element]) - set(const_filters.get(element, []))) == 0:
         return filters
     modifier = check_modifier(modifier, subset)
     choice = subset[modifier]
-    while choice in ChromosomeController.constFilters.get(element, []):
+    while choice in const_filters.get(element, []):
         modifier = check_modifier(100, subset)  # this is set to 100 to guarantee a new random value
         choice = subset[modifier]
 
     if "Sub" not in element:
-        subId = "IS NULL"
+        subId = None
     else:
-        subId = "= " + str(Db.get_id(choice, element))
+        subId = Db.get_id(choice, element)
 
     # gets the data the current core filter provides
     # subrace is treat the same as race as no race with subraces has a choice outside the subrace
@@ -251,22 +246,17 @@ def change_core_filter(filters, element, modifier, character, subset=None):
 
     element = element.replace("Sub", "").capitalize()
     newData = dict()
-    Db.cursor.execute(f"SELECT {element.lower()}OptionsId, amntToChoose FROM {element}Options "
-                      f"WHERE {element.lower()}Id={Db.get_id(choice, element)} AND sub{element.lower()}Id {subId}")
-    results = Db.cursor.fetchall()
+    results = Queries.fetch_all("coreOptions", (Db.get_id(choice, element), subId), element=element,
+                                elementLower=element.lower())
     for (opId, amnt) in results:
         for elem in ["language", "proficiency", "spell"]:
             # find any data linked to the RaceOptions/ClassOptions
             if elem == "spell" and element == "Class":
-                Db.cursor.execute(f"SELECT spellName FROM Spell WHERE spellId IN ("
-                                  f"SELECT spellId FROM ClassSpell WHERE magicId IN ("
-                                  f"SELECT magicId FROM Magic WHERE classId={Db.get_id(choice, 'Class')} "
-                                  f"AND subclassId {subId}))")
+                items = Queries.fetch_all("classMagicSpells", (Db.get_id(choice, 'Class'), subId))
             else:
-                Db.cursor.execute(f"SELECT {elem}Name FROM {elem.capitalize()} WHERE {elem}Id IN ("
-                                  f"SELECT {elem}Id FROM {element}{elem.capitalize()} "
-                                  f"WHERE {element.lower()}OptionsId={opId})")
-            items = list(set(itertools.chain(*Db.cursor.fetchall())))
+                items = Queries.fetch_all("optionItemNames", (opId,), elem=elem, elemTable=elem.capitalize(),
+                                          element=element, elementLower=element.lower())
+            items = list(set(itertools.chain(*items)))
             # if this is the data the results are for, add all items if there's no choice, or all items that the old
             # one had if there is - all extra choices will be made during construction
             if len(items) > 0:
@@ -288,7 +278,7 @@ def change_core_filter(filters, element, modifier, character, subset=None):
     return filters
 
 
-def change_spell_filter(character, filters, modifier):
+def change_spell_filter(character, filters, modifier, const_filters):
     """
     Modifies one spell in the filters, and anything else required to achieve this.
     :param character: the character that is being adjusted
@@ -297,36 +287,28 @@ def change_spell_filter(character, filters, modifier):
     :type filters: dict
     :param modifier: the modifier number produced, used to help randomise adjustment
     :type modifier: int
+    :param const_filters: the constant filters of the run, which the change mustn't remove
+    :type const_filters: dict
     :return: newly modified filters
     """
     # if the character currently has spells from more than just race
     currentSpells = filters.get("Spells", [])
     if character.chrClass.magic is not None:
-        spells = tuple("'" + s.name.replace("'", "''") + "'" for s in character.magic.knownSpells)
-        spells = spells.__str__().replace('"', '')
-        if spells[-2] == ",":
-            spells = spells[:-2] + ")"
+        params = [s.name for s in character.magic.knownSpells] + [Db.get_id(character.chrClass.className, 'Class')]
 
         # changes only cantrips
         if character.magic.areSpellsPrepared:
-            Db.cursor.execute(f"SELECT spellName FROM Spell WHERE spellLevel=0 AND "
-                              f"spellName NOT IN {spells} AND spellId IN ("
-                              f"SELECT spellId FROM ClassSpell WHERE magicId IN ("
-                              f"SELECT magicId FROM Magic WHERE classId = "
-                              f"{str(Db.get_id(character.chrClass.className, 'Class'))}))")
+            spells = Queries.fetch_all("otherClassCantrips", params)
         # changes anything
         else:
-            Db.cursor.execute(f"SELECT spellName FROM Spell WHERE spellName NOT IN {spells} AND spellId IN ("
-                              f"SELECT spellId FROM ClassSpell WHERE magicId IN ("
-                              f"SELECT magicId FROM Magic WHERE classId = "
-                              f"{str(Db.get_id(character.chrClass.className, 'Class'))}))")
+            spells = Queries.fetch_all("otherClassSpells", params)
 
-        spells = list(set(itertools.chain(*Db.cursor.fetchall())))
+        spells = list(set(itertools.chain(*spells)))
         # avoids overwriting const filters
-        if len(set(currentSpells) - set(ChromosomeController.constFilters.get("Spells", []))) == 0 or len(spells) == 0:
+        if len(set(currentSpells) - set(const_filters.get("Spells", []))) == 0 or len(spells) == 0:
             return filters
         modifier = check_modifier(modifier, currentSpells)
-        while currentSpells[modifier] in ChromosomeController.constFilters.get("Spells", []):
+        while currentSpells[modifier] in const_filters.get("Spells", []):
             modifier = check_modifier(100, currentSpells)  # this is set to 100 to guarantee a new random value
         currentSpells[modifier] = spells[np.random.randint(0, len(spells))]
         filters["Spells"] = currentSpells
@@ -335,38 +317,31 @@ def change_spell_filter(character, filters, modifier):
     elif len(character.race.spells) > 0:
         if modifier//5 == 0:
             # change to any race other than the current - this will change the spells by either swapping or removing
-            filters = change_core_filter(filters, "Race", modifier, character)
+            filters = change_core_filter(filters, "Race", modifier, character, const_filters)
         else:
             # change to any class other than the current that has some amount of spells
-            Db.cursor.execute("SELECT className FROM Class WHERE classId IN ("
-                              "SELECT classId FROM Magic WHERE (cantripsKnown > 0 OR amntKnown > 0))")
-            classes = list(set(itertools.chain(*Db.cursor.fetchall())))
+            classes = list(set(itertools.chain(*Queries.fetch_all("magicClasses"))))
             if character.chrClass.className in classes:
                 classes.remove(character.chrClass.className)
-            filters = change_core_filter(filters, "Class", modifier, character, classes)
+            filters = change_core_filter(filters, "Class", modifier, character, const_filters, classes)
 
     # if they have no spells
     else:
         if modifier//5 == 0:
             # change race to one with spells
-            Db.cursor.execute("SELECT raceName FROM Race WHERE raceId IN ("
-                              "SELECT raceId FROM RaceOptions WHERE raceOptionsId IN ("
-                              "SELECT raceOptionsId FROM RaceSpell))")
-            races = list(set(itertools.chain(*Db.cursor.fetchall())))
+            races = list(set(itertools.chain(*Queries.fetch_all("magicRaces"))))
             if character.race.raceName in races:
                 races.remove(character.race.raceName)
-            filters = change_core_filter(filters, "Race", modifier, character, races)
+            filters = change_core_filter(filters, "Race", modifier, character, const_filters, races)
         else:
             # change class to one with spells
-            Db.cursor.execute("SELECT className FROM Class WHERE classId IN ("
-                              "SELECT classId FROM Magic WHERE (cantripsKnown > 0 OR amntKnown > 0))")
-            classes = list(set(itertools.chain(*Db.cursor.fetchall())))
-            filters = change_core_filter(filters, "Class", modifier, character, classes)
+            classes = list(set(itertools.chain(*Queries.fetch_all("magicClasses"))))
+            filters = change_core_filter(filters, "Class", modifier, character, const_filters, classes)
 
     return filters
 
 
-def change_equipment_filter(current_equip, filters, modifier):
+def change_equipment_filter(current_equip, filters, modifier, const_filters):
     """
     Modifies one piece of equipment to another piece available for the given class.
     :param current_equip: a list of the names of the current equipment the character owns
@@ -375,39 +350,33 @@ def change_equipment_filter(current_equip, filters, modifier):
     :type filters: dict
     :param modifier: the modifier number produced, used to help randomise adjustment
     :type modifier: int
+    :param const_filters: the constant filters of the run, which the change mustn't remove
+    :type const_filters: dict
     :return: newly modified filters
     """
-    Db.cursor.execute("SELECT equipOptionId, suboption FROM EquipmentOption WHERE hasChoice = 1 AND classId="
-                      + str(Db.get_id(filters["Class"], "Class")))
-    options = Db.cursor.fetchall()
+    options = Queries.fetch_all("classEquipmentChoices", (Db.get_id(filters["Class"], "Class"),))
     option, suboption = options[np.random.randint(0, len(options))]
     itemsToRemove = []
 
     # react to the suboption as appropriate
     if suboption is not None:
-        Db.cursor.execute("SELECT hasChoice FROM EquipmentOption WHERE equipOptionId =" + str(suboption))
-        if Db.cursor.fetchone()[0] == 1:
+        if Queries.fetch_one("equipmentOptionHasChoice", (suboption,))[0] == 1:
             option = suboption
         else:
-            Db.cursor.execute(f"SELECT equipmentName FROM Equipment WHERE equipmentId IN ("
-                              f"SELECT equipmentId FROM EquipmentIndivOption WHERE equipmentOptionId = {suboption})")
-            itemsToRemove = list(itertools.chain(*Db.cursor.fetchall()))
+            itemsToRemove = list(itertools.chain(*Queries.fetch_all("equipmentOptionItemNames", (suboption,))))
 
     # remove the appropriate amount of the item being unselected
-    Db.cursor.execute(f"SELECT equipmentName FROM Equipment WHERE equipmentId IN ("
-                      f"SELECT equipmentId FROM EquipmentIndivOption WHERE equipmentOptionId = {option})")
-    equipmentItems = list(itertools.chain(*Db.cursor.fetchall()))
+    equipmentItems = list(itertools.chain(*Queries.fetch_all("equipmentOptionItemNames", (option,))))
     for equipmentItem in equipmentItems:
         if equipmentItem in current_equip:
-            Db.cursor.execute("SELECT amnt FROM EquipmentIndivOption WHERE equipmentId="
-                              + str(Db.get_id(equipmentItem, "Equipment")) + " AND equipmentOptionId=" + str(option))
-            for x in range(Db.cursor.fetchone()[0]):
+            amnt = Queries.fetch_one("equipmentOptionAmount", (Db.get_id(equipmentItem, "Equipment"), option))[0]
+            for x in range(amnt):
                 itemsToRemove.append(equipmentItem)
             equipmentItems.remove(equipmentItem)
             break
 
     # update and return the filters, providing no const-filter collisions have been created
-    if len(set(itemsToRemove).intersection(set(ChromosomeController.constFilters.get("Equipment", [])))) == 0 \
+    if len(set(itemsToRemove).intersection(set(const_filters.get("Equipment", [])))) == 0 \
             and len(equipmentItems) > 0:
         modifier = check_modifier(modifier, equipmentItems)
         for item in itemsToRemove:
@@ -418,7 +387,7 @@ def change_equipment_filter(current_equip, filters, modifier):
     return filters
 
 
-def change_basic_filter(character, filters, modifier, element, table_name):
+def change_basic_filter(character, filters, modifier, element, table_name, const_filters):
     """
     Modifies one basic filter in the filters, and anything else required to achieve this. A basic filter may be a
     language, a proficiency or a skill.
@@ -432,6 +401,8 @@ def change_basic_filter(character, filters, modifier, element, table_name):
     :type element: str
     :param table_name: the database table name for the element
     :type table_name: str
+    :param const_filters: the constant filters of the run, which the change mustn't remove
+    :type const_filters: dict
     :return: newly modified filters
     """
     background = character.background.name
@@ -446,15 +417,14 @@ def change_basic_filter(character, filters, modifier, element, table_name):
         backgroundItems = [prof for prof in character.background.proficiencies
                            if prof not in skillsList]
 
-    if len(set(backgroundItems) - set(ChromosomeController.constFilters.get(element, []))) == 0:
+    if len(set(backgroundItems) - set(const_filters.get(element, []))) == 0:
         return filters
 
     # if the background provides the correct type of basic filter
     if len(backgroundItems) > 0:
-        Db.cursor.execute(f"SELECT {table_name.lower()}Name FROM {table_name} WHERE {table_name.lower()}Id IN ("
-                          f"SELECT {table_name.lower()}Id FROM Background{table_name} WHERE backgroundId="
-                          f"{str(Db.get_id(background, 'Background'))})")
-        results = list(set(itertools.chain(*Db.cursor.fetchall())))
+        results = Queries.fetch_all("backgroundItemNames", (Db.get_id(background, 'Background'),), table=table_name,
+                                    tableLower=table_name.lower())
+        results = list(set(itertools.chain(*results)))
         # adjusts results appropriately
         if element == "Languages":
             results = [lang for lang in results if lang not in character.languages]
@@ -464,7 +434,7 @@ def change_basic_filter(character, filters, modifier, element, table_name):
         # if it can make the successful filter change, it does. Otherwise, it continues to the code below
         if len(results) > 0 and len(set(results) - set(filters[element])) > 0:
             replacedItem = backgroundItems[np.random.randint(0, len(backgroundItems))]
-            while replacedItem in ChromosomeController.constFilters.get(element, []) \
+            while replacedItem in const_filters.get(element, []) \
                     or replacedItem not in filters[element]:
                 replacedItem = backgroundItems[np.random.randint(0, len(backgroundItems))]
 
@@ -481,8 +451,7 @@ def change_basic_filter(character, filters, modifier, element, table_name):
         elementAmnt = "toolAmnt"
     else:
         elementAmnt = element[:-1].lower() + "Amnt"
-    Db.cursor.execute(f"SELECT backgroundName FROM Background WHERE {elementAmnt} > 0")
-    options = list(set(itertools.chain(*Db.cursor.fetchall())))
+    options = list(set(itertools.chain(*Queries.fetch_all("backgroundsWithChoice", amountColumn=elementAmnt))))
     options.remove(background)
     modifier = check_modifier(modifier, options)
     newBackground = options[modifier]
@@ -505,27 +474,16 @@ def change_background_filter(filters, character, modifier, new_background=None):
     :return: newly modified filters
     """
     if new_background is None:
-        Db.cursor.execute(f"SELECT backgroundName FROM Background WHERE backgroundName != '{filters['Background']}'")
-        options = list(itertools.chain(*Db.cursor.fetchall()))
+        options = list(itertools.chain(*Queries.fetch_all("otherBackgrounds", (filters['Background'],))))
         modifier = check_modifier(modifier, options)
         new_background = options[modifier]
 
     # gets everything the background offers
-    Db.cursor.execute(f"SELECT proficiencyName FROM Proficiency WHERE proficiencyType = 'Skill' AND proficiencyId IN ("
-                      f"SELECT proficiencyId FROM BackgroundProficiency WHERE "
-                      f"backgroundId = {str(Db.get_id(new_background, 'Background'))})")
-    skills = list(itertools.chain(*Db.cursor.fetchall()))
-    Db.cursor.execute(f"SELECT proficiencyName FROM Proficiency WHERE proficiencyType = 'Tool' AND proficiencyId IN ("
-                      f"SELECT proficiencyId FROM BackgroundProficiency WHERE "
-                      f"backgroundId = {str(Db.get_id(new_background, 'Background'))})")
-    tools = list(itertools.chain(*Db.cursor.fetchall()))
-    Db.cursor.execute(f"SELECT languageName FROM Language WHERE languageId IN ("
-                      f"SELECT languageId FROM BackgroundLanguage WHERE "
-                      f"backgroundId = {str(Db.get_id(new_background, 'Background'))})")
-    langs = list(itertools.chain(*Db.cursor.fetchall()))
-    Db.cursor.execute(f"SELECT skillAmnt, languageAmnt, toolAmnt FROM Background "
-                      f"WHERE backgroundId={str(Db.get_id(new_background, 'Background'))}")
-    skillAmnt, langAmnt, toolAmnt = Db.cursor.fetchone()
+    backgroundId = Db.get_id(new_background, 'Background')
+    skills = list(itertools.chain(*Queries.fetch_all("backgroundProficiencies", ("Skill", backgroundId))))
+    tools = list(itertools.chain(*Queries.fetch_all("backgroundProficiencies", ("Tool", backgroundId))))
+    langs = list(itertools.chain(*Queries.fetch_all("backgroundLanguages", (backgroundId,))))
+    skillAmnt, langAmnt, toolAmnt = Queries.fetch_one("backgroundAmounts", (backgroundId,))
 
     # gets all items both the old and new background had, then adds random ones until the background is full
     results = []
@@ -1,12 +1,12 @@
 class ChoiceStruct:
-    contents = []
-
     def __init__(self, choices):
         """
         Initialises a ChoiceStruct to contain the appropriate choices.
         :param choices: the choices to be transformed into Choice objects
         :type choices: dict
         """
+        # each struct has it's own contents, so the choices for one character are never offered to another
+        self.contents = []
         if type(choices) is dict:
             for choice_type, (choice, subchoices) in choices.items():
                 self.append(Choice(choice_type, choice, subchoices))
@@ -1,9 +1,35 @@
+import atexit
 import os
+import pathlib
+import re
 import sqlite3 as sql
+import sys
+import threading
+import time
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
+# the connection of the thread that loaded this module, which is the only one that writes to the database.
+# sqlite connections can only be used by the thread that opened them, so any other thread querying the database, such
+# as an optimisation worker, opens it's own read-only connection with connect_read_only
 connection = sql.connect(dir_path + "/Resources/ChrDatabase.db")
 cursor = connection.cursor()
+# holds the read-only connection and cursor of each other thread that has opened one
+threadConnections = threading.local()
+
+# a read-only copy of every table held in memory, linking each table name to the indexes built for it.
+# it is built upon first use and discarded whenever the database is written to. once built it is only ever read, so
+# every thread can share it, and snapshotLock ensures threads needing it at once wait for a single build
+snapshot = None
+snapshotLock = threading.Lock()
+
+# whether every statement run is recorded, as enabled with enable_profiling
+profiling = False
+# links each normalised statement to [times run, total seconds, max seconds, rows returned]
+statementStats = dict()
+# links each (normalised statement, calling function) pair to the amount of times the function ran the statement
+statementCallers = dict()
+# every thread's cursor adds to the same records, so they're updated one thread at a time
+profileLock = threading.Lock()
 
 
 def int_input(prompt):
@@ -44,6 +70,51 @@ def complete_setup():
     """
     connection.commit()
     connection.close()
+    invalidate_snapshot()
+
+
+def connect_read_only(this_thread=False):
+    """
+    Opens a new read-only database connection, for processes and threads that only ever query the database.
+    :param this_thread: whether the connection is only for the current thread, leaving the shared connection for the
+                        rest of the process, rather than replacing the shared connection
+    :type this_thread: bool, optional
+    """
+    global connection, cursor
+    databaseUri = pathlib.Path(dir_path + "/Resources/ChrDatabase.db").as_uri() + "?mode=ro"
+    if this_thread:
+        threadConnections.connection = sql.connect(databaseUri, uri=True)
+        threadConnections.cursor = wrap_cursor(threadConnections.connection.cursor())
+    else:
+        connection = sql.connect(databaseUri, uri=True)
+        cursor = wrap_cursor(connection.cursor())
+        invalidate_snapshot()
+
+
+def close_thread_connection():
+    """
+    Closes the current thread's own read-only connection, if it has one.
+    """
+    threadConnection = getattr(threadConnections, "connection", None)
+    if threadConnection is not None:
+        threadConnection.close()
+        del threadConnections.connection, threadConnections.cursor
+
+
+def get_connection():
+    """
+    Gets the connection the current thread queries the database with.
+    :return: the thread's own read-only connection if it opened one, otherwise the shared connection
+    """
+    return getattr(threadConnections, "connection", connection)
+
+
+def get_cursor():
+    """
+    Gets the cursor the current thread queries the database with.
+    :return: the thread's own read-only cursor if it opened a connection, otherwise the shared cursor
+    """
+    return getattr(threadConnections, "cursor", cursor)
 
 
 def view_tables():
@@ -63,6 +134,86 @@ def view_tables():
     print(output)
 
 
+def load_snapshot():
+    """
+    Loads every table in the database into memory, indexing the rows of each by their id and name where possible.
+    A separate cursor on the current thread's connection is used, so that any results waiting on the thread's cursor
+    are left untouched.
+    :return: a dictionary linking each table name to a dictionary of it's columns, primary key columns, rows in rowid
+             order, and the id to row, id to name and name to id indexes
+    """
+    global snapshot
+    snapshotCursor = wrap_cursor(get_connection().cursor())
+    snapshotCursor.execute("SELECT name FROM sqlite_master WHERE type = 'table';")
+    tables = [table[0] for table in snapshotCursor.fetchall()]
+
+    newSnapshot = dict()
+    for table in tables:
+        # the rows are explicitly kept in their stored order, rather than the order of any index sqlite chooses to read
+        snapshotCursor.execute(f"SELECT * FROM `{table}` ORDER BY rowid")
+        columns = [description[0] for description in snapshotCursor.description]
+        rows = snapshotCursor.fetchall()
+        snapshotCursor.execute(f"PRAGMA table_info('{table}');")
+        primaryKey = [name for (_, name, _, _, _, pk) in sorted(snapshotCursor.fetchall(), key=lambda col: col[5])
+                      if pk > 0]
+        idColumn = table_to_id(table)
+        nameColumn = idColumn[:-2] + "Name"
+
+        # the first matching row is kept for any repeated id or name, matching the result of a fetchone call
+        ids, idNames, names = dict(), dict(), dict()
+        if idColumn in columns:
+            idPos = columns.index(idColumn)
+            namePos = columns.index(nameColumn) if nameColumn in columns else -1
+            for row in rows:
+                ids.setdefault(row[idPos], row)
+                if namePos > -1:
+                    idNames.setdefault(row[idPos], row[namePos])
+                    names.setdefault(row[namePos], row[idPos])
+
+        newSnapshot[table] = {"columns": columns, "primaryKey": primaryKey, "rows": rows,
+                              "ids": ids, "idNames": idNames, "names": names}
+    snapshotCursor.close()
+
+    snapshot = newSnapshot
+    return snapshot
+
+
+def invalidate_snapshot():
+    """
+    Discards the in-memory copy of the database, so that it is rebuilt to include any changes upon it's next use.
+    """
+    global snapshot
+    snapshot = None
+
+
+def get_snapshot():
+    """
+    Gets the in-memory copy of the database, building it if it doesn't exist.
+    :return: the snapshot dictionary, linking each table name to it's indexes
+    """
+    currentSnapshot = snapshot
+    if currentSnapshot is None:
+        with snapshotLock:
+            # another thread may have built it while this one waited
+            if snapshot is None:
+                return load_snapshot()
+            return snapshot
+    return currentSnapshot
+
+
+def get_table_snapshot(table):
+    """
+    Gets the in-memory copy of a single table, building the snapshot if it doesn't exist.
+    :param table: the name of the table to retrieve
+    :type table: str
+    :return: a dictionary of the tables' columns, rows, and the id to row, id to name and name to id indexes
+    """
+    try:
+        return get_snapshot()[table]
+    except KeyError:
+        raise Exception("No table named " + str(table) + " exists in the database")
+
+
 def get_id(name, table):
     """
     Gets the id of a row from their table and name.
@@ -72,12 +223,9 @@ def get_id(name, table):
     :type table: str
     :return: the integer value of the data's id
     """
-    name = name.replace("'", "''")
-    cursor.execute("SELECT " + table[0].lower() + table[1:] + "Id from " + table + " WHERE "
-                   + table[0].lower() + table[1:] + "Name='" + name + "'")
     try:
-        return int(cursor.fetchone()[0])
-    except TypeError:
+        return int(get_table_snapshot(table)["names"][name])
+    except (KeyError, TypeError):
         raise Exception("NoneType error with element name " + str(name) + " and table " + str(table))
 
 
@@ -90,14 +238,43 @@ def get_name(row_id, table):
     :type table: str
     :return: the integer value of the data's id
     """
-    cursor.execute("SELECT " + table[0].lower() + table[1:] + "Name from " + table + " WHERE "
-                   + table[0].lower() + table[1:] + "Id=" + str(row_id))
     try:
-        return cursor.fetchone()[0]
-    except TypeError:
+        return get_table_snapshot(table)["idNames"][int(row_id)]
+    except (KeyError, TypeError, ValueError):
+        raise Exception("NoneType error with element id " + str(row_id) + " and table " + str(table))
+
+
+def get_row(table, row_id=-1, row_name=""):
+    """
+    Gets all the data of a row from their table and id or name, as a dictionary linking column names to values.
+    :param table: the table the row is located in
+    :type table: str
+    :param row_id: the id of the row to be found. This or row_name must not be default
+    :type row_id: int, optional
+    :param row_name: the name of the row to be found. This or row_id must not be default
+    :type row_name: str, optional
+    :return: a dictionary of the rows' data, in the layout {column: value}
+    """
+    if row_id == -1:
+        row_id = get_id(row_name, table)
+    tableSnapshot = get_table_snapshot(table)
+    try:
+        return dict(zip(tableSnapshot["columns"], tableSnapshot["ids"][int(row_id)]))
+    except (KeyError, TypeError, ValueError):
         raise Exception("NoneType error with element id " + str(row_id) + " and table " + str(table))
 
 
+def get_rows(table):
+    """
+    Gets every row of a table from the in-memory copy of the database.
+    :param table: the table to retrieve the rows of
+    :type table: str
+    :return: a list of dictionaries, each in the layout {column: value}
+    """
+    tableSnapshot = get_table_snapshot(table)
+    return [dict(zip(tableSnapshot["columns"], row)) for row in tableSnapshot["rows"]]
+
+
 def get_id_from_table(table):
     """
     Converts a table string into an sql statement retrieving it's id.
@@ -135,6 +312,7 @@ def insert(sql_table_call, data):
         totalCall += "?, "
     totalCall = totalCall[:-2] + ");"
     cursor.execute(totalCall, data)
+    invalidate_snapshot()
 
 
 def highest_id(table):
@@ -146,3 +324,190 @@ def highest_id(table):
     """
     cursor.execute("SELECT COUNT(*) FROM " + table)
     return cursor.fetchone()[0]
+
+
+def normalise_statement(statement):
+    """
+    Converts an SQL statement into a general form, so statements that only differ in their values are grouped.
+    :param statement: the SQL text of the statement
+    :type statement: str
+    :return: the statement with every literal replaced by ?, any list of values shortened to (?...), and it's
+             whitespace collapsed
+    """
+    statement = re.sub(r"'(?:[^']|'')*'", "?", statement)
+    statement = re.sub(r"\b\d+(?:\.\d+)?\b", "?", statement)
+    statement = re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(?...)", statement)
+    return " ".join(statement.split())
+
+
+def record_statement(statement, seconds, rows=0):
+    """
+    Adds the time taken and rows returned to a statement's record, along with the function that ran it.
+    :param statement: the normalised SQL text of the statement
+    :type statement: str
+    :param seconds: the seconds spent running it or fetching it's results
+    :type seconds: float
+    :param rows: the amount of rows fetched
+    :type rows: int, optional
+    """
+    with profileLock:
+        stats = statementStats.setdefault(statement, [0, 0.0, 0.0, 0])
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+        stats[3] += rows
+
+
+def record_caller(statement):
+    """
+    Records a statement being run, along with the function that ran it. The caller is the first function outside of
+    this module and the query catalogue, so catalogue queries are credited to the function using them.
+    :param statement: the normalised SQL text of the statement
+    :type statement: str
+    """
+    caller = sys._getframe(2)
+    while caller.f_back is not None and caller.f_globals.get("__name__", "").endswith(("CoreDatabase",
+                                                                                        "QueryCatalogue")):
+        caller = caller.f_back
+    callSite = (statement, f"{caller.f_globals.get('__name__', '')}.{caller.f_code.co_name}")
+    with profileLock:
+        statementStats.setdefault(statement, [0, 0.0, 0.0, 0])[0] += 1
+        statementCallers[callSite] = statementCallers.get(callSite, 0) + 1
+
+
+class ProfilingCursor:
+    """Wraps a database cursor, recording the time taken and rows returned by each statement run on it."""
+
+    def __init__(self, wrapped):
+        """
+        Stores the cursor to wrap.
+        :param wrapped: the cursor every call is passed on to
+        :type wrapped: class: `sqlite3.Cursor`
+        """
+        self.wrapped = wrapped
+        self.statement = None
+
+    def execute(self, statement, params=()):
+        """
+        Runs a statement on the wrapped cursor, recording the time taken.
+        :param statement: the SQL text to run
+        :type statement: str
+        :param params: the values to bind to the statement's parameters
+        :type params: tuple, optional
+        :return: this cursor, so results can be fetched from it as with a normal cursor
+        """
+        self.statement = normalise_statement(statement)
+        record_caller(self.statement)
+        start = time.perf_counter()
+        self.wrapped.execute(statement, params)
+        record_statement(self.statement, time.perf_counter() - start)
+        return self
+
+    def fetchone(self):
+        """
+        Fetches the next result row, adding the time taken to the statement that produced it.
+        :return: the row, or None if there are no more
+        """
+        start = time.perf_counter()
+        row = self.wrapped.fetchone()
+        record_statement(self.statement, time.perf_counter() - start, 0 if row is None else 1)
+        return row
+
+    def fetchall(self):
+        """
+        Fetches every remaining result row, adding the time taken to the statement that produced them.
+        :return: a list of the rows
+        """
+        start = time.perf_counter()
+        rows = self.wrapped.fetchall()
+        record_statement(self.statement, time.perf_counter() - start, len(rows))
+        return rows
+
+    def __iter__(self):
+        """
+        Iterates over the remaining result rows.
+        :return: an iterator of the rows
+        """
+        return iter(self.fetchall())
+
+    def __getattr__(self, name):
+        """
+        Passes any other attribute, such as description or close, on to the wrapped cursor.
+        :param name: the name of the attribute
+        :type name: str
+        :return: the attribute of the wrapped cursor
+        """
+        return getattr(self.wrapped, name)
+
+
+def wrap_cursor(new_cursor):
+    """
+    Wraps a cursor to record it's statements if profiling is enabled.
+    :param new_cursor: the cursor to wrap
+    :type new_cursor: class: `sqlite3.Cursor`
+    :return: the profiling cursor if profiling is enabled, otherwise the cursor itself
+    """
+    if profiling and not isinstance(new_cursor, ProfilingCursor):
+        return ProfilingCursor(new_cursor)
+    return new_cursor
+
+
+def enable_profiling(report_at_exit=False):
+    """
+    Starts recording every statement run on the shared cursor, and on the cursors used to build the snapshot.
+    :param report_at_exit: whether to print the profile report as the program exits
+    :type report_at_exit: bool, optional
+    """
+    global profiling, cursor
+    if not profiling:
+        profiling = True
+        cursor = wrap_cursor(cursor)
+        if report_at_exit:
+            atexit.register(lambda: print(get_profile_report()))
+
+
+def disable_profiling():
+    """
+    Stops recording statements, keeping the records made so far.
+    """
+    global profiling, cursor
+    profiling = False
+    if isinstance(cursor, ProfilingCursor):
+        cursor = cursor.wrapped
+
+
+def reset_profile():
+    """
+    Clears all recorded statement counts and timings.
+    """
+    with profileLock:
+        statementStats.clear()
+        statementCallers.clear()
+
+
+def get_profile_report(limit=None, sort_by="total"):
+    """
+    Gets a summary of every statement recorded, with the statements that took the most time in total first.
+    :param limit: the maximum amount of statements to include, or None to include all of them
+    :type limit: int, optional
+    :param sort_by: what to rank the statements by, out of calls, total, max and rows
+    :type sort_by: str, optional
+    :return: a string of the statement counts, timings, rows and calling functions
+    """
+    with profileLock:
+        stats = {statement: tuple(stat) for statement, stat in statementStats.items()}
+        callers = dict(statementCallers)
+    if not profiling and len(stats) == 0:
+        return "Query profiling isn't enabled, so no statements were recorded."
+
+    sortPos = ["calls", "total", "max", "rows"].index(sort_by)
+    ranked = sorted(stats.items(), key=lambda stat: stat[1][sortPos], reverse=True)[:limit]
+    totalSeconds = sum(seconds for (_, seconds, _, _) in stats.values())
+    output = f"{len(stats)} statements run {sum(stat[0] for stat in stats.values())} times, " \
+             f"taking {totalSeconds * 1000:.2f}ms in total\n"
+    output += f"{'Calls':>8}{'Total ms':>12}{'Max ms':>10}{'Rows':>10}  Statement\n"
+    for statement, (calls, seconds, maxSeconds, rows) in ranked:
+        output += f"{calls:>8}{seconds * 1000:>12.2f}{maxSeconds * 1000:>10.3f}{rows:>10}  {statement[:200]}\n"
+        for (callerStatement, caller), count in sorted(callers.items(), key=lambda call: -call[1]):
+            if callerStatement == statement:
+                output += f"{'':>8}{count:>12} from {caller}\n"
+    return output
@@ -1,11 +1,17 @@
 import itertools
 import random
+import threading
 
-from Code.Database import ChoiceStruct, CoreDatabase as Db, DataExtractor
+from Code.Database import ChoiceStruct, CoreDatabase as Db, DataExtractor, QueryCatalogue as Queries
 from Code.CharacterElements import Equipment, Race, Spell
 from Code.CharacterElements.PC import Class, Character, Magic, Background
 
-selected_results = None
+# holds the choices being applied to the character currently being built. each thread keeps it's own, so characters
+# can be built in several threads at once
+buildState = threading.local()
+# the equipment and spell catalogues are shared by every thread, and only read once loaded. catalogueLock makes other
+# threads wait for them to be loaded in full, rather than using them part way through
+catalogueLock = threading.Lock()
 
 
 def create_character(chr_lvl, chr_choices=None, ability_scores=None):
@@ -19,30 +25,26 @@ def create_character(chr_lvl, chr_choices=None, ability_scores=None):
     :type ability_scores: optional, dict
     :return: a character object
     """
-    global selected_results
     if chr_choices is not None:
-        selected_results = ChoiceStruct.ChoiceStruct(chr_choices)
+        buildState.selectedResults = ChoiceStruct.ChoiceStruct(chr_choices)
 
-    Db.cursor.execute(f"SELECT backgroundName FROM Background")
-    backgrounds = list(itertools.chain(*Db.cursor.fetchall()))
+    backgrounds = [row["backgroundName"] for row in Db.get_rows("Background")]
     background = create_background(make_choice(1, backgrounds, "Background")[0])
 
-    Db.cursor.execute(f"SELECT raceName FROM Race")
-    races = list(itertools.chain(*Db.cursor.fetchall()))
+    races = [row["raceName"] for row in Db.get_rows("Race")]
     race = make_choice(1, races, "Race")[0]
-    Db.cursor.execute(f"SELECT subraceName FROM Subrace WHERE raceId={Db.get_id(race, 'Race')}")
-    subraces = list(itertools.chain(*Db.cursor.fetchall()))
+    raceId = Db.get_id(race, "Race")
+    subraces = [row["subraceName"] for row in Db.get_rows("Subrace") if row["raceId"] == raceId]
     if len(subraces) > 0:
         subraceId = Db.get_id(make_choice(1, subraces, "Subrace")[0], "Subrace")
         race = create_race(race, chr_lvl, subraceId)
     else:
         race = create_race(race, chr_lvl)
 
-    Db.cursor.execute(f"SELECT className FROM Class")
-    classes = list(itertools.chain(*Db.cursor.fetchall()))
+    classes = [row["className"] for row in Db.get_rows("Class")]
     chrClass = make_choice(1, classes, "Class")[0]
-    Db.cursor.execute(f"SELECT subclassName FROM Subclass WHERE classId={Db.get_id(chrClass, 'Class')}")
-    subclasses = list(itertools.chain(*Db.cursor.fetchall()))
+    classId = Db.get_id(chrClass, "Class")
+    subclasses = [row["subclassName"] for row in Db.get_rows("Subclass") if row["classId"] == classId]
     if len(subclasses) > 0:
         subclass = create_subclass(make_choice(1, subclasses, "Subclass")[0], chr_lvl)
         chrClass = create_class(chrClass, chr_lvl, subclass)
@@ -98,10 +100,10 @@ def create_class(class_name, class_lvl, subclass=""):
     :type subclass: object, optional
     :return: a python object representing the class
     """
-    classId = Db.get_id(class_name, "Class")
-    Db.cursor.execute("SELECT hitDiceSides, primaryAbility, secondaryAbility, isMagical, savingThrows FROM Class "
-                      "WHERE classId=" + str(classId))
-    hitDice, primaryAbility, secondaryAbility, isMagical, savingThrows = Db.cursor.fetchone()
+    classRow = Db.get_row("Class", row_name=class_name)
+    hitDice, primaryAbility, secondaryAbility, isMagical, savingThrows = \
+        [classRow[column] for column in ("hitDiceSides", "primaryAbility", "secondaryAbility", "isMagical",
+                                         "savingThrows")]
 
     if subclass == "":
         subclass = None
@@ -127,11 +129,10 @@ def create_subclass(subclass_name, class_lvl):
     :type class_lvl: int
     :return:
     """
-    Db.cursor.execute("SELECT subclassId, classId, secondaryAbility FROM Subclass WHERE subclassName='"
-                      + subclass_name + "'")
-    subclassId, classId, secondAbility = Db.cursor.fetchone()
-    Db.cursor.execute("SELECT className, secondaryAbility FROM Class WHERE classId=" + str(classId))
-    className, classSecondAbility = Db.cursor.fetchone()
+    subclassRow = Db.get_row("Subclass", row_name=subclass_name)
+    subclassId, secondAbility = subclassRow["subclassId"], subclassRow["secondaryAbility"]
+    classRow = Db.get_row("Class", subclassRow["classId"])
+    className, classSecondAbility = classRow["className"], classRow["secondaryAbility"]
 
     traits, proficiencies, languages = collect_class_option_data(className, class_lvl, subclassId)
     magic = create_class_magic(className, class_lvl, subclass_name)
@@ -162,42 +163,34 @@ def create_race(race_name, chr_lvl, subrace_id=-1, is_subrace=False):
         subrace = None
 
     # get basic variable data
-    if subrace_id == -1:
-        subraceStr = " IS NULL"
-    else:
-        subraceStr = "=" + str(subrace_id)
+    subraceId = None if subrace_id == -1 else subrace_id
 
-    raceId = Db.get_id(race_name, "Race")
+    raceRow = Db.get_row("Race", row_name=race_name)
+    raceId = raceRow["raceId"]
     # get basic racial data
-    Db.cursor.execute("SELECT size FROM Race WHERE raceId=" + str(raceId))
-    size = Db.cursor.fetchone()[0]
+    size = raceRow["size"]
     if subrace_id == -1:
-        Db.cursor.execute("SELECT speed, darkvision, resistance FROM Race WHERE raceId=" + str(raceId))
+        speedRow = raceRow
     else:
-        Db.cursor.execute("SELECT speed, darkvision, resistance FROM Subrace WHERE raceId="
-                          + str(raceId) + " AND subraceId" + subraceStr)
-    speed, darkvision, resistance = Db.cursor.fetchone()
+        speedRow = Db.get_row("Subrace", subrace_id)
+    speed, darkvision, resistance = speedRow["speed"], speedRow["darkvision"], speedRow["resistance"]
 
 
     # gets the trait data
     traits = []
     traitNames = DataExtractor.get_names_from_connector("Race", "Trait", raceId)
     for trait in traitNames:
-        Db.cursor.execute("SELECT subraceId FROM RaceTrait WHERE traitId=" + str(Db.get_id(trait, "Trait")))
-        subId = Db.cursor.fetchone()[0]
+        subId = Queries.fetch_one("raceTraitSubrace", (Db.get_id(trait, "Trait"),))[0]
         if (subId is None and subrace_id == -1) or (subId == subrace_id):
-            Db.cursor.execute("SELECT traitDescription FROM Trait WHERE traitName='" + trait.replace("'", "''") + "'")
-            traits.append((trait, Db.cursor.fetchone()[0]))
+            traits.append((trait, Db.get_row("Trait", row_name=trait)["traitDescription"]))
     traits = choose_trait_option(traits, race_name)
 
     # extracts data from options
     spells, modUsed, proficiencies, languages = collect_race_option_data(race_name, chr_lvl, subrace_id)
 
     # gets the ability score data
-    Db.cursor.execute("SELECT abilityScore, scoreIncrease FROM RaceAbilityScore WHERE raceId="
-                      + str(raceId) + " AND subraceId" + subraceStr)
     abilityScores = dict()
-    for scoreName, scoreIncrease in Db.cursor.fetchall():
+    for scoreName, scoreIncrease in Queries.fetch_all("raceAbilityScores", (raceId, subraceId)):
         abilityScores.update({scoreName: scoreIncrease})
 
     # converts data into the required formats
@@ -207,8 +200,7 @@ def create_race(race_name, chr_lvl, subrace_id=-1, is_subrace=False):
         modUsed = None
 
     if is_subrace:
-        Db.cursor.execute("SELECT subraceName FROM Subrace WHERE subraceId=" + str(subrace_id))
-        race_name = Db.cursor.fetchone()[0]
+        race_name = Db.get_name(subrace_id, "Subrace")
 
     return Race.Race(race_name, languages, proficiencies, abilityScores, traits, speed, size, darkvision,
                      spells, modUsed, resistance, subrace)
@@ -324,13 +316,14 @@ def make_choice(num_of_choices, choices, element):
     :return: a list of the choices selected
     """
     output = []
+    selectedResults = getattr(buildState, "selectedResults", None)
     if num_of_choices >= len(choices):
         output = choices
 
     # automatic output
-    elif selected_results is not None:
+    elif selectedResults is not None:
         for x in range(num_of_choices):
-            choice = selected_results.get_element(choices, element)
+            choice = selectedResults.get_element(choices, element)
             if choice == 0 or choice in output:
                 random_choice = random.randint(0, len(choices)-1)
                 output.append(choices[random_choice])
@@ -411,17 +404,11 @@ def collect_race_option_data(race_name, chr_lvl, subrace_id=-1):
     :type subrace_id: int, optional
     :return: three arrays holding the traits, proficiencies and languages
     """
-    if subrace_id == -1:
-        subraceStr = " IS NULL"
-    else:
-        subraceStr = "=" + str(subrace_id)
+    subraceId = None if subrace_id == -1 else subrace_id
 
     spells, proficiencies, languages = [], [], []
     modUsed = ""
-    Db.cursor.execute("SELECT raceOptionsId FROM RaceOptions WHERE raceId=" + str(Db.get_id(race_name, "Race"))
-                      + " AND subraceId" + subraceStr)
-    ids = Db.cursor.fetchall()
-    Db.cursor.execute("SELECT raceOptionsId FROM RaceOptions WHERE raceId=" + str(Db.get_id(race_name, "Race")))
+    ids = Queries.fetch_all("raceOptionIds", (Db.get_id(race_name, "Race"), subraceId))
     for nextId in ids:
         metadata, options = DataExtractor.race_options_connections(nextId[0], subrace_id)
         if len(options) > 0:
@@ -507,15 +494,10 @@ def collect_class_option_data(class_name, class_lvl, subclass_id=-1):
     :type subclass_id: int, optional
     :return: three arrays holding the traits, proficiencies and languages
     """
-    if subclass_id == -1:
-        subclassStr = " IS NULL"
-    else:
-        subclassStr = "=" + str(subclass_id)
+    subclassId = None if subclass_id == -1 else subclass_id
 
     traits, proficiencies, languages = [], [], []
-    Db.cursor.execute("SELECT classOptionsId FROM ClassOptions WHERE classId=" + str(
-        Db.get_id(class_name, "Class")) + " AND subclassId" + subclassStr)
-    ids = Db.cursor.fetchall()
+    ids = Queries.fetch_all("classOptionIds", (Db.get_id(class_name, "Class"), subclassId))
     for nextId in ids:
         metadata, options = DataExtractor.class_options_connections(nextId[0], subclass_id)
         if metadata[0] <= class_lvl:
@@ -541,8 +523,7 @@ def choose_trait_option(traits, parent):
     choices = []
 
     for x in range(0, len(traits)):
-        Db.cursor.execute(f"SELECT optionDesc FROM TraitOption WHERE traitId={Db.get_id(traits[x][0], 'Trait')}")
-        options = Db.cursor.fetchall()
+        options = Queries.fetch_all("traitOptions", (Db.get_id(traits[x][0], 'Trait'),))
         if len(options) > 0:
             for option in options:
                 choices.append(option)
@@ -552,6 +533,18 @@ def choose_trait_option(traits, parent):
     return traits
 
 
+def load_catalogues():
+    """
+    Creates the equipment and spell objects, unless they've already been created.
+    This is called before any characters are built, so that the catalogues are only loaded once they're needed.
+    """
+    with catalogueLock:
+        if len(Equipment.get_all_equipment()) == 0:
+            create_all_equipment()
+        if len(Spell.Spell.builtSpells) == 0:
+            Spell.preload_spells()
+
+
 def create_all_equipment():
     """
     Creates an object for each equipment item in the database.
@@ -1,10 +1,92 @@
+import itertools
+import threading
+from collections import Counter
+
 from Code.CharacterElements import Equipment
 import Code.Database.CoreDatabase as Db
+from Code.Database import QueryCatalogue as Queries
 
 # Represents the table(s) accessible from the input table using an intermediary table
 # This excludes equipment due to the intermediary table holding extra information
 INDIRECT_PATHS = {"Background": ["Proficiency", "Language"], "RaceOptions": ["Language", "Proficiency", "Spell"],
                   "ClassOptions": ["Proficiency", "Trait", "Language"], "Magic": ["Spell"], "Race": ["Trait"]}
+# Represents the tables connected to the GenericTag table through an intermediary table
+GENERIC_TAG_PATHS = {"Equipment": ["GenericTag"], "Spell": ["GenericTag"], "Trait": ["GenericTag"],
+                     "Tag": ["GenericTag"]}
+
+# links a (start table, end table, start id) key to the names connected to it, and the snapshot it was built from.
+# it is shared by every thread, so it's only built, and read, while holding indexLock
+connectorIndex = dict()
+indexedPaths = set()
+indexedSnapshot = None
+indexLock = threading.Lock()
+
+
+def connector_table(start_table, end_table):
+    """
+    Determines the name of the intermediary table between two tables.
+    :param start_table: the name of the table the connection travels from
+    :type start_table: str
+    :param end_table: the name of the table the connection travels to
+    :type end_table: str
+    :return: the name of the intermediary table
+    """
+    if start_table == "Magic":
+        return "ClassSpell"
+    elif start_table == "Tag":
+        return "ArchTagConn"
+    else:
+        return start_table.replace("Options", "") + end_table.replace("Generic", "")
+
+
+def index_connector(start_table, end_table):
+    """
+    Adds every connection between two tables into the connector index, in one pass over their intermediary table.
+    Repeated rows are kept, matching the output of an inner join across the three tables.
+    This must be called while holding indexLock.
+    :param start_table: the name of the table the connection travels from
+    :type start_table: str
+    :param end_table: the name of the table the connection travels to
+    :type end_table: str
+    """
+    startId = Db.table_to_id(start_table)
+    endId = Db.table_to_id(end_table)
+    connSnapshot = Db.get_table_snapshot(connector_table(start_table, end_table))
+    startSnapshot = Db.get_table_snapshot(start_table)
+    endSnapshot = Db.get_table_snapshot(end_table)
+
+    # counts the rows sharing each start id, and collects the names sharing each end id
+    startPos = startSnapshot["columns"].index(startId)
+    startCounts = Counter(row[startPos] for row in startSnapshot["rows"])
+    endPos = endSnapshot["columns"].index(endId)
+    namePos = endSnapshot["columns"].index(endId[:-2] + "Name")
+    endNames = dict()
+    for row in endSnapshot["rows"]:
+        endNames.setdefault(row[endPos], []).append(row[namePos])
+
+    # the connector rows are traversed in their stored order, by rowid, so each list follows the order the connections
+    # were added in, whatever indexes the connector table has
+    connStartPos = connSnapshot["columns"].index(startId)
+    connEndPos = connSnapshot["columns"].index(endId)
+    for row in connSnapshot["rows"]:
+        names = endNames.get(row[connEndPos], []) * startCounts[row[connStartPos]]
+        connectorIndex.setdefault((start_table, end_table, row[connStartPos]), []).extend(names)
+    indexedPaths.add((start_table, end_table))
+
+
+def build_connector_index():
+    """
+    Builds the connector index for every intermediary table, from the current database snapshot.
+    This must be called while holding indexLock.
+    """
+    global indexedSnapshot
+    connectorIndex.clear()
+    indexedPaths.clear()
+    indexedSnapshot = Db.get_snapshot()
+    for paths in [INDIRECT_PATHS, GENERIC_TAG_PATHS]:
+        for start_table, end_tables in paths.items():
+            for end_table in end_tables:
+                index_connector(start_table, end_table)
 
 
 def get_names_from_connector(start_table, end_table, input_id=-1, input_name=""):
@@ -20,38 +102,21 @@ def get_names_from_connector(start_table, end_table, input_id=-1, input_name="")
     :type input_id: int, optional
     :param input_name: the name of the row to travel from in the start table. This or input_id must not be default
     :type input_name: str, optional
-    :return: an array of the names assigned within the rows pulled from the end table
+    :return: an array of the names assigned within the rows pulled from the end table, in the order of the
+             intermediary table's rowids
     """
     # retrieves the id, if not provided
     if input_id == -1:
         input_id = Db.get_id(input_name, start_table)
 
-    # determines the name of the intermediary table
-    if start_table == "Magic":
-        connTable = "ClassSpell"
-    elif start_table == "Tag":
-        connTable = "ArchTagConn"
-    else:
-        connTable = start_table.replace("Options", "") + end_table.replace("Generic", "")
-
-    # determines the required variables for the sql call
-    endId = Db.table_to_id(end_table)
-    nameColumn = endId.replace("Id", "Name")
-    startId = Db.table_to_id(start_table)
+    # rebuilds the index if the database has changed since it was built, and adds any path it doesn't yet hold
+    with indexLock:
+        if Db.get_snapshot() is not indexedSnapshot:
+            build_connector_index()
+        if (start_table, end_table) not in indexedPaths:
+            index_connector(start_table, end_table)
 
-    # joins the tables to extract the names
-    command = f"SELECT {nameColumn} FROM {connTable} INNER JOIN {start_table} ON {start_table}.{startId} = " \
-              f"{connTable}.{startId} INNER JOIN {end_table} ON {end_table}.{endId} = {connTable}.{endId} " \
-              f"WHERE {start_table}.{startId}={str(input_id)}"
-    Db.cursor.execute(command)
-
-    # converts the output into a cleaner, 1D array
-    initOutput = Db.cursor.fetchall()
-    output = []
-    for item in initOutput:
-        output.append(item[0])
-
-    return output
+        return list(connectorIndex.get((start_table, end_table, int(input_id)), []))
 
 
 def background_connections(background_name):
@@ -61,19 +126,14 @@ def background_connections(background_name):
     :type background_name: str
     :return: 3 2D array - tools, skills and languages - holding the amount to pick and an array of the options
     """
-    Db.cursor.execute(f"SELECT skillAmnt, toolAmnt, languageAmnt FROM Background "
-                      f"WHERE backgroundName='{background_name}'")
-    skillAmnt, toolAmnt, languageAmnt = Db.cursor.fetchone()
+    backgroundRow = Db.get_row("Background", row_name=background_name)
+    skillAmnt, toolAmnt, languageAmnt = backgroundRow["skillAmnt"], backgroundRow["toolAmnt"], \
+        backgroundRow["languageAmnt"]
     proficiencies = get_names_from_connector("Background", "Proficiency", input_name=background_name)
     languages = get_names_from_connector("Background", "Language", input_name=background_name)
 
-    for x in range(len(proficiencies)):
-        proficiencies[x] = proficiencies[x].replace("'", "''")
-    Db.cursor.execute("SELECT proficiencyName, proficiencyType FROM Proficiency WHERE proficiencyName IN ('"
-                      + "', '".join(proficiencies) + "')")
-
     skills, tools = [], []
-    for pair in Db.cursor.fetchall():
+    for pair in Queries.fetch_all("proficiencyTypes", proficiencies):
         if pair[1] == "Skill":
             skills.append(pair[0])
         else:
@@ -92,14 +152,9 @@ def race_options_connections(race_options_id, subrace_id=-1):
     :return: [any spells], the amount to choose, [choices]
     """
     # retrieve all data related to the RaceOptions
-    if subrace_id > -1:
-        subclassCall = "=" + str(subrace_id)
-    else:
-        subclassCall = " IS NULL"
-    Db.cursor.execute("SELECT amntToChoose FROM RaceOptions WHERE raceOptionsId="
-                      + str(race_options_id) + " AND subraceId" + subclassCall)
+    subraceId = subrace_id if subrace_id > -1 else None
     try:
-        amntToChoose = Db.cursor.fetchone()[0]
+        amntToChoose = Queries.fetch_one("raceOptionAmount", (race_options_id, subraceId))[0]
     except TypeError:
         amntToChoose = -1
 
@@ -109,16 +164,14 @@ def race_options_connections(race_options_id, subrace_id=-1):
 
     # gets all spells info
     spells = []
-    Db.cursor.execute("SELECT * FROM RaceSpell WHERE raceOptionsId=" + str(race_options_id))
-    spellsInfo = Db.cursor.fetchall()
+    spellsInfo = Queries.fetch_all("raceOptionSpells", (race_options_id,))
     for spellInfo in spellsInfo:
-        Db.cursor.execute("SELECT spellName FROM Spell WHERE spellId=" + str(spellInfo[1]))
-        name = Db.cursor.fetchone()[0]
+        spellRow = Db.get_row("Spell", spellInfo[1])
+        name = spellRow["spellName"]
         # sets missing spell info to its default value
         spellInfo = list(spellInfo)
         if spellInfo[2] is None:
-            Db.cursor.execute("SELECT spellLevel FROM Spell WHERE spellName='" + name + "'")
-            spellInfo[2] = Db.cursor.fetchone()[0]
+            spellInfo[2] = spellRow["spellLevel"]
         if spellInfo[3] is None:
             spellInfo[3] = 1
         info = [name] + list(spellInfo[2:])
@@ -140,7 +193,8 @@ def race_options_connections(race_options_id, subrace_id=-1):
     # if the RaceOptions holds no information connections, it was saved during an insert that failed,
     # so thus deletes the row
     if len(output) == 0:
-        Db.cursor.execute("DELETE FROM RaceOptions WHERE raceOptionsId=" + str(race_options_id))
+        Queries.execute("deleteRaceOption", (race_options_id,))
+        Db.invalidate_snapshot()
     return metadata, output
 
 
@@ -158,19 +212,17 @@ def create_class_magic(class_name, class_lvl, subclass_name=""):
     [spell names], (spellslot level: num of spellslot) dictionary
     """
     if subclass_name != "":
-        subclassCall = "=" + str(Db.get_id(subclass_name, 'Subclass'))
+        subclassId = Db.get_id(subclass_name, 'Subclass')
     else:
-        subclassCall = " IS NULL"
+        subclassId = None
 
-    Db.cursor.execute(f"SELECT magicId, spellsPrepared, knownCalc, amntKnown, cantripsKnown FROM Magic WHERE "
-                      f"classId={Db.get_id(class_name, 'Class')} AND lvl={class_lvl} AND subclassId{subclassCall}")
-    magicId, spellsPrepared, knownCalc, amntKnown, cantripsKnown = Db.cursor.fetchone()
+    magicId, spellsPrepared, knownCalc, amntKnown, cantripsKnown = \
+        Queries.fetch_one("classMagic", (Db.get_id(class_name, 'Class'), class_lvl, subclassId))
     if subclass_name != "":
         spellsPrepared = False
 
-    Db.cursor.execute(f"SELECT spellslotLvl, amount FROM ClassSpellslot WHERE magicId={str(magicId)}")
     spellslots = dict()
-    for pair in Db.cursor.fetchall():
+    for pair in Queries.fetch_all("magicSpellslots", (magicId,)):
         spellslots.update({pair[0]: pair[1]})
 
     spells = get_names_from_connector("Magic", "Spell", magicId)
@@ -187,22 +239,15 @@ def class_options_connections(class_options_id, subclass_id=-1):
     :return: the level required and amount to choose in an array, and an array of the choices
     """
     # retrieve all data related to the ClassOptions
-    if subclass_id > -1:
-        subclassCall = "=" + str(subclass_id)
-    else:
-        subclassCall = " IS NULL"
-
-    Db.cursor.execute("SELECT lvlRequired, amntToChoose FROM ClassOptions WHERE classOptionsId="
-                      + str(class_options_id) + " AND subclassId" + subclassCall)
-    metadata = list(Db.cursor.fetchone())
+    subclassId = subclass_id if subclass_id > -1 else None
+    metadata = list(Queries.fetch_one("classOptionData", (class_options_id, subclassId)))
     languages = get_names_from_connector("ClassOptions", "Language", class_options_id)
     proficiencies = get_names_from_connector("ClassOptions", "Proficiency", class_options_id)
     traits = get_names_from_connector("ClassOptions", "Trait", class_options_id)
 
     newTraits = []
     for trait in traits:
-        Db.cursor.execute("SELECT traitDescription FROM Trait WHERE traitName='" + trait.replace("'", "''") + "'")
-        desc = Db.cursor.fetchone()[0]
+        desc = Db.get_row("Trait", row_name=trait)["traitDescription"]
         newTraits.append((trait, desc))
     traits = newTraits
 
@@ -223,7 +268,8 @@ def class_options_connections(class_options_id, subclass_id=-1):
     # if the ClassOptions holds no information connections, it was saved during an insert that failed,
     # so thus deletes the row
     if len(output) == 0:
-        Db.cursor.execute("DELETE FROM ClassOptions WHERE classOptionsId=" + str(class_options_id))
+        Queries.execute("deleteClassOption", (class_options_id,))
+        Db.invalidate_snapshot()
     return metadata, output
 
 
@@ -234,9 +280,7 @@ def equipment_connections(class_id):
     :type class_id: int
     :return:
     """
-    Db.cursor.execute("SELECT equipOptionId, hasChoice FROM EquipmentOption WHERE classId=" + str(class_id)
-                      + " AND suboption IS NULL")
-    equipmentPoints = Db.cursor.fetchall()
+    equipmentPoints = Queries.fetch_all("classEquipmentOptions", (class_id,))
     options = []
     for option in equipmentPoints:
         options.append(equipment_point(*option))
@@ -250,18 +294,15 @@ def equipment_point(option_id, has_choice):
     :param has_choice: whether the option involves selecting one or receiving all items in it
     :return:
     """
-    Db.cursor.execute("SELECT equipmentId, amnt FROM EquipmentIndivOption WHERE equipmentOptionId=" + str(option_id))
-    indivOption = Db.cursor.fetchall()
+    indivOption = Queries.fetch_all("equipmentOptionItems", (option_id,))
     items = []
     for (equipmentId, amnt) in indivOption:
-        Db.cursor.execute("SELECT equipmentName FROM Equipment WHERE equipmentId=" + str(equipmentId))
-        item = Db.cursor.fetchone()[0]
+        item = Db.get_name(equipmentId, "Equipment")
         equipment = Equipment.get_equipment(item)
         for x in range(0, amnt):
             items.append(equipment)
     metadata = [has_choice == 1]
-    Db.cursor.execute("SELECT equipOptionId, hasChoice FROM EquipmentOption WHERE suboption=" + str(option_id))
-    suboption = Db.cursor.fetchall()
+    suboption = Queries.fetch_all("equipmentSuboptions", (option_id,))
     if len(suboption) > 0:
         for (newOptionId, hasChoice) in suboption:
             metadata.append(equipment_point(newOptionId, hasChoice))
@@ -270,18 +311,15 @@ def equipment_point(option_id, has_choice):
 
 def equipment_items():
     """
-    Pulls the needed information of each equipment item.
+    Pulls the needed information of each equipment item, using a single query.
     :return: an array with an index for each item
     """
-    Db.cursor.execute("SELECT * FROM Equipment")
-    allData = Db.cursor.fetchall()
     allEquipment = []
-    for (eId, name, desc, diceSides, diceNum, armorClass, weight, value) in allData:
-        tags = []
-        Db.cursor.execute("SELECT genericTagId FROM EquipmentTag WHERE equipmentId=" + str(eId))
-        for tag in Db.cursor.fetchall():
-            Db.cursor.execute("SELECT genericTagName FROM GenericTag where genericTagId=" + str(tag[0]))
-            tags.append(Db.cursor.fetchone()[0])
+    # each item has a row per tag, and the rows are ordered so that each item's rows are together
+    for _, rows in itertools.groupby(Queries.fetch_all("allEquipmentWithTags"), key=lambda row: row[0]):
+        rows = list(rows)
+        _, name, desc, diceSides, diceNum, armorClass, weight, value, _ = rows[0]
+        tags = [row[-1] for row in rows if row[-1] is not None]
 
         equip = [name, tags, desc, str(diceNum) + "d" + str(diceSides), armorClass, weight, value]
         allEquipment.append(equip)
@@ -297,16 +335,40 @@ def spell_info(spell_name, chr_level=1):
     :type chr_level: int, optional
     :return: all the required data for a spell object, in parameter order
     """
-    Db.cursor.execute("SELECT * FROM Spell WHERE spellName='" + spell_name.replace("'", "''") + "'")
-    lvl, castingTime, duration, sRange, area, components, atOrSave, school, damOrEffect, desc = Db.cursor.fetchone()[2:]
+    rows = Queries.fetch_all("spellWithTags", (spell_name,))
+    if len(rows) == 0:
+        raise Exception("NoneType error with element name " + str(spell_name) + " and table Spell")
+    return spell_from_rows(rows, chr_level)
+
+
+def all_spell_info(chr_level=1):
+    """
+    Gets all the appropriate info for every spell, using a single query.
+    :param chr_level: the level of the character, relevant for cantrips, and 1 by default
+    :type chr_level: int, optional
+    :return: a list of the required data for each spell object, each in parameter order
+    """
+    spellRows = dict()
+    for row in Queries.fetch_all("allSpellsWithTags"):
+        spellRows.setdefault(row[0], []).append(row)
+    return [spell_from_rows(rows, chr_level) for rows in spellRows.values()]
+
+
+def spell_from_rows(rows, chr_level):
+    """
+    Converts the rows of a spell joined with it's tags into the data for a spell object.
+    :param rows: the spell's rows, each holding every Spell column followed by one tag name, or None if it has no tags
+    :type rows: list
+    :param chr_level: the level of the character, relevant for cantrips
+    :type chr_level: int
+    :return: all the required data for a spell object, in parameter order
+    """
+    spell_name, lvl, castingTime, duration, sRange, area, components, atOrSave, school, damOrEffect, desc = \
+        rows[0][1:-1]
     damage, attack, save = None, None, None
 
     # gets the spells' tags
-    tags = []
-    Db.cursor.execute("SELECT genericTagId FROM SpellTag WHERE spellId=" + str(Db.get_id(spell_name, "Spell")))
-    for tag in Db.cursor.fetchall():
-        Db.cursor.execute("SELECT genericTagName FROM GenericTag where genericTagId=" + str(tag[0]))
-        tags.append(Db.cursor.fetchone()[0])
+    tags = [row[-1] for row in rows if row[-1] is not None]
 
     # separates atOrSave into it's appropriate variable
     if "Save" in atOrSave:
@@ -1,11 +1,13 @@
 import Code.Database.CoreDatabase as Db
+from Code.Database import QueryCatalogue as Queries
 
 # CORE STATIC COMMANDS
 
 
 def setup_tables():
     """
-    Sets up all the database tables by running through the text file.
+    Sets up all the database tables and their indexes by running through the text file. As every table and index is
+    only created if it doesn't already exist, this also adds any new indexes to an existing database.
     """
     count = 0
     nextCommand = ""
@@ -24,6 +26,40 @@ def setup_tables():
                 Db.cursor.execute(nextCommand)
                 nextCommand = ""
     file.close()
+    Db.invalidate_snapshot()
+    report_full_scans()
+
+
+def report_full_scans(statements=None):
+    """
+    Checks the query plan of each query, and prints any that read through every row of a table.
+    :param statements: the SQL statements to check. By default this is every catalogue query that doesn't need table
+                       or column names filled in, and every other variation that has been run so far
+    :type statements: list, optional
+    :return: a list of the statements that scan a table, each paired with the scans in it's plan
+    """
+    if statements is None:
+        statements = []
+        for name, query in Queries.queries.items():
+            try:
+                statements.append(Queries.get_statement(name, 1, dict()))
+            except KeyError:
+                pass
+        statements += [statement for statement in Queries.statements.values() if statement not in statements]
+
+    fullScans = []
+    for statement in statements:
+        Db.cursor.execute("EXPLAIN QUERY PLAN " + statement, [None] * statement.count("?"))
+        # each plan row is (id, parent id, unused, detail), and a detail of "SCAN x" reads every row of x
+        scans = [detail for (_, _, _, detail) in Db.cursor.fetchall()
+                 if detail.startswith("SCAN ") and detail != "SCAN CONSTANT ROW"]
+        if len(scans) > 0:
+            fullScans.append((statement, scans))
+
+    print(f"{len(fullScans)} of {len(statements)} queries scan a full table:")
+    for statement, scans in fullScans:
+        print(statement + "\n    " + "\n    ".join(scans))
+    return fullScans
 
 
 def add_another_item():
@@ -77,6 +113,7 @@ def remove_item(table, item_id=None, name=None):
     else:
         sqlCall = "DELETE FROM " + table + " WHERE " + Db.table_to_id(table) + "=" + item_id
     Db.cursor.execute(sqlCall)
+    Db.invalidate_snapshot()
 
 
 # CORE NON-STATIC COMMANDS
@@ -921,6 +958,7 @@ def add_class_magic(class_id, lvl, subclass_id=-1):
             amount = Db.int_input("How many of these slots does the class now have: ")
             Db.cursor.execute("UPDATE TABLE ClassSpellslot SET amount=" + str(amount) + " WHERE magicId=" +
                               str(magicId) + " AND spellslotLvl=" + str(spellslotLvl))
+            Db.invalidate_snapshot()
         addMore = add_another_item()
     print("All spellslots have been added\n")
 
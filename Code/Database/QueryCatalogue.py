@@ -0,0 +1,266 @@
+import sys
+import threading
+import time
+
+from Code.Database import CoreDatabase as Db
+
+# links each query name to it's SQL, with every value bound as a ? parameter.
+# names in braces are table or column names filled in when the query is first used with them, and {values} is
+# filled with one parameter for each value passed.
+# any query that can return more than one row orders them explicitly, by the rowid of the table it selects from or the
+# columns of that table's primary key, so the rows don't change order when the database's indexes do
+queries = {
+    # DataExtractor
+    "proficiencyTypes": "SELECT proficiencyName, proficiencyType FROM Proficiency WHERE proficiencyName IN ({values}) "
+                        "ORDER BY rowid",
+    "raceOptionAmount": "SELECT amntToChoose FROM RaceOptions WHERE raceOptionsId=? AND subraceId IS ?",
+    "raceOptionSpells": "SELECT * FROM RaceSpell WHERE raceOptionsId=? ORDER BY rowid",
+    "deleteRaceOption": "DELETE FROM RaceOptions WHERE raceOptionsId=?",
+    "classMagic": "SELECT magicId, spellsPrepared, knownCalc, amntKnown, cantripsKnown FROM Magic "
+                  "WHERE classId=? AND lvl=? AND subclassId IS ? ORDER BY rowid",
+    "magicSpellslots": "SELECT spellslotLvl, amount FROM ClassSpellslot WHERE magicId=? ORDER BY spellslotLvl",
+    "classOptionData": "SELECT lvlRequired, amntToChoose FROM ClassOptions WHERE classOptionsId=? AND subclassId IS ?",
+    "deleteClassOption": "DELETE FROM ClassOptions WHERE classOptionsId=?",
+    "classEquipmentOptions": "SELECT equipOptionId, hasChoice FROM EquipmentOption "
+                             "WHERE classId=? AND suboption IS NULL ORDER BY rowid",
+    "equipmentOptionItems": "SELECT equipmentId, amnt FROM EquipmentIndivOption WHERE equipmentOptionId=? "
+                            "ORDER BY rowid",
+    "equipmentSuboptions": "SELECT equipOptionId, hasChoice FROM EquipmentOption WHERE suboption=? ORDER BY rowid",
+    "allEquipmentWithTags": "SELECT Equipment.*, GenericTag.genericTagName FROM Equipment "
+                            "LEFT JOIN EquipmentTag ON EquipmentTag.equipmentId = Equipment.equipmentId "
+                            "LEFT JOIN GenericTag ON GenericTag.genericTagId = EquipmentTag.genericTagId "
+                            "ORDER BY Equipment.equipmentId, EquipmentTag.rowid",
+    "spellWithTags": "SELECT Spell.*, GenericTag.genericTagName FROM Spell "
+                     "LEFT JOIN SpellTag ON SpellTag.spellId = Spell.spellId "
+                     "LEFT JOIN GenericTag ON GenericTag.genericTagId = SpellTag.genericTagId "
+                     "WHERE Spell.spellName=? ORDER BY SpellTag.rowid",
+    "allSpellsWithTags": "SELECT Spell.*, GenericTag.genericTagName FROM Spell "
+                         "LEFT JOIN SpellTag ON SpellTag.spellId = Spell.spellId "
+                         "LEFT JOIN GenericTag ON GenericTag.genericTagId = SpellTag.genericTagId "
+                         "ORDER BY Spell.spellId, SpellTag.rowid",
+
+    # DataConverter
+    "raceTraitSubrace": "SELECT subraceId FROM RaceTrait WHERE traitId=? ORDER BY rowid",
+    "raceAbilityScores": "SELECT abilityScore, scoreIncrease FROM RaceAbilityScore WHERE raceId=? AND subraceId IS ? "
+                         "ORDER BY abilityScore",
+    "raceOptionIds": "SELECT raceOptionsId FROM RaceOptions WHERE raceId=? AND subraceId IS ? ORDER BY rowid",
+    "classOptionIds": "SELECT classOptionsId FROM ClassOptions WHERE classId=? AND subclassId IS ? ORDER BY rowid",
+    "traitOptions": "SELECT optionDesc FROM TraitOption WHERE traitId=? ORDER BY rowid",
+
+    # CharacterBuilder
+    "choiceOptionsNames": "SELECT {placeLower}Name FROM {place} WHERE {placeLower}Id IN ("
+                          "SELECT {placeLower}Id FROM {optionsTable} WHERE {base}Id IN ("
+                          "SELECT {base}Id FROM {place}{choiceTable} WHERE {choiceLower}Id IN ("
+                          "SELECT {choiceLower}Id FROM {choiceTable} WHERE {choiceLower}Name=?))) "
+                          "ORDER BY {place}.rowid",
+    "choiceNames": "SELECT {base}Name FROM {place} WHERE {base}Id IN ("
+                   "SELECT {base}Id FROM {place}{choiceTable} WHERE {choiceLower}Id IN ("
+                   "SELECT {choiceLower}Id FROM {choiceTable} WHERE {choiceLower}Name=?)) ORDER BY {place}.rowid",
+    "equipmentClasses": "SELECT className FROM Class WHERE classId IN ("
+                        "SELECT classId FROM EquipmentOption WHERE equipOptionId IN ("
+                        "SELECT equipmentOptionId FROM EquipmentIndivOption WHERE equipmentId=("
+                        "SELECT equipmentId FROM Equipment WHERE equipmentName=?))) ORDER BY Class.rowid",
+    "spellRaceNames": "SELECT raceName FROM Race WHERE raceId IN ("
+                      "SELECT raceId FROM RaceOptions WHERE raceOptionsId IN ("
+                      "SELECT raceOptionsId FROM RaceSpell WHERE spellId IN ("
+                      "SELECT spellId FROM Spell WHERE spellName=?))) ORDER BY Race.rowid",
+    "spellClassNames": "SELECT className FROM Class WHERE classId IN ("
+                       "SELECT classId FROM Magic WHERE magicId IN ("
+                       "SELECT magicId FROM ClassSpell WHERE spellId IN ("
+                       "SELECT spellId FROM Spell WHERE spellName=?))) ORDER BY Class.rowid",
+    "otherCoreNames": "SELECT {elementLower}Name FROM {element} WHERE {elementLower}Name != ? ORDER BY rowid",
+    "otherSubNames": "SELECT {elementLower}Name FROM {element} WHERE {elementLower}Name != ? AND {parent}Id=? "
+                     "ORDER BY rowid",
+    "subParentId": "SELECT {parent}Id FROM {element} WHERE {elementLower}Name = ? ORDER BY rowid",
+    "coreOptions": "SELECT {elementLower}OptionsId, amntToChoose FROM {element}Options "
+                   "WHERE {elementLower}Id=? AND sub{elementLower}Id IS ? ORDER BY rowid",
+    "classMagicSpells": "SELECT spellName FROM Spell WHERE spellId IN ("
+                        "SELECT spellId FROM ClassSpell WHERE magicId IN ("
+                        "SELECT magicId FROM Magic WHERE classId=? AND subclassId IS ?)) ORDER BY Spell.rowid",
+    "optionItemNames": "SELECT {elem}Name FROM {elemTable} WHERE {elem}Id IN ("
+                       "SELECT {elem}Id FROM {element}{elemTable} WHERE {elementLower}OptionsId=?) "
+                       "ORDER BY {elemTable}.rowid",
+    "otherClassCantrips": "SELECT spellName FROM Spell WHERE spellLevel=0 AND spellName NOT IN ({values}) "
+                          "AND spellId IN (SELECT spellId FROM ClassSpell WHERE magicId IN ("
+                          "SELECT magicId FROM Magic WHERE classId = ?)) ORDER BY Spell.rowid",
+    "otherClassSpells": "SELECT spellName FROM Spell WHERE spellName NOT IN ({values}) AND spellId IN ("
+                        "SELECT spellId FROM ClassSpell WHERE magicId IN ("
+                        "SELECT magicId FROM Magic WHERE classId = ?)) ORDER BY Spell.rowid",
+    "magicClasses": "SELECT className FROM Class WHERE classId IN ("
+                    "SELECT classId FROM Magic WHERE (cantripsKnown > 0 OR amntKnown > 0)) ORDER BY Class.rowid",
+    "magicRaces": "SELECT raceName FROM Race WHERE raceId IN ("
+                  "SELECT raceId FROM RaceOptions WHERE raceOptionsId IN ("
+                  "SELECT raceOptionsId FROM RaceSpell)) ORDER BY Race.rowid",
+    "classEquipmentChoices": "SELECT equipOptionId, suboption FROM EquipmentOption WHERE hasChoice = 1 AND classId=? "
+                             "ORDER BY rowid",
+    "equipmentOptionHasChoice": "SELECT hasChoice FROM EquipmentOption WHERE equipOptionId =?",
+    "equipmentOptionItemNames": "SELECT equipmentName FROM Equipment WHERE equipmentId IN ("
+                                "SELECT equipmentId FROM EquipmentIndivOption WHERE equipmentOptionId = ?) "
+                                "ORDER BY Equipment.rowid",
+    "equipmentOptionAmount": "SELECT amnt FROM EquipmentIndivOption WHERE equipmentId=? AND equipmentOptionId=?",
+    "backgroundItemNames": "SELECT {tableLower}Name FROM {table} WHERE {tableLower}Id IN ("
+                           "SELECT {tableLower}Id FROM Background{table} WHERE backgroundId=?) "
+                           "ORDER BY {table}.rowid",
+    "backgroundsWithChoice": "SELECT backgroundName FROM Background WHERE {amountColumn} > 0 ORDER BY rowid",
+    "otherBackgrounds": "SELECT backgroundName FROM Background WHERE backgroundName != ? ORDER BY rowid",
+    "backgroundProficiencies": "SELECT proficiencyName FROM Proficiency WHERE proficiencyType = ? AND proficiencyId IN ("
+                               "SELECT proficiencyId FROM BackgroundProficiency WHERE backgroundId = ?) "
+                               "ORDER BY Proficiency.rowid",
+    "backgroundLanguages": "SELECT languageName FROM Language WHERE languageId IN ("
+                           "SELECT languageId FROM BackgroundLanguage WHERE backgroundId = ?) ORDER BY Language.rowid",
+    "backgroundAmounts": "SELECT skillAmnt, languageAmnt, toolAmnt FROM Background WHERE backgroundId=?",
+
+    # ChromosomeController
+    "archetypeProfiles": "SELECT Archetype.archetypeName, Archetype.healthWeighting, Archetype.magicWeighting, "
+                         "Tag.tagName, ArchetypeTag.weighting FROM Archetype "
+                         "LEFT JOIN ArchetypeTag ON ArchetypeTag.archetypeId = Archetype.archetypeId "
+                         "LEFT JOIN Tag ON Tag.tagId = ArchetypeTag.tagId "
+                         "WHERE Archetype.archetypeName IN (?, ?) ORDER BY Archetype.archetypeId, Tag.tagId",
+}
+
+# links each built statement's key to it's SQL text, so that each variation of a query is only built once
+statements = dict()
+# links each query name to [the amount of times it's been run, the total seconds spent running it]
+queryStats = dict()
+# links each (query name, calling function) pair to the amount of times the function ran the query
+callSites = dict()
+# each thread runs queries on it's own cursor, so only the recorded counts and timings are shared between threads
+statsLock = threading.Lock()
+
+
+def get_statement(name, value_amnt, names):
+    """
+    Gets the SQL text of a query, filling in any table or column names it uses.
+    :param name: the name of the query in the catalogue
+    :type name: str
+    :param value_amnt: the amount of parameters that {values} is filled with
+    :type value_amnt: int
+    :param names: the table and column names to fill in, linked to the name they replace
+    :type names: dict
+    :return: the SQL text
+    """
+    key = (name, value_amnt, tuple(sorted(names.items())))
+    if key not in statements:
+        if name not in queries:
+            raise Exception(f"The query {name} isn't in the query catalogue")
+        for identifier in names.values():
+            # only plain identifiers are allowed to be put into the SQL text, so values can't be put there instead
+            if not identifier.isidentifier():
+                raise Exception(f"{identifier} isn't a valid table or column name for the query {name}")
+        statements[key] = queries[name].format(values=", ".join(["?"] * value_amnt), **names)
+    return statements[key]
+
+
+def execute(name, params=(), **names):
+    """
+    Runs a query from the catalogue on the current thread's cursor, recording it's use.
+    :param name: the name of the query in the catalogue
+    :type name: str
+    :param params: the values to bind to the query's parameters, in order
+    :type params: tuple, optional
+    :param names: the table and column names to fill into the query
+    :type names: str, optional
+    :return: the cursor the query was run on
+    """
+    start = time.perf_counter()
+    run_statement(name, params, names)
+    record(name, time.perf_counter() - start)
+    return Db.get_cursor()
+
+
+def fetch_all(name, params=(), **names):
+    """
+    Runs a query from the catalogue and fetches all of it's results, recording it's use.
+    :param name: the name of the query in the catalogue
+    :type name: str
+    :param params: the values to bind to the query's parameters, in order
+    :type params: tuple, optional
+    :param names: the table and column names to fill into the query
+    :type names: str, optional
+    :return: a list of the result rows
+    """
+    start = time.perf_counter()
+    results = run_statement(name, params, names).fetchall()
+    record(name, time.perf_counter() - start)
+    return results
+
+
+def fetch_one(name, params=(), **names):
+    """
+    Runs a query from the catalogue and fetches it's first result, recording it's use.
+    :param name: the name of the query in the catalogue
+    :type name: str
+    :param params: the values to bind to the query's parameters, in order
+    :type params: tuple, optional
+    :param names: the table and column names to fill into the query
+    :type names: str, optional
+    :return: the first result row, or None if there were no results
+    """
+    start = time.perf_counter()
+    result = run_statement(name, params, names).fetchone()
+    record(name, time.perf_counter() - start)
+    return result
+
+
+def run_statement(name, params, names):
+    """
+    Runs a query from the catalogue on the current thread's cursor. As the same SQL text is used for each run, sqlite
+    reuses it's prepared statement rather than parsing it again.
+    :param name: the name of the query in the catalogue
+    :type name: str
+    :param params: the values to bind to the query's parameters, in order
+    :type params: tuple
+    :param names: the table and column names to fill into the query
+    :type names: dict
+    :return: the cursor the query was run on
+    """
+    params = tuple(params)
+    # any parameters beyond those written into the query are the ones filling {values}
+    query = queries.get(name, "")
+    valueAmnt = len(params) - query.count("?") if "{values}" in query else 0
+    return Db.get_cursor().execute(get_statement(name, valueAmnt, names), params)
+
+
+def record(name, seconds):
+    """
+    Records a query being run, and the function that ran it.
+    :param name: the name of the query in the catalogue
+    :type name: str
+    :param seconds: how long the query took to run
+    :type seconds: float
+    """
+    # the caller is two frames up, past the execute or fetch function
+    caller = sys._getframe(2)
+    callSite = (name, f"{caller.f_globals.get('__name__', '')}.{caller.f_code.co_name}")
+
+    with statsLock:
+        stats = queryStats.setdefault(name, [0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+        callSites[callSite] = callSites.get(callSite, 0) + 1
+
+
+def reset_stats():
+    """
+    Clears all recorded query counts and timings.
+    """
+    with statsLock:
+        queryStats.clear()
+        callSites.clear()
+
+
+def get_report():
+    """
+    Gets a summary of every query run, with the queries that took the most time in total first.
+    :return: a string of the query counts, timings and call sites
+    """
+    with statsLock:
+        stats = {name: tuple(stat) for name, stat in queryStats.items()}
+        sites = dict(callSites)
+    output = f"{'Query':<28}{'Calls':>8}{'Total ms':>12}{'Mean us':>10}\n"
+    for name, (calls, seconds) in sorted(stats.items(), key=lambda stat: stat[1][1], reverse=True):
+        output += f"{name:<28}{calls:>8}{seconds * 1000:>12.2f}{seconds / calls * 1000000:>10.1f}\n"
+        for (queryName, caller), count in sorted(sites.items()):
+            if queryName == name:
+                output += f"    {count:>6} from {caller}\n"
+    return output
@@ -0,0 +1,153 @@
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Code.CharacterElements.PC import Character
+from Code.Database import CoreDatabase as Db, DataConverter
+from Code.Optimisation import ChromosomeController, OptimisationSession, RunConfig, Telemetry
+
+# the RunConfig parameters a spec's run settings may set. workers isn't included, as the batch's own pool is used
+RUN_SETTINGS = ("pop_size", "generations", "time_budget", "seed", "offspring_num", "max_evaluations",
+                "stagnation_gens", "stagnation_tolerance")
+# the range of scores given to any ability a spec's filters leave out, matching the interface's defaults
+DEFAULT_ABILITY_RANGE = [8, 15]
+
+
+def read_specs(file_path):
+    """
+    Reads the specs to optimise from a JSON lines file. Each line holds an object with the filters to optimise with,
+    in the same layout as the interface's filters, and optionally an id and the run settings to use, such as
+    {"id": "fighter", "filters": {"Primary": "Knight", "Skills": ["Athletics"]}, "run": {"generations": 50}}
+    :param file_path: the path of the JSON lines file
+    :type file_path: str
+    :return: a list of the spec dictionaries, in the order they're written
+    """
+    specs = []
+    with open(file_path) as file:
+        for lineNum, line in enumerate(file, 1):
+            if line.strip() == "":
+                continue
+            spec = json.loads(line)
+            if "Primary" not in spec.get("filters", dict()):
+                raise Exception(f"The spec on line {lineNum} of {file_path} has no primary archetype filter")
+            for setting in spec.get("run", dict()):
+                if setting not in RUN_SETTINGS:
+                    raise Exception(f"The spec on line {lineNum} of {file_path} has an unknown run setting {setting}")
+            abilities = spec["filters"].setdefault("Abilities", dict())
+            for ability in Character.character_abilities:
+                abilities.setdefault(ability, list(DEFAULT_ABILITY_RANGE))
+            specs.append(spec)
+    return specs
+
+
+def setup_worker():
+    """
+    Prepares a worker process to run optimisations, with it's own read-only database connection.
+    """
+    Db.connect_read_only()
+    DataConverter.load_catalogues()
+
+
+def run_spec(index, spec, seed=None):
+    """
+    Runs the optimisation for a single spec.
+    :param index: the position of the spec in the batch
+    :type index: int
+    :param spec: the spec, as from read_specs
+    :type spec: dict
+    :param seed: the seed to use if the spec doesn't set one, or None for a random seed
+    :type seed: int, optional
+    :return: a dictionary of the spec's index, id, run time, nondominated front and the peak memory of the process
+             running it, or the error raised instead
+    """
+    result = {"index": index, "id": spec.get("id", index)}
+    settings = dict(spec.get("run", dict()))
+    settings.setdefault("seed", seed)
+    try:
+        startTime = time.perf_counter()
+        session = OptimisationSession.OptimisationSession(spec["filters"], RunConfig.RunConfig(**settings))
+        front = ChromosomeController.begin_optimising(session)
+        result["seconds"] = round(time.perf_counter() - startTime, 3)
+        result["front"] = [chromosome_record(chromosome) for chromosome in front]
+        result["peakRss"] = Telemetry.peak_rss()
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def chromosome_record(chromosome):
+    """
+    Converts a chromosome into a dictionary that can be written as JSON.
+    :param chromosome: the chromosome to convert
+    :type chromosome: class: `Optimisation.Chromosome`
+    :return: a dictionary of the chromosome's filters, which rebuild it's character, and it's fitness for each
+             objective
+    """
+    fitness = {"Health": float(chromosome.health[1]), "Magic": float(chromosome.magic[1])}
+    for (tag, _, tagFitness) in chromosome.tags:
+        fitness[tag] = float(tagFitness)
+    return {"filters": chromosome.get_data_as_filters(), "fitness": fitness}
+
+
+def run_batch(specs, output_path, workers=0, seed=None):
+    """
+    Runs the optimisation for every spec, writing each result to the output file as a JSON line as soon as it's
+    complete. As results are written in the order they finish, each is labelled with it's index and id.
+    :param specs: the specs to optimise, as from read_specs
+    :type specs: list
+    :param output_path: the path of the JSON lines file to write the results to
+    :type output_path: str
+    :param workers: the amount of processes to run specs across, 0 to run them all within this process, or None to
+                    use one per core
+    :type workers: int, optional
+    :param seed: the seed each spec without one adds it's index to, or None for random seeds
+    :type seed: int, optional
+    :return: the amount of specs that failed
+    """
+    failures = 0
+    with open(output_path, "w") as file:
+        def write(result):
+            file.write(json.dumps(result) + "\n")
+            file.flush()
+            status = result["error"] if "error" in result else f"{len(result['front'])} characters " \
+                                                                  f"in {result['seconds']}s"
+            print(f"[{result['index'] + 1}/{len(specs)}] {result['id']}: {status}")
+            return "error" in result
+
+        specSeeds = [None if seed is None else seed + index for index in range(len(specs))]
+        if workers == 0:
+            DataConverter.load_catalogues()
+            for index, spec in enumerate(specs):
+                failures += write(run_spec(index, spec, specSeeds[index]))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=setup_worker) as pool:
+                futures = [pool.submit(run_spec, index, spec, specSeeds[index]) for index, spec in enumerate(specs)]
+                for future in as_completed(futures):
+                    failures += write(future.result())
+    return failures
+
+
+def begin():
+    """
+    Runs a batch of optimisations from the command line, without the interface.
+    python -m Code.Optimisation.BatchRunner specs.jsonl --output fronts.jsonl --workers 4
+    """
+    parser = argparse.ArgumentParser(description="Optimises characters for every spec in a JSON lines file.")
+    parser.add_argument("specs", help="the JSON lines file of specs to optimise")
+    parser.add_argument("--output", default="fronts.jsonl", help="the JSON lines file to write each front to")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="the amount of processes to run specs across, 0 to run them in this process, "
+                             "or -1 for one per core")
+    parser.add_argument("--seed", type=int, help="the seed each spec without one adds it's index to")
+    args = parser.parse_args()
+
+    specs = read_specs(args.specs)
+    startTime = time.perf_counter()
+    failures = run_batch(specs, args.output, None if args.workers == -1 else args.workers, args.seed)
+    print(f"Optimised {len(specs) - failures} of {len(specs)} specs in {time.perf_counter() - startTime:.1f}s, "
+          f"written to {args.output}")
+
+
+if __name__ == "__main__":
+    begin()
@@ -0,0 +1,291 @@
+import argparse
+import copy
+import datetime
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from Code.Database import CharacterBuilder, DataConverter
+from Code.Optimisation import ChromosomeController, FitnessCache, OptimisationSession, RunConfig, Telemetry
+from Code.Optimisation.PymooOverwrites import ChrCallback, ChrCrossover
+
+# the filters every benchmarked character is built with, matching a typical run from the interface
+BENCHMARK_FILTERS = {"Primary": "Creator", "Secondary": "Knight",
+                     "Abilities": {ability: [8, 15] for ability in ["STR", "DEX", "CON", "INT", "WIS", "CHA"]}}
+# the elements CharacterBuilder.change_filter can modify, as used by ChrMutation
+FILTER_ELEMENTS = ["Race", "Subrace", "Class", "Subclass", "Background", "Languages",
+                   "Proficiencies", "Spells", "Equipment", "Skills"]
+SAMPLE_SIZE = 10
+# the amount of chromosomes held at once when measuring their memory
+MEMORY_SAMPLE_SIZE = 200
+
+
+def reset_state(session, seed):
+    """
+    Empties the session's chromosomes and the fitness cache, and seeds both of the random generators, so each
+    benchmark does the same work no matter which benchmarks ran before it.
+    :param session: the session the benchmarks build chromosomes for
+    :type session: class: `Optimisation.OptimisationSession`
+    :param seed: the seed to use
+    :type seed: int
+    """
+    session.release()
+    FitnessCache.cache.clear()
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def time_calls(session, function, repeats, seed):
+    """
+    Times repeated calls to a function, starting from the same state and seed so every run makes the same choices.
+    :param session: the session the benchmarks build chromosomes for
+    :type session: class: `Optimisation.OptimisationSession`
+    :param function: the function to time, which is called with the number of the call
+    :type function: function
+    :param repeats: the amount of times to call it
+    :type repeats: int
+    :param seed: the seed to use
+    :type seed: int
+    :return: a dictionary of the timings, in seconds
+    """
+    reset_state(session, seed)
+    timings = []
+    for call in range(repeats):
+        startTime = time.perf_counter()
+        function(call)
+        timings.append(time.perf_counter() - startTime)
+    return {"repeats": repeats, "median": statistics.median(timings), "mean": statistics.mean(timings),
+            "min": min(timings), "total": sum(timings)}
+
+
+def build_samples(session, seed):
+    """
+    Builds the chromosomes the benchmarks that need existing chromosomes work on.
+    :param session: the session the benchmarks build chromosomes for
+    :type session: class: `Optimisation.OptimisationSession`
+    :param seed: the seed to use
+    :type seed: int
+    :return: a list of the chromosomes
+    """
+    reset_state(session, seed)
+    return [ChromosomeController.build_chromosome(session, copy.deepcopy(BENCHMARK_FILTERS))
+            for _ in range(SAMPLE_SIZE)]
+
+
+def measure_memory(session, count, seed):
+    """
+    Measures the memory held by each chromosome, as the memory freed when many chromosomes held at once are
+    discarded. Anything the chromosomes share, such as the built spells and equipment, isn't counted.
+    :param session: the session the benchmarks build chromosomes for
+    :type session: class: `Optimisation.OptimisationSession`
+    :param count: the amount of chromosomes to hold at once
+    :type count: int
+    :param seed: the seed to use
+    :type seed: int
+    :return: a dictionary of the chromosomes held and the average bytes each held
+    """
+    reset_state(session, seed)
+    tracemalloc.start()
+    try:
+        chromosomes = [ChromosomeController.build_chromosome(session, copy.deepcopy(BENCHMARK_FILTERS))
+                       for _ in range(count)]
+        heldMemory = tracemalloc.get_traced_memory()[0]
+        del chromosomes
+        gc.collect()
+        freedMemory = heldMemory - tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return {"chromosomes": count, "bytesPerChromosome": round(freedMemory / count)}
+
+
+def run_benchmarks(repeats=20, runs=3, seed=0):
+    """
+    Runs every benchmark against the bundled database.
+    :param repeats: the amount of times each single operation is timed
+    :type repeats: int, optional
+    :param runs: the amount of full optimisation runs timed
+    :type runs: int, optional
+    :param seed: the seed every benchmark starts from
+    :type seed: int, optional
+    :return: a dictionary linking each benchmark's name to it's timings
+    """
+    DataConverter.load_catalogues()
+    session = OptimisationSession.OptimisationSession(copy.deepcopy(BENCHMARK_FILTERS))
+    samples = build_samples(session, seed)
+    results = dict()
+
+    results["create_character"] = time_calls(
+        session, lambda call: DataConverter.create_character(1, CharacterBuilder.take_choices([]),
+                                                    copy.deepcopy(BENCHMARK_FILTERS["Abilities"])), repeats, seed)
+    results["build_chromosome"] = time_calls(
+        session, lambda call: ChromosomeController.build_chromosome(session, copy.deepcopy(BENCHMARK_FILTERS)),
+        repeats, seed)
+    results["extract_tags"] = time_calls(session, lambda call: samples[call % SAMPLE_SIZE].extract_tags(),
+                                         repeats, seed)
+
+    for element in FILTER_ELEMENTS:
+        # subraces and subclasses can only be changed on characters that have one
+        elementSamples = [chromosome for chromosome in samples if element in chromosome.get_data_as_filters()]
+        if len(elementSamples) == 0:
+            continue
+
+        def change(call):
+            chromosome = elementSamples[call % len(elementSamples)]
+            filters = chromosome.get_data_as_filters()
+            CharacterBuilder.change_filter(chromosome.character, filters, element, call % 10, session.constFilters)
+        results["change_filter." + element] = time_calls(session, change, repeats, seed)
+
+    results["breed"] = time_calls(
+        session, lambda call: ChrCrossover.ChrCrossover.breed(session, [samples[call % SAMPLE_SIZE],
+                                                                        samples[(call + 1) % SAMPLE_SIZE]]),
+        repeats, seed)
+
+    # each full run starts from the same state, and it's telemetry gives the time spent in each phase
+    phases = {phase: 0 for phase in Telemetry.PHASES + ("other",)}
+
+    def optimise(call):
+        FitnessCache.cache.clear()
+        runSession = OptimisationSession.OptimisationSession(copy.deepcopy(BENCHMARK_FILTERS),
+                                                             RunConfig.RunConfig(seed=seed + call))
+        telemetry = Telemetry.RunTelemetry(hypervolume=False)
+        ChromosomeController.begin_optimising(runSession, ChrCallback.ChrCallback(telemetry=telemetry))
+        for record in telemetry.records:
+            for phase, seconds in record["phases"].items():
+                phases[phase] += seconds
+    results["begin_optimising"] = time_calls(session, optimise, runs, seed)
+    results["begin_optimising"]["phases"] = {phase: seconds / runs for phase, seconds in phases.items()}
+    return results
+
+
+def check_cache(seed=0, generations=100):
+    """
+    Checks that the fitness cache doesn't change what a run finds, by running the same seeded optimisation with the
+    cache turned on and then off. Duplicate chromosomes are removed before they're evaluated, so the cache is only
+    used by chromosomes seen in earlier generations, and the run needs to be long enough for those to be found.
+    :param seed: the seed both runs use
+    :type seed: int, optional
+    :param generations: the amount of generations both runs last
+    :type generations: int, optional
+    :return: a boolean stating whether both runs found the same nondominated front, and the amount of cache hits in
+             the run with the cache on
+    """
+    DataConverter.load_catalogues()
+    fronts = []
+    hits = 0
+    for enabled in (True, False):
+        session = OptimisationSession.OptimisationSession(copy.deepcopy(BENCHMARK_FILTERS),
+                                                          RunConfig.RunConfig(generations=generations, seed=seed))
+        reset_state(session, seed)
+        FitnessCache.cache.enabled = enabled
+        try:
+            front = ChromosomeController.begin_optimising(session)
+        finally:
+            FitnessCache.cache.enabled = True
+        if enabled:
+            hits = FitnessCache.cache.hits
+        fronts.append([(chromosome.get_data_as_filters(), chromosome.get_tag_fitness_values()) for chromosome in front])
+    return fronts[0] == fronts[1], hits
+
+
+def compare_results(previous, current, threshold=0.2):
+    """
+    Compares the median timings of two benchmark runs, and finds which benchmarks have got slower or faster.
+    :param previous: the earlier results, as from run_benchmarks
+    :type previous: dict
+    :param current: the new results, as from run_benchmarks
+    :type current: dict
+    :param threshold: the relative change in median time beyond which a benchmark counts as changed
+    :type threshold: float, optional
+    :return: a dictionary linking each benchmark in both runs to it's [previous median, current median, ratio, status]
+    """
+    comparison = dict()
+    for name, timings in current.items():
+        if name not in previous:
+            continue
+        ratio = timings["median"] / previous[name]["median"] if previous[name]["median"] > 0 else 1
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        comparison[name] = [previous[name]["median"], timings["median"], ratio, status]
+    return comparison
+
+
+def print_comparison(comparison):
+    """
+    Prints a comparison of two benchmark runs as a table.
+    :param comparison: the comparison, as from compare_results
+    :type comparison: dict
+    """
+    print(f"{'Benchmark':<28}{'Previous (ms)':>15}{'Current (ms)':>15}{'Ratio':>8}  Status")
+    for name, [previousTime, currentTime, ratio, status] in comparison.items():
+        print(f"{name:<28}{previousTime * 1000:>15.2f}{currentTime * 1000:>15.2f}{ratio:>8.2f}  {status}")
+
+
+def begin():
+    """
+    Runs the benchmarks from the command line, writing the results to a JSON file, and optionally comparing them
+    against an earlier results file. Exits with status 1 if any benchmark has regressed.
+    python -m Code.Optimisation.Benchmarks --output new.json --compare old.json
+    Alternatively, checks the fitness cache doesn't change a seeded run's front, exiting with status 1 if it does.
+    python -m Code.Optimisation.Benchmarks --check-cache --seed 0
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks character building and optimisation.")
+    parser.add_argument("--output", default="benchmarks.json", help="the file to write the results to")
+    parser.add_argument("--compare", help="an earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="the relative slowdown in median time that counts as a regression")
+    parser.add_argument("--repeats", type=int, default=20, help="the amount of times each operation is timed")
+    parser.add_argument("--runs", type=int, default=3, help="the amount of full optimisation runs timed")
+    parser.add_argument("--seed", type=int, default=0, help="the seed every benchmark starts from")
+    parser.add_argument("--check-cache", action="store_true",
+                        help="only check a seeded run finds the same front with the fitness cache on and off")
+    args = parser.parse_args()
+
+    if args.check_cache:
+        sameFront, hits = check_cache(args.seed)
+        if sameFront:
+            print(f"The run seeded with {args.seed} found the same front with the fitness cache on and off, with "
+                  f"{hits} cache hits")
+            return
+        print(f"The run seeded with {args.seed} found a different front with the fitness cache off, with {hits} cache "
+              f"hits")
+        sys.exit(1)
+
+    results = run_benchmarks(args.repeats, args.runs, args.seed)
+    # the memory is measured separately from the timings, as tracing allocations slows everything down
+    memory = measure_memory(OptimisationSession.OptimisationSession(copy.deepcopy(BENCHMARK_FILTERS)),
+                            MEMORY_SAMPLE_SIZE, args.seed)
+    output = {"meta": {"date": datetime.datetime.now().isoformat(timespec="seconds"),
+                       "python": platform.python_version(), "platform": platform.platform(),
+                       "repeats": args.repeats, "runs": args.runs, "seed": args.seed},
+              "benchmarks": results, "memory": memory}
+    with open(args.output, "w") as file:
+        json.dump(output, file, indent=2)
+    print(f"Results written to {args.output}")
+    print(f"Each chromosome holds {memory['bytesPerChromosome']} bytes, across {memory['chromosomes']} chromosomes")
+
+    if args.compare is None:
+        for name, timings in results.items():
+            print(f"{name:<28}{timings['median'] * 1000:>10.2f}ms")
+        return
+
+    with open(args.compare) as file:
+        previous = json.load(file)["benchmarks"]
+    comparison = compare_results(previous, results, args.threshold)
+    print_comparison(comparison)
+    if any(status == "regression" for [_, _, _, status] in comparison.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    begin()
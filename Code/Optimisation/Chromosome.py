@@ -1,41 +1,13 @@
-import itertools
-import math
-from collections import Counter
-
-from Code.Database import CoreDatabase as Db, DataExtractor
-
-
-def pull_generic_tag(tag_name, data, weight, archetype_tags, archetype_weight_dict):
-    """
-    Adjusts the inputted weighting dictionary based on the occurrences of archetype tags in the inputted data set.
-    :param tag_name: the singular name of the type of item being pulled, such as Spell
-    :type tag_name: str
-    :param data: the names of all data pieces to pull tags from, with their relevant data values, in a 2D array
-    :type data: list
-    :param weight: the weighting to be applied to recorded occurrences of the tags
-    :type weight: int
-    :param archetype_tags: the tags that apply to the archetype(s) selected in creating the chromosome
-    :type archetype_tags: set
-    :param archetype_weight_dict: a dictionary, linking an archetype tag to the (weighted) occurences of it so far
-    :type archetype_weight_dict: dict
-    :return: the updated archetype weight dictionary
-    """
-    for dataPiece, dataValue in data:
-        tags = DataExtractor.get_names_from_connector(tag_name, "GenericTag", input_name=dataPiece)
-        tagAmnt = Counter(tags)
-        for match in set(tags).intersection(archetype_tags):
-            # calculates the weighted value of the match, based on it's amount of occurrences, and adds this
-            # to the archetype weighting dictionaries current value
-            weightedWorth = (tagAmnt[match] * (weight + dataValue))
-            archetype_weight_dict.update({match: (archetype_weight_dict[match] + weightedWorth)})
-    return archetype_weight_dict
+from Code.Optimisation import FitnessEngine
 
 
 class Chromosome:
     """A singular potential solution for the optimisation problem."""
 
-    fitness = 0
-    generic_tags = dict()
+    # slots are used as populations can hold many thousands of chromosomes, with the weak reference slot allowing
+    # a session to track which are still alive
+    __slots__ = ("character", "health", "archs", "magic", "tagNames", "tagWeights", "tagFitness", "genericTags",
+                 "fitness", "genome", "engine", "vectors", "__weakref__")
 
     def __init__(self, character, tags, magic_weight, health_weight, archs):
         """
@@ -43,8 +15,9 @@ class Chromosome:
         This should be called primarily, if not completely, through the ChromosomeController.
         :param character: the character the chromosome will represent
         :type character: class: `Character.Character`
-        :param tags: the tags that it's sorting will judge it off, in a [tag, weight] layout
-        :type tags: list
+        :param tags: the tags that it's sorting will judge it off, in a (tag, weight) layout and in the order of the
+                     objective columns
+        :type tags: tuple
         :param magic_weight: the weighting of how magic the chromosome is
         :type magic_weight: float
         :param health_weight: the weighting of how tanky the chromosome is
@@ -53,6 +26,8 @@ class Chromosome:
         :type archs: tuple
         """
         self.character = character
+        self.fitness = None
+        self.genome = None
         self.health = [health_weight, (character.chrClass.hitDice - 6)/2 + character.ability_mod("CON")]
         self.archs = archs
 
@@ -64,68 +39,81 @@ class Chromosome:
         for (ability, spells) in character.magic.spellcasting.items():
             self.magic[1] += len(spells)
 
-        # tags is a 2D array with nested array layouts of [tag, tags' weighting, tags' individual fitness]
-        self.tags = []
-        for (tag, weight) in sorted(tags):
-            self.tags.append([tag, weight, 0])
+        # the tags are held in the order they're given, with their names shared by every chromosome using the same
+        # fitness engine and their individual fitness values held in a float array
+        self.engine = FitnessEngine.get_engine([tag for (tag, _) in tags])
+        self.tagNames = self.engine.tagNames
+        self.tagWeights = tuple(weight for (_, weight) in tags)
+        # the tag fitness values, and the weighted occurrences of each generic tag relevant to the tags in the engine's
+        # relevantGenerics order, are left unset until the chromosome is evaluated alongside the rest of it's population
+        self.tagFitness = None
+        self.genericTags = None
 
         self.extract_tags()
 
+    @property
+    def tags(self):
+        """
+        Gets the tags in a 2D array, with nested array layouts of [tag, tags' weighting, tags' individual fitness].
+        :return: the list of tags
+        """
+        self.evaluate()
+        return [[tag, weight, fitness] for tag, weight, fitness in
+                zip(self.tagNames, self.tagWeights, self.tagFitness.tolist())]
+
+    @property
+    def generic_tags(self):
+        """
+        Gets the weighted occurrences of each generic tag relevant to the chromosome's tags.
+        :return: a dictionary linking each generic tag name to it's value
+        """
+        self.evaluate()
+        return dict(zip(self.engine.relevantGenerics, self.genericTags.tolist()))
+
     def get_tag_fitness_values(self):
         """
         Returns the tag fitness values in the order they're stored.
         :return: the tag fitness values, in a list
         """
-        weights = [self.health[1], self.magic[1]]
-        for (_, _, fitness) in self.tags:
-            weights.append(fitness)
-        return weights
+        self.evaluate()
+        return [self.health[1], self.magic[1]] + self.tagFitness.tolist()
+
+    def set_fitness(self, tag_fitness, generic_tags):
+        """
+        Stores the evaluated tag fitness of the chromosome, and sums it's total fitness.
+        :param tag_fitness: the fitness value of each tag, in the order the tags are stored
+        :type tag_fitness: class: `numpy.ndarray`
+        :param generic_tags: the weighted occurrences of each relevant generic tag, in the engine's relevantGenerics
+                             order
+        :type generic_tags: class: `numpy.ndarray`
+        """
+        self.tagFitness = tag_fitness
+        self.genericTags = generic_tags
+        self.calculate_fitness()
 
     def calculate_fitness(self):
         """
         Sums the total of all tags' fitness values.
         """
-        for (_, _, fitness) in self.tags:
+        self.fitness = 0
+        for fitness in self.tagFitness.tolist():
             self.fitness += fitness
 
-    def update_indiv_tag_fitness(self, tag, addition):
+    def extract_tags(self):
         """
-        Updates the fitness value of a given tag.
-        :param tag: the tag to update the fitness of
-        :type tag: str
-        :param addition: the amount to increase the tag fitness by
-        :type addition: int
+        Extracts the vectors the fitness engine built for the chromosome's tags evaluates it from.
         """
-        # flatten tagsFitness to get the tags' array index from the name
-        index = int(list(itertools.chain(*self.tags)).index(tag) / 3)
-        self.tags[index][2] = round(self.tags[index][2] + addition * self.tags[index][1], 2)
+        self.vectors = self.engine.chromosome_vectors(self)
 
-    def extract_tags(self):
+    def evaluate(self):
         """
-        Extracts the needed information from each tag.
+        Evaluates the chromosome's tag fitness on it's own, or takes it from the fitness cache, if it hasn't already
+        been evaluated.
+        Populations are evaluated together by the optimisation problem and duplicate elimination, so this is only
+        needed when a single chromosome's values are used outside of them.
         """
-        self.ability_scores_tag()
-        self.generic_tags = self.pull_generic_tags()
-        for (tag, weight, fitness) in self.tags:
-            self.update_indiv_tag_fitness(tag, self.get_tag_fitness(tag))
-        self.calculate_fitness()
-
-    def get_tag_fitness(self, tag):
-        """
-        Gets the unweighted fitness value of a tag relative to it's character.
-        :param tag: the tag applying to the character
-        :type tag: str
-        :return: the integer weight
-        """
-        fitness = 0
-        tagId = Db.get_id(tag, "Tag")
-        fitness += self.proficiencies_total(tagId)
-        Db.cursor.execute(f"SELECT genericTagName FROM GenericTag WHERE genericTagId IN "
-                          f"(SELECT genericTagId FROM ArchTagConn WHERE tagId={Db.get_id(tag, 'Tag')})")
-        for genericTag in list(itertools.chain(*Db.cursor.fetchall())):
-            fitness += self.generic_tags[genericTag]
-
-        return fitness
+        if self.tagFitness is None:
+            FitnessEngine.apply_population([self])
 
     def get_tag_index(self, tag_name):
         """
@@ -134,34 +122,10 @@ class Chromosome:
         :type tag_name: str
         :return: the index int of the tag, or -1 if it doesn't exist
         """
-        counter = 0
-        for tagData in self.tags:
-            if tagData[0] == tag_name:
-                return counter
-            else:
-                counter += 1
+        if tag_name in self.tagNames:
+            return self.tagNames.index(tag_name)
         return -1
 
-    def proficiencies_total(self, tag_id):
-        """
-        Counts how many proficiencies the character has that are appropriate to the given tag.
-        :param tag_id: the id of the given tag to use for comparisons
-        :type tag_id: int
-        :return: the integer value of how many proficiencies are relevant
-        """
-        values = 0
-        Db.cursor.execute("SELECT proficiencyId FROM TagProficiency WHERE tagId=" + str(tag_id))
-        for pId in Db.cursor.fetchall():
-            Db.cursor.execute("SELECT proficiencyName FROM Proficiency WHERE proficiencyId=" + str(pId[0]))
-            try:
-                prof = Db.cursor.fetchone()[0]
-                if prof in self.character.proficiencies:
-                    values += self.character.get_skill_value(prof)
-            except TypeError:
-                pass
-
-        return values
-
     def spellslots_value(self):
         """
         Calculates the total magic value provided from the spellslots.
@@ -172,70 +136,6 @@ class Chromosome:
             value += lvl * amnt
         return value
 
-    def ability_scores_tag(self):
-        """
-        Converts the current ability scores into one weighted integer, if they're related to tag.
-        """
-        # while it'll never be part of the intersect, health is kept in for tags-to-ability-score index consistency
-        potentialTags = ["strong", "dexterous", "health", "wise", "knowledgeable", "charismatic"]
-        # for every archetype-owned tag within potentialTags, ignoring casing
-        for tag in list(set([x.lower() for x in potentialTags])
-                        .intersection(set([x[0].lower() for x in self.tags]))):
-            value = list(self.character.abilityScores.values())[potentialTags.index(tag)]
-            self.update_indiv_tag_fitness(tag.title(), math.floor(value/2)-5)
-
-    def pull_generic_tags(self):
-        """
-        Pulls all information linked to the GenericTag table from each archetype tag, and monitors how often
-        it is used in the selected spells, equipment and traits.
-        :return: the list information of all generic tags
-        """
-        # stores a set of the tags relevant to the selected archetype(s)
-        archetypeTags = set()
-        # stores a dictionary of (tag, value) pairs, where the pair is the weighted occurrences of the tag
-        archetypeWeightDict = dict()
-        # stores the weights of the generic tags, in [equipment, spell, trait] order
-        weights = [1, 1, 1]
-
-        # fills out the set and dictionary of the tags
-        for tag in self.tags:
-            archetypeTags.update(set(DataExtractor.get_names_from_connector("Tag", "GenericTag", input_name=tag[0])))
-        for tag in archetypeTags:
-            archetypeWeightDict.update({tag: 0})
-
-        # prepares lists of the names of each data group, with their related data values
-        # they have easily adjustable data value weightings, with the base values typically being
-        # their maximum dice values, plus 1 for every dice above 1, to represent the benefit of more dice
-        equipment, spells, traits = [], [], []
-        for eq in set(self.character.chrClass.equipment):
-            if eq.armorClass != 0:
-                equipVal = (eq.armorClass - 10)/4.0
-            elif eq.dice is not None:
-                diceValues = eq.dice.split("d")
-                equipVal = (int(diceValues[0]) * int(diceValues[1])) + (int(diceValues[0]) - 1)
-                equipVal /= 6.0
-            else:
-                equipVal = 0
-            equipment.append([eq.name, equipVal])
-
-        for spell in (self.character.magic.knownSpells + self.character.magic.preparedSpellOptions):
-            if spell.damage is None:
-                spellDmg = 0
-            else:
-                spellDmgVals = spell.damage.split("d")
-                spellDmg = (int(spellDmgVals[0]) * int(spellDmgVals[1])) + (int(spellDmgVals[0]) - 1)
-                spellDmg /= 6.0
-            spells.append([spell.name, spellDmg])
-
-        for trait in self.character.traits:
-            traits.append([trait[0], 0])
-
-        archetypeWeightDict = pull_generic_tag("Equipment", equipment, weights[0], archetypeTags, archetypeWeightDict)
-        archetypeWeightDict = pull_generic_tag("Spell", spells, weights[1], archetypeTags, archetypeWeightDict)
-        archetypeWeightDict = pull_generic_tag("Trait", traits, weights[2], archetypeTags, archetypeWeightDict)
-
-        return archetypeWeightDict
-
     def get_data_as_filters(self):
         """
         Retrieves the chromosome data that would be require to recreate it with the chromosome controller.
@@ -248,24 +148,50 @@ class Chromosome:
 
         return results
 
+    def get_genome_key(self):
+        """
+        Gets a canonical form of the chromosome's data and archetypes, which is the same for any chromosomes that would
+        be evaluated identically. As a chromosome's character is never changed, it's only built the first time it's
+        needed.
+        Skills, proficiencies and languages are held as sets, while every spell, equipment item and chosen trait is
+        kept, as each one held is evaluated.
+        :return: a hashable tuple of the chromosome's data
+        """
+        if self.genome is None:
+            filters = self.get_data_as_filters()
+            abilities = tuple((ability, score) for ability, [score, _] in sorted(filters['Abilities'].items()))
+            self.genome = (filters['Race'], filters.get('Subrace'), filters['Class'], filters.get('Subclass'),
+                           filters['Background'], tuple(sorted(set(filters['Skills']))),
+                           tuple(sorted(set(filters['Proficiencies']))), tuple(sorted(set(filters['Languages']))),
+                           tuple(sorted(filters['Spells'])), tuple(sorted(filters['Equipment'])),
+                           tuple(sorted(trait[0] for trait in self.character.traits)), abilities, self.archs)
+        return self.genome
+
+    def get_fingerprint(self):
+        """
+        Gets a hashable form of everything the chromosome's evaluation is calculated from, so chromosomes with equal
+        fingerprints are always evaluated identically. The chromosome doesn't need to have been evaluated.
+        :return: a tuple of the tag names, the tag weights, the bytes of each of the fitness engine's vectors, the
+                 health and the magic
+        """
+        return self.tagNames, self.tagWeights, tuple(vector.tobytes() for vector in self.vectors), \
+            tuple(self.health), tuple(self.magic)
 
     def __eq__(self, other):
         """
-        Compares the chromosome object with another chromosome.
-        Note that this function could be condensed into one line, but is separated for the sake of clarity and potential
-        error locating.
+        Compares the chromosome object with another chromosome, on everything their evaluations are calculated from.
         :param other: the other chromosome object to compare against
         :type other: Chromosome
         :return: a boolean stating whether they're equal
         """
-        # compares the tags and fitness
-        isEqual = self.fitness == other.fitness and self.generic_tags == other.generic_tags \
-                                                and sorted(self.tags) == sorted(other.tags)
-
-        # compares the health and magic
-        isEqual = isEqual and self.health == other.health and self.magic == other.magic
+        return self.get_fingerprint() == other.get_fingerprint()
 
-        return isEqual
+    def __hash__(self):
+        """
+        Hashes the chromosome based on it's fingerprint, so that equal chromosomes share a hash.
+        :return: the hashed value produced
+        """
+        return hash(self.get_fingerprint())
 
     def __str__(self):
         """
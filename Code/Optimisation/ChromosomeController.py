@@ -1,34 +1,44 @@
 import itertools
+import threading
 
 from pymoo.algorithms.nsga2 import NSGA2
 from pymoo.factory import np
 from pymoo.optimize import minimize
 
-from Code.Database import CharacterBuilder, DataConverter, CoreDatabase as Db
+from Code.Database import CharacterBuilder, DataConverter, CoreDatabase as Db, QueryCatalogue as Queries
+from Code.Optimisation import OptimisationSession, ParallelBuilder
 from Code.Optimisation.Chromosome import Chromosome
 from Code.Optimisation.PymooOverwrites import ChrMutation, ChrCrossover, ChrSampling, ChrDuplicates, ChrProblem
 
-currentGen = []
-nondominatedFront = []
-constFilters = dict()
+# links each (primary, secondary) archetype pair to it's health weighting, magic weighting and tag weightings,
+# along with the database snapshot they were calculated from. a profile is never changed once calculated, so every
+# thread can share them, and profileLock ensures each is only calculated once
+archetypeProfiles = dict()
+profileSnapshot = None
+profileLock = threading.Lock()
 
 
-def set_const_filters(filters):
+def build_chromosome(session, filters):
     """
-    Sets the constant filters to be used regardless of chromosome being built.
-    :param filters: the filters to be the new constant filters
+    Builds a chromosome and counts it within the session.
+    :param session: the optimisation run the chromosome is built for
+    :type session: class: `Optimisation.OptimisationSession`
+    :param filters: the filters to use to build the chromosome
     :type filters: dict
+    :return: The created chromosome object
     """
-    global constFilters
-    constFilters = filters
+    return chromosome_from_spec(session, build_character_spec(filters, session.constFilters))
 
 
-def build_chromosome(filters):
+def build_character_spec(filters, const_filters):
     """
-    Builds a chromosome and adds it to the list of current chromosomes.
-    :param filters: the filters to use to build the chromosome
+    Builds a character and collects everything else needed to make a chromosome from it.
+    The output holds no database connections, so can be passed between processes.
+    :param filters: the filters to use to build the character
     :type filters: dict
-    :return: The created chromosome object
+    :param const_filters: the constant filters of the run, which limit the character's ability scores
+    :type const_filters: dict
+    :return: a tuple of the character, it's tags, the magic weighting, the health weighting and the archetypes used
     """
     # retrieves the needed filters for building a chr
     convertedFilters = []
@@ -62,7 +72,7 @@ def build_chromosome(filters):
     # builds a character
     convertedFilters = CharacterBuilder.take_choices(convertedFilters)
     abilities = filters.get("Abilities", dict())
-    for ability, [min_val, max_val] in constFilters.get("Abilities", dict()).items():
+    for ability, [min_val, max_val] in const_filters.get("Abilities", dict()).items():
         currentAbilityFilter = abilities.get(ability, [min_val, max_val])
         if currentAbilityFilter[0] < min_val:
             abilities[ability][0] = min_val
@@ -81,80 +91,122 @@ def build_chromosome(filters):
         secondaryArch = None
     healthWeight, magicWeight, tags = extract_tags(primaryArch, secondaryArch)
 
-    # combines it all to make a chromosome
-    tags = [[i, j] for (i, j) in tags.items()]
-    chromosome = Chromosome(newChr, tags, magicWeight, healthWeight, (primaryArch, secondaryArch))
-    currentGen.append(chromosome)
+    # the tags are fixed in the order of the run's objective columns, sorted by name, so every chromosome holds them
+    # the same way
+    tags = tuple(sorted(tags.items()))
+    return newChr, tags, magicWeight, healthWeight, (primaryArch, secondaryArch)
+
+
+def chromosome_from_spec(session, spec):
+    """
+    Combines a built character spec into a chromosome, and counts it within the session.
+    :param session: the optimisation run the chromosome is built for
+    :type session: class: `Optimisation.OptimisationSession`
+    :param spec: the character, tags, magic weighting, health weighting and archetypes, as from build_character_spec
+    :type spec: tuple
+    :return: The created chromosome object
+    """
+    chromosome = Chromosome(*spec)
+    session.track(chromosome)
     return chromosome
 
 
 def extract_tags(primary_arch, secondary_arch=None):
     """
     Extracts the tags and their calculated weighting from archetypes.
+    The results are calculated once for each pair of archetypes, and reused until the database changes.
     :param primary_arch: the name of the primary archetype
     :type primary_arch: str
     :param secondary_arch: the name of the secondary archetype
     :type secondary_arch: str
     :return: The health weighting, the magic weighting, and a dictionary linking tags to their weights
     """
+    global profileSnapshot
+    if secondary_arch is None:
+        secondary_arch = primary_arch
+    with profileLock:
+        if Db.get_snapshot() is not profileSnapshot:
+            archetypeProfiles.clear()
+            profileSnapshot = Db.get_snapshot()
+
+        if (primary_arch, secondary_arch) not in archetypeProfiles:
+            archetypeProfiles[(primary_arch, secondary_arch)] = archetype_profile(primary_arch, secondary_arch)
+        healthWeight, magicWeight, tags = archetypeProfiles[(primary_arch, secondary_arch)]
+    return healthWeight, magicWeight, dict(tags)
+
+
+def archetype_profile(primary_arch, secondary_arch):
+    """
+    Calculates the health weighting, magic weighting and tag weightings of a pair of archetypes, with the primary
+    archetype weighted twice as heavily as the secondary.
+    :param primary_arch: the name of the primary archetype
+    :type primary_arch: str
+    :param secondary_arch: the name of the secondary archetype, which may be the same as the primary
+    :type secondary_arch: str
+    :return: The health weighting, the magic weighting, and a dictionary linking tags to their weights
+    """
+    archetypes = dict()
+    rows = Queries.fetch_all("archetypeProfiles", (primary_arch, secondary_arch))
+    for (archName, healthWeighting, magicWeighting, tagName, weighting) in rows:
+        archetype = archetypes.setdefault(archName, [healthWeighting, magicWeighting, []])
+        if tagName is not None:
+            archetype[2].append((tagName, float(weighting)))
+    if primary_arch not in archetypes:
+        raise Exception(f"There is no archetype named {primary_arch}")
+
     archWeights = (2, 1)
     tags = dict()
     healthWeight = 0
     magicWeight = 0
-    if secondary_arch is None:
-        secondary_arch = primary_arch
-
-    archCount = 0
-    for arch in [primary_arch, secondary_arch]:
-        Db.cursor.execute(f"SELECT archetypeId, healthWeighting, magicWeighting FROM Archetype "
-                          f"WHERE archetypeName='{arch}'")
-
-        for (archId, healthWeighting, magicWeighting) in Db.cursor.fetchall():
-            healthWeight += healthWeighting * archWeights[archCount]
-            magicWeight += magicWeighting * archWeights[archCount]
-
-            Db.cursor.execute(f"SELECT tagName, tagId FROM Tag WHERE tagId IN ("
-                              f"SELECT tagId FROM ArchetypeTag WHERE archetypeId={str(archId)})")
-            for (name, tagId) in Db.cursor.fetchall():
-                Db.cursor.execute(f"SELECT weighting FROM ArchetypeTag WHERE tagId={str(tagId)}")
-                if name in tags.keys():
-                    newVal = tags[name] + float(Db.cursor.fetchone()[0]) * archWeights[archCount]
-                else:
-                    newVal = float(Db.cursor.fetchone()[0]) * archWeights[archCount]
-                tags.update({name: round(newVal, 2)})
-
-        archCount += 1
+    for archCount, arch in enumerate([primary_arch, secondary_arch]):
+        if arch not in archetypes:
+            continue
+        healthWeighting, magicWeighting, archTags = archetypes[arch]
+        healthWeight += healthWeighting * archWeights[archCount]
+        magicWeight += magicWeighting * archWeights[archCount]
+        for (name, weighting) in archTags:
+            tags[name] = round(tags.get(name, 0) + weighting * archWeights[archCount], 2)
     return round(healthWeight, 2), round(magicWeight, 2), tags
 
 
-def begin_optimising():
+def begin_optimising(session, callback=None):
     """
-    Begins the optimisation process for the character requirements.
+    Begins the optimisation process for the character requirements, storing the nondominated front found in the
+    session. Everything else the run built up is released once it ends.
+    :param session: the optimisation run, holding the filters and settings to optimise with
+    :type session: class: `Optimisation.OptimisationSession`
+    :param callback: called after each generation, to report progress or cancel the run
+    :type callback: class: `PymooOverwrites.ChrCallback`, optional
+    :return: the nondominated front found
     """
-    # gets the amount of unique tags that the primary - and secondary, if appropriate - archetype(s) optimise
-    if constFilters.get('Secondary', []):
-        Db.cursor.execute(f"SELECT COUNT(DISTINCT tagId) FROM ArchetypeTag "
-                          f"WHERE archetypeId IN ({Db.get_id(constFilters['Primary'], 'Archetype')}, "
-                          f"{Db.get_id(constFilters['Secondary'], 'Archetype')})")
-        tag_num = int(Db.cursor.fetchone()[0])
-    else:
-        Db.cursor.execute(f"SELECT COUNT(DISTINCT tagId) FROM ArchetypeTag "
-                          f"WHERE archetypeId={Db.get_id(constFilters['Primary'], 'Archetype')}")
-        tag_num = int(Db.cursor.fetchone()[0])
+    config = session.config
+    DataConverter.load_catalogues()
 
+    # gets the amount of unique tags that the primary - and secondary, if appropriate - archetype(s) optimise
+    tag_num = len(extract_tags(session.constFilters['Primary'], session.constFilters.get('Secondary') or None)[2])
     tag_num += 2  # for the magic and health tags
-    algorithm = NSGA2(pop_size=10, sampling=ChrSampling.ChrSampling(), crossover=ChrCrossover.ChrCrossover(),
-                      mutation=ChrMutation.ChrMutation(), eliminate_duplicates=ChrDuplicates.ChrDuplicates())
-    results = minimize(ChrProblem.ChrProblem(tag_num), algorithm, ("n_gen", 20))
-    nondominatedFront.clear()
-    nondominatedFront.extend(list(itertools.chain(*results.X[np.argsort(results.F[:, 0])])))
+    if config.workers != 0:
+        session.pool = ParallelBuilder.start_pool(config.workers, session.constFilters)
+    try:
+        algorithm = NSGA2(pop_size=config.popSize, n_offsprings=config.offspringNum,
+                          sampling=ChrSampling.ChrSampling(session), crossover=ChrCrossover.ChrCrossover(session),
+                          mutation=ChrMutation.ChrMutation(session),
+                          eliminate_duplicates=ChrDuplicates.ChrDuplicates())
+        # the algorithm isn't copied, as it's operators must keep referring to this session rather than a copy of it
+        results = minimize(ChrProblem.ChrProblem(tag_num), algorithm, config.get_termination(), seed=config.seed,
+                           callback=callback, copy_algorithm=False)
+    finally:
+        session.release()
+    session.nondominatedFront.clear()
+    session.nondominatedFront.extend(list(itertools.chain(*results.X[np.argsort(results.F[:, 0])])))
+    return session.nondominatedFront
 
 
 def begin():
-    constFilters.update({'Primary': 'Creator'})
-    begin_optimising()
+    session = OptimisationSession.OptimisationSession({'Primary': 'Creator'})
+    begin_optimising(session)
     print("\n\n\nComplete!")
-    print(nondominatedFront)
-    for element in nondominatedFront:
+    print(session.nondominatedFront)
+    for element in session.nondominatedFront:
         print(element)
 
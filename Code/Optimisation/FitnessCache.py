@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+
+from Code.Database import CoreDatabase as Db
+
+
+class FitnessCache:
+    """A bounded least-recently-used store of evaluated tag fitness, keyed by chromosome genome."""
+
+    def __init__(self, max_size=4096):
+        """
+        Sets up an empty cache.
+        :param max_size: the maximum amount of genomes stored before the least recently used is discarded
+        :type max_size: int, optional
+        """
+        self.maxSize = max_size
+        self.values = OrderedDict()
+        self.snapshot = None
+        self.hits = 0
+        self.misses = 0
+        # the cache can be turned off, so that runs can be checked to give the same results without it
+        self.enabled = True
+        # the cache is shared by every run, including runs in separate threads, so it's changed under a lock
+        self.lock = threading.Lock()
+
+    def get(self, genome):
+        """
+        Gets the stored tag fitness of a genome, counting whether it was found or not.
+        The cache is emptied first if the database has changed since the values were stored.
+        :param genome: the genome to find, as from Chromosome.get_genome_key
+        :type genome: tuple
+        :return: a tuple of the tag fitness and generic tag value numpy arrays, as given to Chromosome.set_fitness, or
+                 None if the genome isn't stored or the cache is turned off
+        """
+        if not self.enabled:
+            return None
+        with self.lock:
+            if Db.get_snapshot() is not self.snapshot:
+                self.values.clear()
+                self.snapshot = Db.get_snapshot()
+
+            values = self.values.get(genome)
+            if values is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.values.move_to_end(genome)
+            return values
+
+    def put(self, genome, values):
+        """
+        Stores the tag fitness of a genome, discarding the least recently used genome if the cache is full. Nothing is
+        stored while the cache is turned off.
+        :param genome: the genome to store the values for, as from Chromosome.get_genome_key
+        :type genome: tuple
+        :param values: the tag fitness and generic tag value numpy arrays of the genome
+        :type values: tuple
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            self.values[genome] = values
+            self.values.move_to_end(genome)
+            while len(self.values) > self.maxSize:
+                self.values.popitem(last=False)
+
+    def clear(self):
+        """
+        Empties the cache and resets it's counters.
+        """
+        with self.lock:
+            self.values.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        """
+        Gets the amount of genomes currently stored.
+        :return: the int size of the cache
+        """
+        return len(self.values)
+
+    def __str__(self):
+        """
+        Converts the cache into a string stating it's usage.
+        :return: the string of it's usage
+        """
+        lookups = self.hits + self.misses
+        hitRate = 0 if lookups == 0 else round(self.hits / lookups * 100, 1)
+        return f"{len(self.values)}/{self.maxSize} genomes stored, with {self.hits} hits and {self.misses} misses " \
+               f"({hitRate}% hit rate)."
+
+
+# the cache shared by every optimisation run
+cache = FitnessCache()
@@ -0,0 +1,244 @@
+import math
+import sys
+import threading
+
+import numpy as np
+
+from Code.Database import CoreDatabase as Db, DataExtractor
+from Code.Optimisation import FitnessCache
+
+# the tables holding items that connect a character to generic tags, in [equipment, spell, trait] order
+ITEM_TABLES = ["Equipment", "Spell", "Trait"]
+# the tags that directly relate to an ability score, in the same order as a character's ability scores
+# while it'll never be an archetype tag, health is kept in for tags-to-ability-score index consistency
+ABILITY_TAGS = ["strong", "dexterous", "health", "wise", "knowledgeable", "charismatic"]
+
+# links a tuple of archetype tag names to the engine built for them, and the database snapshot they were built from.
+# an engine is never changed once built, so every thread can share them, and engineLock ensures each is only built once
+engines = dict()
+engineSnapshot = None
+engineLock = threading.Lock()
+
+
+def get_engine(tags):
+    """
+    Gets the fitness engine for a set of archetype tags, building it if it doesn't already exist.
+    :param tags: the names of the archetype tags to be evaluated, in the order chromosomes store them
+    :type tags: list
+    :return: the FitnessEngine object for the tags
+    """
+    global engineSnapshot
+    tags = tuple(tags)
+    with engineLock:
+        if Db.get_snapshot() is not engineSnapshot:
+            engines.clear()
+            engineSnapshot = Db.get_snapshot()
+
+        if tags not in engines:
+            engines[tags] = FitnessEngine(tags)
+        return engines[tags]
+
+
+def evaluate_population(chromosomes, n_obj):
+    """
+    Evaluates the objective values of a whole population, storing the tag fitness within any chromosome that hasn't
+    yet been evaluated.
+    :param chromosomes: the chromosomes to evaluate
+    :type chromosomes: list
+    :param n_obj: the amount of objectives each chromosome is evaluated on
+    :type n_obj: int
+    :return: a (population size, n_obj) numpy array of the health, magic and tag fitness values, in that order
+    """
+    apply_population(chromosomes)
+    objectives = np.zeros((len(chromosomes), n_obj), dtype=float)
+    for index, chromosome in enumerate(chromosomes):
+        # any objectives not covered are left as 0, and any values beyond the objectives are ignored
+        values = chromosome.get_tag_fitness_values()[:n_obj]
+        objectives[index, :len(values)] = values
+    return objectives
+
+
+def apply_population(chromosomes):
+    """
+    Stores the tag fitness within every chromosome that hasn't yet been evaluated. Chromosomes with a genome already
+    in the fitness cache take it's values, and the rest are evaluated with one batched calculation per fitness engine
+    used, only evaluating each unseen genome once.
+    :param chromosomes: the chromosomes to evaluate and update
+    :type chromosomes: list
+    """
+    unseen = dict()
+    for chromosome in chromosomes:
+        if chromosome.tagFitness is not None:
+            continue
+        genomeKey = chromosome.get_genome_key()
+        if genomeKey in unseen:
+            unseen[genomeKey].append(chromosome)
+            continue
+        cachedValues = FitnessCache.cache.get(genomeKey)
+        if cachedValues is None:
+            unseen[genomeKey] = [chromosome]
+        else:
+            chromosome.set_fitness(*cachedValues)
+
+    groups = dict()
+    for genomeChromosomes in unseen.values():
+        groups.setdefault(genomeChromosomes[0].engine, []).append(genomeChromosomes[0])
+    for engine, group in groups.items():
+        engine.apply_fitness(group)
+
+    for genomeKey, genomeChromosomes in unseen.items():
+        values = (genomeChromosomes[0].tagFitness, genomeChromosomes[0].genericTags)
+        FitnessCache.cache.put(genomeKey, values)
+        for chromosome in genomeChromosomes[1:]:
+            chromosome.set_fitness(*values)
+
+
+def equipment_value(equipment):
+    """
+    Calculates the value of a piece of equipment, based on the armor class or dice it provides.
+    The base value is typically the maximum dice value, plus 1 for every dice above 1, to represent the benefit of
+    more dice.
+    :param equipment: the equipment to value
+    :type equipment: class: `CharacterElements.Equipment`
+    :return: the float value of the equipment
+    """
+    if equipment.armorClass != 0:
+        # armor that adds the wearer's dexterity is valued by it's base armor class
+        return (equipment.get_armor_class(0) - 10)/4.0
+    elif equipment.dice is not None:
+        diceValues = equipment.dice.split("d")
+        return ((int(diceValues[0]) * int(diceValues[1])) + (int(diceValues[0]) - 1))/6.0
+    return 0
+
+
+def spell_value(spell):
+    """
+    Calculates the value of a spell, based on the damage it deals.
+    :param spell: the spell to value
+    :type spell: class: `CharacterElements.Spell`
+    :return: the float value of the spell
+    """
+    if spell.damage is None:
+        return 0
+    spellDmgVals = spell.damage.split("d")
+    return ((int(spellDmgVals[0]) * int(spellDmgVals[1])) + (int(spellDmgVals[0]) - 1))/6.0
+
+
+class FitnessEngine:
+    """Evaluates the tag fitness of chromosomes using incidence matrices built once from the database."""
+
+    # stores the weights of the generic tags gained from each item table, in [equipment, spell, trait] order
+    itemWeights = [1, 1, 1]
+
+    def __init__(self, tags):
+        """
+        Builds the item-to-GenericTag, GenericTag-to-Tag and Tag-to-Proficiency incidence matrices for a set of
+        archetype tags.
+        :param tags: the names of the archetype tags to be evaluated, in the order chromosomes store them
+        :type tags: tuple
+        """
+        self.tags = list(tags)
+        # the tag names are shared by every chromosome built with the engine, rather than each holding it's own copy
+        self.tagNames = tuple(sys.intern(tag) for tag in tags)
+
+        # indexes every generic tag, and every item that can hold generic tags
+        self.genericTags = list(Db.get_table_snapshot("GenericTag")["names"].keys())
+        genericIndex = {name: index for index, name in enumerate(self.genericTags)}
+        self.itemIndex = dict()
+        for table in ITEM_TABLES:
+            for name in Db.get_table_snapshot(table)["names"].keys():
+                self.itemIndex[(table, name)] = len(self.itemIndex)
+
+        # item x GenericTag, counting each occurrence of a generic tag on an item
+        self.itemTags = np.zeros((len(self.itemIndex), len(self.genericTags)))
+        for (table, name), index in self.itemIndex.items():
+            for genericTag in DataExtractor.get_names_from_connector(table, "GenericTag", input_name=name):
+                self.itemTags[index, genericIndex[genericTag]] += 1
+
+        # GenericTag x Tag, with a 1 wherever the generic tag is connected to the archetype tag
+        self.tagGenerics = np.zeros((len(self.genericTags), len(self.tags)))
+        for tagIndex, tag in enumerate(self.tags):
+            for genericTag in set(DataExtractor.get_names_from_connector("Tag", "GenericTag", input_name=tag)):
+                self.tagGenerics[genericIndex[genericTag], tagIndex] = 1
+        # only generic tags relevant to at least one of the archetype tags are counted
+        self.archetypeMask = self.tagGenerics.any(axis=1)
+        self.relevantGenerics = tuple(name for index, name in enumerate(self.genericTags) if self.archetypeMask[index])
+
+        # Tag x Proficiency, counting each connection between an archetype tag and a proficiency
+        tagIds = {Db.get_id(tag, "Tag"): tagIndex for tagIndex, tag in enumerate(self.tags)}
+        profNames = Db.get_table_snapshot("Proficiency")["idNames"]
+        connections = []
+        for row in Db.get_rows("TagProficiency"):
+            if row["tagId"] in tagIds and row["proficiencyId"] in profNames:
+                connections.append((tagIds[row["tagId"]], profNames[row["proficiencyId"]]))
+        self.proficiencies = sorted(set(prof for (_, prof) in connections))
+        profIndex = {prof: index for index, prof in enumerate(self.proficiencies)}
+        self.tagProficiencies = np.zeros((len(self.tags), len(self.proficiencies)))
+        for tagIndex, prof in connections:
+            self.tagProficiencies[tagIndex, profIndex[prof]] += 1
+
+        # the positions of the ability score each tag relates to, or -1 if it isn't related to one
+        self.tagAbilities = [ABILITY_TAGS.index(tag.lower()) if tag.lower() in ABILITY_TAGS else -1
+                             for tag in self.tags]
+
+    def chromosome_vectors(self, chromosome):
+        """
+        Converts a chromosome's character into the vectors the engine evaluates.
+        :param chromosome: the chromosome to convert
+        :type chromosome: class: `Optimisation.Chromosome`
+        :return: the positions and values of the items held, the proficiency value vector and the ability score
+                 addition vector
+        """
+        character = chromosome.character
+
+        # each occurrence of an item adds it's weight and value to it's position
+        items = np.zeros(len(self.itemIndex))
+        for eq in set(character.chrClass.equipment):
+            items[self.itemIndex[("Equipment", eq.name)]] += self.itemWeights[0] + equipment_value(eq)
+        for spell in (character.magic.knownSpells + character.magic.preparedSpellOptions):
+            items[self.itemIndex[("Spell", spell.name)]] += self.itemWeights[1] + spell_value(spell)
+        for trait in character.traits:
+            items[self.itemIndex[("Trait", trait[0])]] += self.itemWeights[2]
+
+        proficiencies = np.array([character.get_skill_value(prof) if prof in character.proficiencies else 0
+                                  for prof in self.proficiencies], dtype=float)
+
+        abilityScores = list(character.abilityScores.values())
+        abilities = np.array([0 if pos == -1 else math.floor(abilityScores[pos]/2)-5 for pos in self.tagAbilities],
+                             dtype=float)
+
+        # a character only holds a few of the items, so only the positions and values of those are kept
+        itemPositions = np.flatnonzero(items).astype(np.int32)
+        return itemPositions, items[itemPositions], proficiencies, abilities
+
+    def evaluate(self, chromosomes):
+        """
+        Evaluates the tag fitness of many chromosomes at once, as matrix products over their stored vectors.
+        :param chromosomes: the chromosomes to evaluate, each holding the vectors produced by chromosome_vectors
+        :type chromosomes: list
+        :return: a (chromosomes, tags) array of weighted tag fitness values, and a (chromosomes, generic tags) array
+                 of the weighted occurrences of each generic tag relevant to the archetype tags
+        """
+        items = np.zeros((len(chromosomes), len(self.itemIndex)))
+        for row, chromosome in enumerate(chromosomes):
+            items[row, chromosome.vectors[0]] = chromosome.vectors[1]
+        proficiencies = np.array([c.vectors[2] for c in chromosomes]).reshape(len(chromosomes),
+                                                                               len(self.proficiencies))
+        abilities = np.array([c.vectors[3] for c in chromosomes]).reshape(len(chromosomes), len(self.tags))
+        weights = np.array([c.tagWeights for c in chromosomes], dtype=float).reshape(len(chromosomes), len(self.tags))
+
+        genericWeights = (items @ self.itemTags) * self.archetypeMask
+        tagValues = genericWeights @ self.tagGenerics + proficiencies @ self.tagProficiencies.T
+        tagFitness = np.round(np.round(abilities * weights, 2) + tagValues * weights, 2)
+        return tagFitness, genericWeights
+
+    def apply_fitness(self, chromosomes):
+        """
+        Evaluates chromosomes and stores the results within each of them.
+        :param chromosomes: the chromosomes to evaluate and update
+        :type chromosomes: list
+        """
+        tagFitness, genericWeights = self.evaluate(chromosomes)
+        genericWeights = genericWeights[:, self.archetypeMask]
+        for row, chromosome in enumerate(chromosomes):
+            chromosome.set_fitness(tagFitness[row].copy(), genericWeights[row].copy())
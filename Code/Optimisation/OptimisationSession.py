@@ -0,0 +1,70 @@
+import weakref
+
+from Code.Optimisation import RunConfig
+
+
+class OptimisationSession:
+    """
+    Holds everything a single optimisation run builds up, so that separate runs can take place at the same time.
+    The only state runs share is the database snapshot and the catalogues, fitness engines and archetype profiles built
+    from it, which are each built under a lock and only read once built. A run in any thread other than the one that
+    loaded the database must first open it's own connection with CoreDatabase.connect_read_only(this_thread=True).
+    """
+
+    def __init__(self, filters, config=None, track_chromosomes=False):
+        """
+        Stores the filters and settings to optimise with, and sets up the run's empty stores.
+        :param filters: the constant filters every chromosome in the run is built with
+        :type filters: dict
+        :param config: the parameters to run the optimisation with, or None to use the defaults
+        :type config: class: `Optimisation.RunConfig`, optional
+        :param track_chromosomes: whether to track which of the chromosomes built are still alive
+        :type track_chromosomes: bool, optional
+        """
+        self.constFilters = filters
+        self.config = RunConfig.RunConfig() if config is None else config
+        self.trackChromosomes = track_chromosomes
+        self.builtCount = 0
+        # links the number of each chromosome built to it, for as long as the population or archive holds it.
+        # only weak references are kept, so a chromosome is freed as soon as the algorithm discards it
+        self.currentGen = weakref.WeakValueDictionary()
+        self.nondominatedFront = []
+        # the pool of worker processes the run builds characters across, or None when they're built in this process
+        self.pool = None
+
+    def track(self, chromosome):
+        """
+        Counts a newly built chromosome, tracking it until it's freed if tracking is enabled.
+        :param chromosome: the chromosome built
+        :type chromosome: class: `Optimisation.Chromosome`
+        """
+        self.builtCount += 1
+        if self.trackChromosomes:
+            self.currentGen[self.builtCount] = chromosome
+
+    def live_count(self):
+        """
+        Gets the amount of chromosomes built during the run that are still alive.
+        :return: the int amount, or None if the chromosomes aren't tracked
+        """
+        if not self.trackChromosomes:
+            return None
+        return len(self.currentGen)
+
+    def release(self):
+        """
+        Frees everything the run holds other than it's nondominated front, once the run is over.
+        """
+        self.currentGen.clear()
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __str__(self):
+        """
+        Converts the object to a string of it's content.
+        :return: the session's filters and progress, in a printable layout
+        """
+        return f"An optimisation of {self.constFilters.get('Primary')}/{self.constFilters.get('Secondary')} " \
+               f"with {self.builtCount} chromosomes built and {len(self.nondominatedFront)} on the " \
+               f"nondominated front. {self.config}"
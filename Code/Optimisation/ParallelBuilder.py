@@ -0,0 +1,64 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Code.Database import CoreDatabase as Db, DataConverter
+from Code.Optimisation import ChromosomeController
+
+# the constant filters of the run a worker process builds characters for. each pool serves a single run, so this is
+# only set within worker processes
+workerFilters = dict()
+
+
+def start_pool(workers, const_filters):
+    """
+    Starts a pool of processes that build characters in parallel.
+    :param workers: the amount of processes to use, or None to use one per core
+    :type workers: int
+    :param const_filters: the constant filters every character is built with
+    :type const_filters: dict
+    :return: the pool, which is shut down once the run is released
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=setup_worker, initargs=(const_filters,))
+
+
+def setup_worker(const_filters):
+    """
+    Prepares a worker process to build characters, with it's own read-only database connection.
+    :param const_filters: the constant filters every character is built with
+    :type const_filters: dict
+    """
+    global workerFilters
+    Db.connect_read_only()
+    DataConverter.load_catalogues()
+    workerFilters = const_filters
+
+
+def build_spec(filters, seed):
+    """
+    Builds a single character spec within a worker process.
+    Seeding each build means the characters produced don't depend on which worker builds them.
+    :param filters: the filters to use to build the character
+    :type filters: dict
+    :param seed: the seed for the random choices made while building
+    :type seed: int
+    :return: the picklable character spec, as from ChromosomeController.build_character_spec
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    return ChromosomeController.build_character_spec(filters, workerFilters)
+
+
+def build_chromosomes(session, filters_list):
+    """
+    Builds a chromosome for each set of filters, spreading the character building across the session's pool.
+    :param session: the optimisation run the chromosomes are built for
+    :type session: class: `Optimisation.OptimisationSession`
+    :param filters_list: the filters to build each chromosome with
+    :type filters_list: list
+    :return: a list of the chromosomes, in the same order as their filters
+    """
+    seeds = [int(seed) for seed in np.random.randint(0, 2**31 - 1, len(filters_list))]
+    specs = session.pool.map(build_spec, filters_list, seeds)
+    return [ChromosomeController.chromosome_from_spec(session, spec) for spec in specs]
@@ -0,0 +1,44 @@
+import time
+
+from pymoo.model.callback import Callback
+
+
+class ChrCallback(Callback):
+    """
+    Reports the progress of the optimisation after each generation, records it's telemetry, and ends it early once
+    it's cancelled.
+    """
+
+    def __init__(self, report=None, is_cancelled=None, telemetry=None):
+        """
+        Stores the functions used to report progress and check for cancellation, and the telemetry to record to.
+        :param report: called after each generation with the generation number, the amount of evaluations,
+                       the size of the nondominated front and the seconds elapsed
+        :type report: function, optional
+        :param is_cancelled: called after each generation, returning whether the run should end there
+        :type is_cancelled: function, optional
+        :param telemetry: the telemetry each generation's statistics are recorded to
+        :type telemetry: class: `Optimisation.Telemetry.RunTelemetry`, optional
+        """
+        super().__init__()
+        self.report = report
+        self.is_cancelled = is_cancelled
+        self.telemetry = telemetry
+        self.startTime = time.perf_counter()
+
+    def notify(self, algorithm, **kwargs):
+        """
+        Reports and records the progress of the generation just completed, and forces the run to terminate if
+        it's cancelled.
+        :param algorithm: the algorithm being run
+        :type algorithm: class: `pymoo.model.algorithm.Algorithm`
+        """
+        if self.telemetry is not None:
+            self.telemetry.record(algorithm)
+        if self.report is not None:
+            frontSize = 0 if algorithm.opt is None else len(algorithm.opt)
+            self.report(algorithm.n_gen, algorithm.evaluator.n_eval, frontSize, time.perf_counter() - self.startTime)
+
+        # the run ends once the termination is next checked, which is straight after this generation
+        if self.is_cancelled is not None and self.is_cancelled():
+            algorithm.termination.force_termination = True
@@ -3,16 +3,23 @@ from collections import Counter
 import numpy as np
 from pymoo.model.crossover import Crossover
 
-from Code.Optimisation import ChromosomeController
+from Code.Optimisation import ChromosomeController, ParallelBuilder, Telemetry
 
 
 class ChrCrossover(Crossover):
     """Combines the parent chromosomes to create new offspring."""
 
-    def __init__(self):
+    def __init__(self, session):
+        """
+        Call the parent initialisation, and store the run the offspring are built for.
+        :param session: the optimisation run the offspring are built for
+        :type session: class: `Optimisation.OptimisationSession`
+        """
         # 2 parents will produce 2 offspring
         super().__init__(2, 2)
+        self.session = session
 
+    @Telemetry.timed("crossover")
     def _do(self, problem, x, **kwargs):
         """
         Takes parent chromosomes in order to produce offspring.
@@ -27,6 +34,20 @@ class ChrCrossover(Crossover):
         parents_num, matings_num, vars_num = x.shape
         output = np.full_like(x, None, dtype=np.object_)
 
+        if self.session.pool is not None:
+            # all offspring filters are chosen first, so that every offspring can be built at once
+            offspringFilters = []
+            for cross in range(matings_num):
+                parents = [x[i, cross, 0] for i in range(parents_num)]
+                offspringFilters.append(self.breed_filters(parents))
+                offspringFilters.append(self.breed_filters(parents))
+
+            offspring = ParallelBuilder.build_chromosomes(self.session, offspringFilters)
+            for cross in range(matings_num):
+                output[0, cross, 0] = offspring[cross * 2]
+                output[1, cross, 0] = offspring[cross * 2 + 1]
+            return output
+
         for cross in range(matings_num):
             # get parents and setup offspring list
             parents = []
@@ -34,8 +55,8 @@ class ChrCrossover(Crossover):
             for i in range(parents_num):
                 parents.append(x[i, cross, 0])
 
-            offspring.append(self.breed(parents))
-            offspring.append(self.breed(parents))
+            offspring.append(self.breed(self.session, parents))
+            offspring.append(self.breed(self.session, parents))
 
             # empty offspring list into the output
             for i in range(len(offspring)):
@@ -43,14 +64,26 @@ class ChrCrossover(Crossover):
         return output
 
     @staticmethod
-    def breed(parents):
+    def breed(session, parents):
         """
         Breeds all parents passed through to produce a single offspring, with randomly selected elements from the
         parents provided.
+        :param session: the optimisation run the offspring is built for
+        :type session: class: `Optimisation.OptimisationSession`
         :param parents: a list of the parent chromosomes to utilise
         :type parents: list
         :return: a new chromosome
         """
+        return ChromosomeController.build_chromosome(session, ChrCrossover.breed_filters(parents))
+
+    @staticmethod
+    def breed_filters(parents):
+        """
+        Randomly selects elements from the parents provided, to produce the filters for a single offspring.
+        :param parents: a list of the parent chromosomes to utilise
+        :type parents: list
+        :return: the filters to build the offspring with
+        """
         # randomly allocate the class, race and background from one parent
         filters = dict({"Race": None, "Class": None, "Background": None,
                         "Equipment": [], "Spells": [], "Skills": [], "Proficiencies": [], "Languages": []})
@@ -71,9 +104,7 @@ class ChrCrossover(Crossover):
         filters["Primary"] = parents[0].archs[0]
         if parents[0].archs[1] is not None:
             filters["Secondary"] = parents[0].archs[1]
-
-        chromosome = ChromosomeController.build_chromosome(filters)
-        return chromosome
+        return filters
 
     @staticmethod
     def get_ability_score(filters, abilities):
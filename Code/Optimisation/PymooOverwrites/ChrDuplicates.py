@@ -1,10 +1,53 @@
-from pymoo.model.duplicate import ElementwiseDuplicateElimination
+from pymoo.model.duplicate import DuplicateElimination
 
+from Code.Optimisation import Telemetry
 
-class ChrDuplicates(ElementwiseDuplicateElimination):
-    """Detects duplicate chromosome, which the base ElementwiseDuplicateElimination then removes."""
 
-    def is_equal(self, a, b):
+class ChrDuplicates(DuplicateElimination):
+    """Detects duplicate chromosomes by grouping them by hash, which the base DuplicateElimination then removes."""
+
+    @Telemetry.timed("duplicates")
+    def _do(self, pop, other, is_duplicate):
+        """
+        Marks each chromosome in the population that's equal to another, only comparing chromosomes sharing a hash.
+        :param pop: the population to check for duplicates
+        :type pop: class: `Pymoo.Model.Population`
+        :param other: the population to check against, or None to check the population against itself
+        :type other: class: `Pymoo.Model.Population`
+        :param is_duplicate: a boolean array, with an element for each chromosome in the population
+        :type is_duplicate: class: `numpy.ndarray`
+        :return: the boolean array, stating whether each chromosome is a duplicate
+        """
+        # chromosomes are compared on their fingerprints, so none of them need to have been evaluated yet
+        chromosomes = pop.get("X")[:, 0]
+        buckets = dict()
+        if other is not None:
+            for chromosome in other.get("X")[:, 0]:
+                buckets.setdefault(hash(chromosome), []).append(chromosome)
+            for i in range(len(chromosomes)):
+                is_duplicate[i] = self.in_buckets(buckets, chromosomes[i])
+        else:
+            # the last of any equal chromosomes is the one kept, so the population is checked from the end
+            for i in reversed(range(len(chromosomes))):
+                if self.in_buckets(buckets, chromosomes[i]):
+                    is_duplicate[i] = True
+                else:
+                    buckets.setdefault(hash(chromosomes[i]), []).append(chromosomes[i])
+        return is_duplicate
+
+    def in_buckets(self, buckets, chromosome):
+        """
+        Checks whether a chromosome is equal to any already grouped under it's hash.
+        :param buckets: a dictionary linking each hash to the chromosomes with it
+        :type buckets: dict
+        :param chromosome: the chromosome to check
+        :type chromosome: Optimisation.Chromosome
+        :return: a boolean stating whether an equal chromosome has been grouped
+        """
+        return any(self.is_equal(chromosome, other) for other in buckets.get(hash(chromosome), []))
+
+    @staticmethod
+    def is_equal(a, b):
         """
         Checks whether two character chromosome elements are equal.
         This is provided for fullness of the system - the core implementation is within the
@@ -16,4 +59,3 @@ class ChrDuplicates(ElementwiseDuplicateElimination):
         :return: a boolean stating whether they're equal
         """
         return a == b
-
@@ -2,7 +2,7 @@ import numpy as np
 from pymoo.model.mutation import Mutation
 
 from Code.Database import CharacterBuilder
-from Code.Optimisation import ChromosomeController
+from Code.Optimisation import ChromosomeController, Telemetry
 
 
 class ChrMutation(Mutation):
@@ -11,6 +11,16 @@ class ChrMutation(Mutation):
     randomResults = [["Race", "Subrace"], ["Class", "Subclass"], "Background", "Languages",
                      "Proficiencies", "Spells", "Equipment", "Skills"]
 
+    def __init__(self, session):
+        """
+        Call the parent initialisation, and store the run the mutated chromosomes are built for.
+        :param session: the optimisation run, holding the constant filters no mutation may remove
+        :type session: class: `Optimisation.OptimisationSession`
+        """
+        super().__init__()
+        self.session = session
+
+    @Telemetry.timed("mutation")
     def _do(self, problem, x, **kwargs):
         """
         Performs a randomised mutation on provided chromosomes.
@@ -38,8 +48,9 @@ class ChrMutation(Mutation):
                         newElement = element[0]
                     element = newElement
 
-                filters = CharacterBuilder.change_filter(x[i, 0].character, filters, element, elementSubdata)
-                x[i, 0] = ChromosomeController.build_chromosome(filters)
+                filters = CharacterBuilder.change_filter(x[i, 0].character, filters, element, elementSubdata,
+                                                         self.session.constFilters)
+                x[i, 0] = ChromosomeController.build_chromosome(self.session, filters)
 
         return x
 
@@ -1,23 +1,30 @@
 import numpy as np
 from pymoo.model.problem import Problem
 
+from Code.Optimisation import FitnessEngine, Telemetry
+
 
 class ChrProblem(Problem):
     """Defines the problem that the optimisation system must solve."""
 
-    def __init__(self, tag_num):
+    def __init__(self, tag_num, batched=True):
         """
         Stores the amount of tags to optimise and calls the Problem initialisation with the appropriate parameters.
         :param tag_num: the amount of tags to optimise
         :type tag_num: int
+        :param batched: whether the whole population is evaluated at once, rather than one chromosome at a time
+        :type batched: bool, optional
         """
         self.n_obj = tag_num
-        super().__init__(n_var=1, n_obj=tag_num, n_constr=0, elementwise_evaluation=True)
+        self.batched = batched
+        super().__init__(n_var=1, n_obj=tag_num, n_constr=0, elementwise_evaluation=not batched)
 
+    @Telemetry.timed("evaluation")
     def _evaluate(self, x, out, *args, **kwargs):
         """
-        Evaluates a chromosome for it's value in meeting the objectives of the task.
-        :param x: a list of the variables to evaluate.
+        Evaluates chromosomes for their value in meeting the objectives of the task.
+        When batched, x is the population matrix, with a chromosome in the single column of each row.
+        :param x: the variables to evaluate, either for one chromosome or the whole population
         :type x: list
         :param out: the output of the evaluations, with the F key for objective values and G for constraints
         :type out: dict
@@ -26,12 +33,15 @@ class ChrProblem(Problem):
         :param kwargs: arguments connected to their arg number
         :type kwargs: dict
         """
-        fitness_values = x[0].get_tag_fitness_values()
-        # change all fitness values to their negative counterparts as Pymoo only minimises
-        for i in range(self.n_obj):
-            try:
-                fitness_values[i] *= -1
-            # defensive code to set any non-covered objectives to 0. This theoretically should never be called
-            except IndexError:
-                fitness_values[i] = 0
-        out["F"] = np.array(fitness_values, dtype=float)
+        if self.batched:
+            chromosomes = list(x[:, 0])
+        else:
+            chromosomes = [x[0]]
+
+        # any non-covered objectives are set to 0, and all values are made negative as Pymoo only minimises
+        fitness_values = -FitnessEngine.evaluate_population(chromosomes, self.n_obj)
+
+        if self.batched:
+            out["F"] = fitness_values
+        else:
+            out["F"] = np.array(fitness_values[0], dtype=float)
@@ -3,12 +3,22 @@ import copy
 import numpy as np
 from pymoo.model.sampling import Sampling
 
-from Code.Optimisation import ChromosomeController
+from Code.Optimisation import ChromosomeController, ParallelBuilder, Telemetry
 
 
 class ChrSampling(Sampling):
     """A Sampling overwrite that allows the creation of character samples."""
 
+    def __init__(self, session):
+        """
+        Call the parent initialisation, and store the run the samples are built for.
+        :param session: the optimisation run, holding the constant filters every sample is built with
+        :type session: class: `Optimisation.OptimisationSession`
+        """
+        super().__init__()
+        self.session = session
+
+    @Telemetry.timed("sampling")
     def _do(self, problem, n_samples, **kwargs):
         """
         Creates a set amount of character chromosome samples.
@@ -21,8 +31,13 @@ class ChrSampling(Sampling):
         :return: a numpy array holding the chromosomes
         """
         results = np.full((n_samples, 1), None, np.object_)
-        filters = copy.deepcopy(ChromosomeController.constFilters)
-        for i in range(n_samples):
-            results[i, 0] = ChromosomeController.build_chromosome(filters)
+        filters = copy.deepcopy(self.session.constFilters)
+        if self.session.pool is not None:
+            chromosomes = ParallelBuilder.build_chromosomes(self.session, [filters] * n_samples)
+            for i in range(n_samples):
+                results[i, 0] = chromosomes[i]
+        else:
+            for i in range(n_samples):
+                results[i, 0] = ChromosomeController.build_chromosome(self.session, filters)
         return results
 
@@ -0,0 +1,44 @@
+from pymoo.model.termination import Termination
+from pymoo.performance_indicator.hv import Hypervolume
+
+
+class ChrTermination(Termination):
+    """Ends the optimisation once the hypervolume of the nondominated front stops improving."""
+
+    def __init__(self, patience, tolerance=0.001):
+        """
+        Stores how long the hypervolume may go without improving, and what counts as an improvement.
+        :param patience: the amount of generations without improvement allowed before terminating
+        :type patience: int
+        :param tolerance: the minimum relative increase in hypervolume that counts as an improvement
+        :type tolerance: float, optional
+        """
+        super().__init__()
+        self.patience = patience
+        self.tolerance = tolerance
+        self.indicator = None
+        self.bestVolume = None
+        self.stagnantGens = 0
+
+    def _do_continue(self, algorithm):
+        """
+        Measures the hypervolume of the current nondominated front, and checks whether it's still improving.
+        :param algorithm: the algorithm being run
+        :type algorithm: class: `pymoo.model.algorithm.Algorithm`
+        :return: whether the optimisation should continue
+        """
+        if algorithm.opt is None or len(algorithm.opt) == 0:
+            return True
+
+        # the reference point is fixed just beyond the worst values of the first population, so that every
+        # later hypervolume is measured against the same point
+        if self.indicator is None:
+            self.indicator = Hypervolume(ref_point=algorithm.pop.get("F").max(axis=0) + 1)
+
+        volume = self.indicator.calc(algorithm.opt.get("F"))
+        if self.bestVolume is None or volume > self.bestVolume + self.tolerance * abs(self.bestVolume):
+            self.bestVolume = volume
+            self.stagnantGens = 0
+        else:
+            self.stagnantGens += 1
+        return self.stagnantGens < self.patience
@@ -0,0 +1,76 @@
+from pymoo.util.termination.collection import TerminationCollection
+from pymoo.util.termination.max_eval import MaximumFunctionCallTermination
+from pymoo.util.termination.max_gen import MaximumGenerationTermination
+from pymoo.util.termination.max_time import TimeBasedTermination
+
+from Code.Optimisation.PymooOverwrites import ChrTermination
+
+
+class RunConfig:
+    """Stores the parameters that control a single optimisation run."""
+
+    def __init__(self, pop_size=10, generations=20, time_budget=None, seed=None, offspring_num=None,
+                 max_evaluations=None, stagnation_gens=None, stagnation_tolerance=0.001, workers=0):
+        """
+        Stores the run parameters. Any termination criteria left as None aren't used, and the run ends as soon as
+        any one of the others is met.
+        :param pop_size: the amount of chromosomes kept in each generation
+        :type pop_size: int, optional
+        :param generations: the maximum amount of generations to run for
+        :type generations: int, optional
+        :param time_budget: the maximum amount of seconds to run for
+        :type time_budget: float, optional
+        :param seed: the seed for the random choices made, or None for a random seed
+        :type seed: int, optional
+        :param offspring_num: the amount of offspring produced each generation, or None to match the pop size
+        :type offspring_num: int, optional
+        :param max_evaluations: the maximum amount of chromosome evaluations to run for
+        :type max_evaluations: int, optional
+        :param stagnation_gens: the amount of generations the hypervolume may go without improving before ending
+        :type stagnation_gens: int, optional
+        :param stagnation_tolerance: the minimum relative increase in hypervolume that counts as an improvement
+        :type stagnation_tolerance: float, optional
+        :param workers: the amount of processes to build characters across, 0 to build them all within this
+                        process, or None to use one per core
+        :type workers: int, optional
+        """
+        self.popSize = pop_size
+        self.generations = generations
+        self.timeBudget = time_budget
+        self.seed = seed
+        self.offspringNum = offspring_num
+        self.maxEvaluations = max_evaluations
+        self.stagnationGens = stagnation_gens
+        self.stagnationTolerance = stagnation_tolerance
+        self.workers = workers
+
+    def get_termination(self):
+        """
+        Builds the termination criteria the run uses.
+        :return: the pymoo Termination object, ending the run once any criteria is met
+        """
+        terminations = []
+        if self.generations is not None:
+            terminations.append(MaximumGenerationTermination(self.generations))
+        if self.timeBudget is not None:
+            terminations.append(TimeBasedTermination(self.timeBudget))
+        if self.maxEvaluations is not None:
+            terminations.append(MaximumFunctionCallTermination(self.maxEvaluations))
+        if self.stagnationGens is not None:
+            terminations.append(ChrTermination.ChrTermination(self.stagnationGens, self.stagnationTolerance))
+
+        if len(terminations) == 0:
+            raise Exception("No termination criteria were set for the optimisation run")
+        elif len(terminations) == 1:
+            return terminations[0]
+        return TerminationCollection(*terminations)
+
+    def __str__(self):
+        """
+        Converts the object to a string of it's content.
+        :return: the run parameters, in a printable layout
+        """
+        return f"A population of {self.popSize}, running for up to {self.generations} generations, " \
+               f"{self.timeBudget} seconds and {self.maxEvaluations} evaluations, stopping after " \
+               f"{self.stagnationGens} generations without improvement. Seeded with {self.seed}, " \
+               f"across {self.workers} workers."
@@ -0,0 +1,150 @@
+import json
+import sys
+import threading
+import time
+from functools import wraps
+
+try:
+    import resource
+except ImportError:
+    # the resource module is only available on unix systems, so peak memory isn't measured elsewhere
+    resource = None
+
+from pymoo.performance_indicator.hv import Hypervolume
+
+from Code.Optimisation import FitnessCache
+
+# holds the dictionary linking each phase of a generation to the seconds spent in it since the last generation was
+# recorded. each thread keeps it's own, so runs in separate threads don't mix their timings
+timingState = threading.local()
+PHASES = ("sampling", "crossover", "mutation", "evaluation", "duplicates")
+
+
+def get_phase_times():
+    """
+    Gets the phase timings of the run in the current thread.
+    :return: the dictionary linking each phase to the seconds spent in it
+    """
+    if not hasattr(timingState, "phaseTimes"):
+        timingState.phaseTimes = dict()
+    return timingState.phaseTimes
+
+
+def timed(phase):
+    """
+    Decorates an operator method, so the time spent running it is added to the given phase.
+    :param phase: the name of the phase, from PHASES
+    :type phase: str
+    :return: the decorator
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            startTime = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                phaseTimes = get_phase_times()
+                phaseTimes[phase] = phaseTimes.get(phase, 0) + time.perf_counter() - startTime
+        return wrapper
+    return decorator
+
+
+def peak_rss():
+    """
+    Gets the most memory this process has held at once.
+    :return: the peak resident set size in megabytes, or None if it can't be measured on this system
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # it's measured in bytes on macOS, and in kilobytes on other systems
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 2)
+
+
+def read_records(file_path):
+    """
+    Reads the records of a run back from it's telemetry file.
+    :param file_path: the path of the JSON lines file written by RunTelemetry
+    :type file_path: str
+    :return: a list of the record dictionaries, one for each generation
+    """
+    with open(file_path) as file:
+        return [json.loads(line) for line in file if line.strip() != ""]
+
+
+class RunTelemetry:
+    """Records the statistics of each generation of an optimisation run, optionally writing them as JSON lines."""
+
+    def __init__(self, file_path=None, hypervolume=True, session=None):
+        """
+        Starts recording a new run.
+        :param file_path: the path to write each generation's record to as a JSON line, or None to only keep them
+                          in records
+        :type file_path: str, optional
+        :param hypervolume: whether to measure the hypervolume of each front, which gets costly with many objectives
+        :type hypervolume: bool, optional
+        :param session: the session being run, to record how many chromosomes it's built and how many are still alive
+        :type session: class: `Optimisation.OptimisationSession`, optional
+        """
+        self.records = []
+        self.file = None if file_path is None else open(file_path, "w")
+        self.hypervolume = hypervolume
+        self.indicator = None
+        self.session = session
+
+        get_phase_times().clear()
+        self.lastTime = time.perf_counter()
+        self.lastHits = FitnessCache.cache.hits
+        self.lastMisses = FitnessCache.cache.misses
+
+    def record(self, algorithm):
+        """
+        Records the statistics of the generation just completed, and writes them to the file if there is one.
+        :param algorithm: the algorithm being run
+        :type algorithm: class: `pymoo.model.algorithm.Algorithm`
+        :return: the dictionary of the generation's statistics
+        """
+        currentTime = time.perf_counter()
+        phaseTimes = get_phase_times()
+        phases = {phase: round(phaseTimes.get(phase, 0), 6) for phase in PHASES}
+        wallTime = currentTime - self.lastTime
+        phases["other"] = round(max(wallTime - sum(phases.values()), 0), 6)
+        phaseTimes.clear()
+
+        hits = FitnessCache.cache.hits - self.lastHits
+        lookups = hits + FitnessCache.cache.misses - self.lastMisses
+        self.lastHits = FitnessCache.cache.hits
+        self.lastMisses = FitnessCache.cache.misses
+
+        front = algorithm.opt
+        volume = None
+        if self.hypervolume and front is not None and len(front) > 0:
+            # the reference point is fixed just beyond the worst values of the first population, as in
+            # ChrTermination, so every generation's hypervolume can be compared
+            if self.indicator is None:
+                self.indicator = Hypervolume(ref_point=algorithm.pop.get("F").max(axis=0) + 1)
+            volume = float(self.indicator.calc(front.get("F")))
+
+        record = {"generation": algorithm.n_gen, "wallTime": round(wallTime, 6), "phases": phases,
+                  "evaluations": algorithm.evaluator.n_eval, "cacheLookups": lookups,
+                  "cacheHitRate": None if lookups == 0 else round(hits / lookups, 4),
+                  "frontSize": 0 if front is None else len(front), "hypervolume": volume, "peakRss": peak_rss(),
+                  "chromosomesBuilt": None if self.session is None else self.session.builtCount,
+                  "liveChromosomes": None if self.session is None else self.session.live_count()}
+        self.records.append(record)
+        if self.file is not None:
+            self.file.write(json.dumps(record) + "\n")
+            self.file.flush()
+
+        # the time taken to record isn't counted towards the next generation
+        self.lastTime = time.perf_counter()
+        return record
+
+    def close(self):
+        """
+        Closes the telemetry file, if there is one.
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
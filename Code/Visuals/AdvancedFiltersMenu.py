@@ -1,10 +1,10 @@
 import itertools
 from functools import partial
 
-from PyQt5 import uic
 from PyQt5.QtWidgets import *
 
 from Code.Database import CoreDatabase as Db
+from Code.Visuals import UiLoader
 
 
 class AdvancedFiltersMenu:
@@ -18,7 +18,7 @@ class AdvancedFiltersMenu:
         """
         Sets up the advanced filters menu visuals.
         """
-        Form, Window = uic.loadUiType("Visuals/QtFiles/AdvancedFiltersMenu.ui")
+        Form, Window = UiLoader.load_ui("AdvancedFiltersMenu.ui")
         self.window = Window()
         self.form = Form()
         self.form.setupUi(self.window)
@@ -176,9 +176,9 @@ class AdvancedFiltersMenu:
         Sets up the screens that procedurally show the available tools as check boxes.
         """
         stack = self.centre.findChild(QStackedWidget, "toolsStack")
-        artisans, instruments, misc = uic.loadUi("Visuals/QtFiles/ToolSubmenu.ui"), \
-                                      uic.loadUi("Visuals/QtFiles/ToolSubmenu.ui"), \
-                                      uic.loadUi("Visuals/QtFiles/ToolSubmenu.ui")
+        artisans, instruments, misc = UiLoader.load_widget("ToolSubmenu.ui"), \
+                                      UiLoader.load_widget("ToolSubmenu.ui"), \
+                                      UiLoader.load_widget("ToolSubmenu.ui")
         calls = ["Artisan's tools", "Instrument"]
 
         index = 0
@@ -1,18 +1,18 @@
 from functools import partial
 
-from PyQt5 import uic
 import altair as alt
 import pandas as pd
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtWidgets import QWidget, QHBoxLayout, QPushButton, QComboBox, QLabel
 
-from Code.Optimisation import ChromosomeController
+from Code.Visuals import UiLoader
 
 
 class CharacterReview:
     """Sets up and runs the menu that allows the user to visually review a character."""
 
     controller = None
+    session = None
     selector = None
     chrComboBox = None
     data = None
@@ -21,19 +21,22 @@ class CharacterReview:
         """
         Sets up the selector menu visuals.
         """
-        Form, Window = uic.loadUiType("Visuals/QtFiles/CharacterReview.ui")
+        Form, Window = UiLoader.load_ui("CharacterReview.ui")
         self.window = Window()
         self.form = Form()
         self.form.setupUi(self.window)
         self.centre = self.window.findChild(QWidget, "centralwidget")
 
-    def begin(self, controller):
+    def begin(self, controller, session):
         """
         Begins the character review menu and visualises it.
         :param controller: the controller for the programs visuals
         :type controller: VisualsController
+        :param session: the completed optimisation run to review
+        :type session: class: `Optimisation.OptimisationSession`
         """
         self.controller = controller
+        self.session = session
         self.chrComboBox = self.centre.findChild(QComboBox, "chrComboBox")
         self.define_data()
 
@@ -41,10 +44,10 @@ class CharacterReview:
         viewSheetBtn = self.centre.findChild(QPushButton, "sheetBtn")
         viewSheetBtn.clicked.connect(partial(self.view_sheet))
 
-        archText = ChromosomeController.constFilters.get("Secondary", "")
+        archText = self.session.constFilters.get("Secondary", "")
         if archText != "":
             archText = "/" + archText
-        archText = ChromosomeController.constFilters["Primary"] + archText
+        archText = self.session.constFilters["Primary"] + archText
 
         self.centre.findChild(QLabel, "archLabel").setText(archText)
 
@@ -54,7 +57,7 @@ class CharacterReview:
         """
         headings = list()
         counter = 1
-        for chromosome in ChromosomeController.nondominatedFront:
+        for chromosome in self.session.nondominatedFront:
             name = str(counter) + ". " + chromosome.character.chrClass.name + " " + chromosome.character.race.name
             self.chrComboBox.addItem(name)
             for tag in [tuple(["Health"]) + tuple(chromosome.health), tuple(["Magic"]) + tuple(chromosome.magic)] \
@@ -69,7 +72,7 @@ class CharacterReview:
         Allows the user to view a character sheet.
         """
         charName = self.chrComboBox.currentText()
-        chromosome = ChromosomeController.nondominatedFront[int(charName.split(".")[0]) - 1]
+        chromosome = self.session.nondominatedFront[int(charName.split(".")[0]) - 1]
         self.controller.load_character_sheet(chromosome)
 
     def create_web_view(self, widget):
@@ -126,25 +129,28 @@ class CharacterReview:
         Produces a histogram for every tag that has been optimised, laid out horizontally to each other.
         :return: the produced graph
         """
-        allGraphs = self.histogram("Health")
-        allGraphs = alt.hconcat(allGraphs, self.histogram("Magic"))
-        for (tag, _, _) in ChromosomeController.nondominatedFront[0].tags:
-            allGraphs = alt.hconcat(allGraphs, self.histogram(tag))
+        front = self.session.nondominatedFront
+        allGraphs = self.histogram(front, "Health")
+        allGraphs = alt.hconcat(allGraphs, self.histogram(front, "Magic"))
+        for (tag, _, _) in front[0].tags:
+            allGraphs = alt.hconcat(allGraphs, self.histogram(front, tag))
         allGraphs.properties(
             title="Histograms"
         )
         return allGraphs
 
     @staticmethod
-    def histogram(tag):
+    def histogram(front, tag):
         """
         Produces a single histogram for a tag.
+        :param front: the chromosomes of the nondominated front
+        :type front: list
         :param tag: the tag to use the data of for the histogram
         :type tag: str
         :return: the produced graph
         """
         data = []
-        for chromosome in ChromosomeController.nondominatedFront:
+        for chromosome in front:
             tags = [tuple(["Health"]) + tuple(chromosome.health), tuple(["Magic"]) + tuple(chromosome.magic)] \
                        + chromosome.tags
             tagIndex = chromosome.get_tag_index(tag) + 2
@@ -167,7 +173,7 @@ class CharacterReview:
         Creates a bar chart for a chromosome.
         :return: the produced graph
         """
-        chromosome = ChromosomeController.nondominatedFront[0]
+        chromosome = self.session.nondominatedFront[0]
         firstName = "1. " + chromosome.character.chrClass.name + " " + chromosome.character.race.name
         self.selector = alt.selection_single(encodings=['y'], init={'y': firstName})
 
@@ -2,13 +2,13 @@ import itertools
 import math
 from functools import partial
 
-from PyQt5 import uic
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPixmap, QFont
 from PyQt5.QtWidgets import QWidget, QScrollArea, QGraphicsView, QLabel, QTabWidget, QVBoxLayout, QHBoxLayout, \
     QGridLayout, QCheckBox, QPushButton, QSpacerItem
 
 from Code.CharacterElements.PC import Character
+from Code.Visuals import UiLoader
 
 
 class CharacterSheet:
@@ -26,7 +26,7 @@ class CharacterSheet:
         :param chromosome: the chromosome holding the character to visualise
         :type chromosome: class: `Optimisation.Chromosome`
         """
-        Form, Window = uic.loadUiType("Visuals/QtFiles/CharacterSheet.ui")
+        Form, Window = UiLoader.load_ui("CharacterSheet.ui")
         self.window = Window()
         self.form = Form()
         self.form.setupUi(self.window)
@@ -212,8 +212,8 @@ class CharacterSheet:
                 nextWidget = QLabel("-")
             equipHolder.addWidget(nextWidget, counter, 2)
 
-            if equip.armorClass > 0:
-                nextWidget = QLabel(str(equip.armorClass) + " AC")
+            if equip.armorClass != 0:
+                nextWidget = QLabel(str(equip.get_armor_class(self.character.ability_mod("DEX"))) + " AC")
             else:
                 nextWidget = QLabel("-")
             equipHolder.addWidget(nextWidget, counter, 3)
@@ -1,11 +1,13 @@
 import math
 from functools import partial
 
-from PyQt5 import uic
 from PyQt5.QtCore import Qt, QObject, pyqtSignal, QThread
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QScrollArea, QLabel, QGridLayout, QPushButton
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QScrollArea, QLabel, QGridLayout, QPushButton, QSpinBox
 
-from Code.Optimisation import ChromosomeController
+from Code.Database import CoreDatabase as Db
+from Code.Optimisation import ChromosomeController, OptimisationSession, RunConfig
+from Code.Optimisation.PymooOverwrites import ChrCallback
+from Code.Visuals import UiLoader
 
 
 class ConfirmationScreen:
@@ -14,19 +16,22 @@ class ConfirmationScreen:
     controller = None
     filterVbox = QVBoxLayout()
     filters = None
+    # links each run setting's name to the spin box used to set it
+    runSettings = dict()
 
-    loadingScreenThread = None
+    worker = None
     thread = None
 
     def __init__(self):
         """
         Sets up the loading screen visuals.
         """
-        Form, Window = uic.loadUiType("Visuals/QtFiles/ConfirmationMenu.ui")
+        Form, Window = UiLoader.load_ui("ConfirmationMenu.ui")
         self.window = Window()
         self.form = Form()
         self.form.setupUi(self.window)
         self.centre = self.window.findChild(QWidget, "centralwidget")
+        self.titleText = self.centre.findChild(QLabel, "title").text()
 
     def begin(self, controller):
         """
@@ -39,6 +44,7 @@ class ConfirmationScreen:
             .findChild(QWidget, "scrollerContents").setLayout(self.filterVbox)
 
         self.extract_filters()
+        self.extract_run_settings()
         self.centre.findChild(QLabel, "loadingLabel").hide()
         self.setup_buttons()
 
@@ -51,34 +57,166 @@ class ConfirmationScreen:
         confirm = self.centre.findChild(QPushButton, "confirmBtn")
         confirm.clicked.connect(partial(self.confirmed))
         cancel = self.centre.findChild(QPushButton, "cancelBtn")
-        cancel.clicked.connect(partial(self.controller.show_selector_menu))
+        cancel.clicked.connect(partial(self.cancel_pressed))
 
     def confirmed(self):
         """
-        Upon the options being confirmed, the two buttons are replaced with a label, the title label is updated
-        and after the optimisation is complete, the next menu is loaded. This is done by connecting threads.
+        Upon the options being confirmed, the confirm button is replaced with a label, the title label is updated
+        and the optimisation is started in a worker thread, so the screen stays responsive while it runs.
+        After the optimisation is complete, the next menu is loaded.
         """
-        if self.thread is None:
-            # load a new thread and loading screen object
-            self.loadingScreenThread = LoadingScreenThread(self.centre)
-            self.thread = QThread()
+        if self.thread is not None:
+            return
+        self.show_loading(True)
 
-            # connect the thread and custom object to one another, set them to call run_optimisation upon completion,
-            # and start the thread
-            self.loadingScreenThread.moveToThread(self.thread)
-            self.thread.started.connect(self.loadingScreenThread.run)
-            self.loadingScreenThread.finished.connect(self.thread.quit)
-            self.thread.finished.connect(self.run_optimisation)
+        # the worker is moved into it's own thread, and reports back to this screen through it's signals
+        self.worker = OptimisationWorker(self.controller.filters, self.get_run_config())
+        self.thread = QThread()
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self.show_progress)
+        self.worker.finished.connect(self.optimisation_finished)
+        self.worker.cancelled.connect(self.optimisation_cancelled)
+        self.worker.failed.connect(self.optimisation_failed)
         self.thread.start()
 
-    def run_optimisation(self):
+    def cancel_pressed(self):
         """
-        Updates the screen, runs the optimisation algorithm, then launches the review screen once it's finished.
+        Cancels the optimisation if it's running, otherwise returns to the selector menu.
         """
-        self.window.show()
-        ChromosomeController.set_const_filters(self.controller.filters)
-        ChromosomeController.begin_optimising()
-        self.controller.load_character_review()
+        if self.worker is not None:
+            self.worker.cancel()
+            self.window.statusBar().showMessage("Cancelling once the current generation is complete...")
+        else:
+            self.controller.show_selector_menu()
+
+    def show_loading(self, loading):
+        """
+        Switches the screen between showing the run's settings to be confirmed, and showing it's running.
+        :param loading: whether the optimisation is running
+        :type loading: bool
+        """
+        self.centre.findChild(QPushButton, "confirmBtn").setVisible(not loading)
+        self.centre.findChild(QLabel, "loadingLabel").setVisible(loading)
+        for spinBox in self.runSettings.values():
+            spinBox.setEnabled(not loading)
+        if loading:
+            self.centre.findChild(QLabel, "title").setText("Optimisation & Visualisation Processing")
+        else:
+            self.centre.findChild(QLabel, "title").setText(self.titleText)
+
+    def show_progress(self, generation, evaluations, front_size, elapsed):
+        """
+        Shows the progress of the optimisation, after each generation is complete.
+        :param generation: the number of the generation just completed
+        :type generation: int
+        :param evaluations: the amount of chromosome evaluations made so far
+        :type evaluations: int
+        :param front_size: the amount of chromosomes on the current nondominated front
+        :type front_size: int
+        :param elapsed: the seconds since the optimisation began
+        :type elapsed: float
+        """
+        self.window.statusBar().showMessage(f"Generation {generation} - {evaluations} evaluations, "
+                                            f"{front_size} on the nondominated front, {elapsed:.1f}s elapsed")
+
+    def stop_thread(self):
+        """
+        Ends the worker's thread once it's run is over, so another run can be started.
+        """
+        self.thread.quit()
+        self.thread.wait()
+        self.thread = None
+        self.worker = None
+
+    def optimisation_finished(self, session):
+        """
+        Launches the review screen once the optimisation is complete.
+        :param session: the completed optimisation run
+        :type session: class: `Optimisation.OptimisationSession`
+        """
+        self.stop_thread()
+        self.show_loading(False)
+        self.window.statusBar().showMessage(f"Found {len(session.nondominatedFront)} characters")
+        self.controller.load_character_review(session)
+
+    def optimisation_cancelled(self):
+        """
+        Returns the screen to it's settings once the optimisation has been cancelled.
+        """
+        self.stop_thread()
+        self.show_loading(False)
+        self.window.statusBar().showMessage("Optimisation cancelled")
+
+    def optimisation_failed(self, error):
+        """
+        Returns the screen to it's settings and shows the error raised, if the optimisation fails.
+        :param error: the message of the error raised
+        :type error: str
+        """
+        self.stop_thread()
+        self.show_loading(False)
+        self.window.statusBar().showMessage("Optimisation failed: " + error)
+
+    def extract_run_settings(self):
+        """
+        Adds spin boxes to the scroll area for each of the optimisation run's settings, starting at their defaults.
+        Settings that can be left unused show their unused text at their minimum value.
+        """
+        titleLabel = QLabel("Run Settings")
+        titleLabel.setStyleSheet('font: 20pt "Imprint MT Shadow"; color: #ffffff;')
+        grid = QGridLayout()
+        self.filterVbox.addWidget(titleLabel, alignment=Qt.AlignCenter)
+        self.filterVbox.addLayout(grid)
+
+        defaults = RunConfig.RunConfig()
+        # each setting is stored as [label, minimum, maximum, default, unused text]
+        settings = {"popSize": ["Population Size", 2, 1000, defaults.popSize, ""],
+                    "offspringNum": ["Offspring Per Generation", 0, 1000, 0, "Match population"],
+                    "generations": ["Max Generations", 0, 10000, defaults.generations, "None"],
+                    "timeBudget": ["Time Budget (seconds)", 0, 86400, 0, "None"],
+                    "maxEvaluations": ["Max Evaluations", 0, 10000000, 0, "None"],
+                    "stagnationGens": ["Generations Without Improvement", 0, 1000, 0, "None"],
+                    "seed": ["Seed", -1, 2**31 - 1, -1, "Random"],
+                    "workers": ["Worker Processes", 0, 64, defaults.workers, "None"]}
+
+        self.runSettings.clear()
+        counter = 0
+        for setting, [text, minVal, maxVal, default, unusedText] in settings.items():
+            nextLabel = QLabel(text)
+            nextLabel.setStyleSheet('font: 12pt "Times New Roman"; color: rgb(188, 189, 177);')
+            spinBox = QSpinBox()
+            spinBox.setRange(minVal, maxVal)
+            spinBox.setValue(default)
+            spinBox.setSpecialValueText(unusedText)
+            spinBox.setStyleSheet('font: 12pt "Times New Roman";')
+            grid.addWidget(nextLabel, counter, 0, alignment=Qt.AlignRight)
+            grid.addWidget(spinBox, counter, 1, alignment=Qt.AlignLeft)
+            self.runSettings[setting] = spinBox
+            counter += 1
+
+    def get_run_config(self):
+        """
+        Builds the run configuration from the values of the run settings' spin boxes.
+        :return: the RunConfig object to optimise with
+        """
+        values = dict()
+        for setting, spinBox in self.runSettings.items():
+            # settings at their minimum are unused, other than the population size which is always used
+            if spinBox.value() == spinBox.minimum() and setting != "popSize":
+                values[setting] = None
+            else:
+                values[setting] = spinBox.value()
+
+        # the run always needs something to end it, so the default generation limit is used if nothing else is set
+        if all(values[setting] is None for setting in ("generations", "timeBudget", "maxEvaluations",
+                                                       "stagnationGens")):
+            values["generations"] = RunConfig.RunConfig().generations
+
+        return RunConfig.RunConfig(pop_size=values["popSize"], generations=values["generations"],
+                                   time_budget=values["timeBudget"], seed=values["seed"],
+                                   offspring_num=values["offspringNum"], max_evaluations=values["maxEvaluations"],
+                                   stagnation_gens=values["stagnationGens"], workers=values["workers"] or 0)
 
     def extract_filters(self):
         """
@@ -155,27 +293,60 @@ class ConfirmationScreen:
             counter += 1
 
 
-class LoadingScreenThread(QObject):
+class OptimisationWorker(QObject):
     """
-    An object allowing a thread to be used for the confirmation screen updates.
+    An object allowing the optimisation to be run in it's own thread, reporting it's progress through signals.
     """
-    finished = pyqtSignal()
-    def __init__(self, centre):
+    # the generation number, the amount of evaluations, the size of the nondominated front and the seconds elapsed
+    progress = pyqtSignal(int, int, int, float)
+    # the completed optimisation session, holding the nondominated front found
+    finished = pyqtSignal(object)
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, filters, config):
         """
-        Call the parent initialisation, and set the centre variable
-        :param centre: the centre object of the Qt file being threaded
-        :type centre: QtWidget
+        Call the parent initialisation, and set up the session optimising with the filters and settings.
+        :param filters: the filters applied to every chromosome
+        :type filters: dict
+        :param config: the parameters to run the optimisation with
+        :type config: class: `Optimisation.RunConfig`
         """
         super().__init__()
-        self.centre = centre
+        self.session = OptimisationSession.OptimisationSession(filters, config)
+        self.cancelRequested = False
+
+    def cancel(self):
+        """
+        Requests that the optimisation ends after the current generation. This is called directly from the interface's
+        thread rather than through a signal, as this object's own thread is busy until the optimisation ends.
+        """
+        self.cancelRequested = True
+
+    def is_cancelled(self):
+        """
+        Checks whether the optimisation has been cancelled.
+        :return: whether the optimisation should end
+        """
+        return self.cancelRequested
 
     def run(self):
         """
-        Runs the thread, which updates the confirmation screen to visually show it is preparing results.
+        Runs the optimisation, then emits the signal for how it ended.
+        The run queries the database through it's own read-only connection, as the interface's connection can only be
+        used from the interface's thread.
         """
-        self.centre.findChild(QPushButton, "confirmBtn").hide()
-        self.centre.findChild(QPushButton, "cancelBtn").hide()
-        self.centre.findChild(QLabel, "loadingLabel").show()
-        self.centre.findChild(QLabel, "title").setText("Optimisation & Visualisation Processing")
-        self.finished.emit()
+        Db.connect_read_only(this_thread=True)
+        try:
+            ChromosomeController.begin_optimising(self.session, ChrCallback.ChrCallback(self.progress.emit,
+                                                                                        self.is_cancelled))
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        finally:
+            Db.close_thread_connection()
 
+        if self.cancelRequested:
+            self.cancelled.emit()
+        else:
+            self.finished.emit(self.session)
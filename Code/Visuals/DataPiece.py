@@ -1,8 +1,8 @@
 from functools import partial
 
-from PyQt5 import uic
 from PyQt5.QtWidgets import QWidget, QPushButton, QScrollArea, QGridLayout, QLabel
 import Code.Database.CoreDatabase as Db
+from Code.Visuals import UiLoader
 
 
 class DataPiece:
@@ -20,7 +20,7 @@ class DataPiece:
         :param table: the table that the data is pulled from
         :type table: str
         """
-        Form, Window = uic.loadUiType("Visuals/QtFiles/DataPieceMenu.ui")
+        Form, Window = UiLoader.load_ui("DataPieceMenu.ui")
         self.window = Window()
         self.form = Form()
         self.form.setupUi(self.window)
@@ -76,4 +76,5 @@ class DataPiece:
             databaseCall += name + "=" + info + " AND "
         databaseCall = databaseCall[:-5]
         Db.cursor.execute(databaseCall)
+        Db.invalidate_snapshot()
         self.controller.data_piece_deleted()
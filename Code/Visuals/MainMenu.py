@@ -2,10 +2,10 @@ import threading
 import sqlite3 as sql
 from functools import partial
 
-from PyQt5 import uic
 from PyQt5.QtWidgets import QWidget, QPushButton, QApplication
 
 from Code.Database import CoreDatabase, DatabaseSetup, DataExtractor
+from Code.Visuals import UiLoader
 
 
 class MainMenu:
@@ -17,7 +17,7 @@ class MainMenu:
         """
         Sets up the main menu visuals.
         """
-        Form, Window = uic.loadUiType("Visuals/QtFiles/MainMenu.ui")
+        Form, Window = UiLoader.load_ui("MainMenu.ui")
         self.window = Window()
         self.form = Form()
         self.form.setupUi(self.window)
@@ -62,12 +62,13 @@ class MainMenu:
         Calls the systems reaction to the Dev Menu button being pressed.
         """
         CoreDatabase.connection = sql.connect(CoreDatabase.dir_path + "/Resources/ChrDatabase.db")
-        CoreDatabase.cursor = CoreDatabase.connection.cursor()
+        CoreDatabase.cursor = CoreDatabase.wrap_cursor(CoreDatabase.connection.cursor())
         print("Enter which service you'd like to use:\n"
               "1. Database Setup\n"
               "2. View Tables\n"
               "3. General testing\n"
-              "4. Exit")
+              "4. Query Profile Report\n"
+              "5. Exit")
         menu = CoreDatabase.int_input("> ")
         if menu == 1:
             DatabaseSetup.begin()
@@ -76,6 +77,8 @@ class MainMenu:
         elif menu == 3:
             # replace me with whatever needs testing!
             DataExtractor.begin()
+        elif menu == 4:
+            print(CoreDatabase.get_profile_report())
         else:
             SystemExit(0)
         CoreDatabase.complete_setup()
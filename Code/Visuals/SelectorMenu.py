@@ -1,10 +1,10 @@
 from functools import partial
 
-from PyQt5 import uic
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import *
 
 from Code.Database import CoreDatabase as Db
+from Code.Visuals import UiLoader
 
 
 class SelectorMenu:
@@ -19,7 +19,7 @@ class SelectorMenu:
         """
         Sets up the selector menu visuals.
         """
-        Form, Window = uic.loadUiType("Visuals/QtFiles/SelectorMenu.ui")
+        Form, Window = UiLoader.load_ui("SelectorMenu.ui")
         self.window = Window()
         self.form = Form()
         self.form.setupUi(self.window)
@@ -0,0 +1,89 @@
+import importlib.util
+import os
+import xml.etree.ElementTree as ElementTree
+
+from PyQt5 import uic
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+UI_PATH = dir_path + "/QtFiles/"
+COMPILED_PATH = UI_PATH + "Compiled/"
+
+# links each .ui file name to it's (form class, window class), so each file is only loaded once per run
+loadedUi = dict()
+
+
+def compiled_path(file_name):
+    """
+    Gets the path of the compiled python module for a .ui file.
+    :param file_name: the name of the .ui file within the QtFiles folder
+    :type file_name: str
+    :return: the path of the compiled module
+    """
+    return COMPILED_PATH + "Ui_" + file_name.replace(".ui", ".py")
+
+
+def compile_ui(file_name):
+    """
+    Compiles a .ui file into a python module holding it's form class and the class of the window it's set up on.
+    :param file_name: the name of the .ui file within the QtFiles folder
+    :type file_name: str
+    """
+    root = ElementTree.parse(UI_PATH + file_name).getroot()
+    formClass = "Ui_" + root.find("class").text
+    windowClass = root.find("widget").get("class")
+
+    # the module is written under a temporary name first, so a partly written module is never loaded
+    os.makedirs(COMPILED_PATH, exist_ok=True)
+    with open(compiled_path(file_name) + ".tmp", "w") as file:
+        uic.compileUi(UI_PATH + file_name, file)
+        file.write(f"\n\nformClass = {formClass}\nwindowClass = QtWidgets.{windowClass}\n")
+    os.replace(compiled_path(file_name) + ".tmp", compiled_path(file_name))
+
+
+def compile_all():
+    """
+    Compiles every .ui file in the QtFiles folder. This is run as a build step, with
+    python -m Code.Visuals.UiLoader
+    and needs rerunning after a .ui file is edited, until which that file is loaded from the .ui directly.
+    """
+    for file_name in sorted(os.listdir(UI_PATH)):
+        if file_name.endswith(".ui"):
+            compile_ui(file_name)
+            print("Compiled " + file_name)
+
+
+def load_ui(file_name):
+    """
+    Gets the form and window classes for a .ui file. These come from it's compiled module, unless the .ui file has
+    been changed since it was compiled, in which case the .ui file is loaded directly.
+    :param file_name: the name of the .ui file within the QtFiles folder
+    :type file_name: str
+    :return: the form class and the window class, in the same layout as uic.loadUiType
+    """
+    if file_name not in loadedUi:
+        compiledFile = compiled_path(file_name)
+        if os.path.exists(compiledFile) and os.path.getmtime(compiledFile) >= os.path.getmtime(UI_PATH + file_name):
+            spec = importlib.util.spec_from_file_location("Ui_" + file_name[:-3], compiledFile)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            loadedUi[file_name] = (module.formClass, module.windowClass)
+        else:
+            loadedUi[file_name] = uic.loadUiType(UI_PATH + file_name)
+    return loadedUi[file_name]
+
+
+def load_widget(file_name):
+    """
+    Builds a new widget from a .ui file, as with uic.loadUi.
+    :param file_name: the name of the .ui file within the QtFiles folder
+    :type file_name: str
+    :return: the widget built
+    """
+    Form, Window = load_ui(file_name)
+    widget = Window()
+    Form().setupUi(widget)
+    return widget
+
+
+if __name__ == "__main__":
+    compile_all()
@@ -1,13 +1,12 @@
 import itertools
 from functools import partial
 
-from PyQt5 import uic
 from PyQt5.QtGui import QTextCursor
 from PyQt5.QtWidgets import QWidget, QComboBox, QCheckBox, QTabWidget, QLabel, QScrollArea, QVBoxLayout, \
     QGridLayout, QSpinBox, QTextEdit, QDoubleSpinBox, QPushButton, QGraphicsDropShadowEffect, QGraphicsView
 
 import Code.Database.CoreDatabase as Db
-from Code.Visuals import DataPiece
+from Code.Visuals import DataPiece, UiLoader
 
 
 class VisualDatabase:
@@ -22,7 +21,7 @@ class VisualDatabase:
         """
         Sets up the database menu visuals.
         """
-        Form, Window = uic.loadUiType("Visuals/QtFiles/DatabaseMenu.ui")
+        Form, Window = UiLoader.load_ui("DatabaseMenu.ui")
         self.window = Window()
         self.form = Form()
         self.form.setupUi(self.window)
@@ -293,7 +292,7 @@ class VisualDatabase:
         :type table_name: str
         :return: a widget of the outcome
         """
-        tableVisuals = uic.loadUi("Visuals/QtFiles/RelatedTableSubmenu.ui")
+        tableVisuals = UiLoader.load_widget("RelatedTableSubmenu.ui")
         tableVisuals = self.controller.setup_shadows(tableVisuals, {"background": QGraphicsView})
         tableVisuals.findChild(QLabel, "tableName").setText(table_name)
         tableVisuals.findChild(QScrollArea, "extraInfo")\
@@ -1,9 +1,24 @@
+import importlib
+import time
 from io import StringIO
 
+from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication, QGraphicsDropShadowEffect
 
-from Code.Visuals import SelectorMenu, AdvancedFiltersMenu, ConfirmationScreen, CharacterReview, CharacterSheet, \
-    MainMenu, VisualDatabase, DataPiece
+# links each window's attribute name to the module and class it's built from, which share a name
+WINDOW_CLASSES = {"mainMenu": "MainMenu", "selectorMenu": "SelectorMenu", "advancedFiltersMenu": "AdvancedFiltersMenu",
+                  "confirmationScreen": "ConfirmationScreen", "characterReview": "CharacterReview",
+                  "visualDatabase": "VisualDatabase"}
+
+
+def import_visual(module_name):
+    """
+    Imports one of the visuals modules, which is only done once it's first needed.
+    :param module_name: the name of the module within the Visuals package
+    :type module_name: str
+    :return: the imported module
+    """
+    return importlib.import_module("Code.Visuals." + module_name)
 
 
 class VisualsController:
@@ -12,38 +27,103 @@ class VisualsController:
     advancedFiltersUsed = False
     filters = None
 
+    # this allows the QtWebEngine used in the character review to be imported after the application is created
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication([])
-    mainMenu = None
-    selectorMenu = None
-    advancedFiltersMenu = None
-    confirmationScreen = None
-    characterReview = None
-    visualDatabase = None
+    # links each window's attribute name to the window, once it has been built
+    windows = None
+    # links each startup step to the seconds it took
+    startupTimes = None
 
     thread = None
     loading = None
     character_review = None
 
-    def begin(self):
+    def begin(self, lazy=True, start_time=None):
         """
         Begins the program visuals.
+        :param lazy: whether each window should only be built when it's first used, rather than all at once
+        :type lazy: bool, optional
+        :param start_time: the time.perf_counter() value when the program was launched, to report the launch time from
+        :type start_time: float, optional
         """
+        if start_time is None:
+            start_time = time.perf_counter()
         # the declarations are done here for the potential future use of resets
-        self.mainMenu = MainMenu.MainMenu()
-        self.selectorMenu = SelectorMenu.SelectorMenu()
-        self.advancedFiltersMenu = AdvancedFiltersMenu.AdvancedFiltersMenu()
-        self.confirmationScreen = ConfirmationScreen.ConfirmationScreen()
-        self.characterReview = CharacterReview.CharacterReview()
-        self.visualDatabase = VisualDatabase.VisualDatabase()
+        self.windows = dict()
+        self.startupTimes = dict()
+        self.startupTimes["Launch to visuals"] = time.perf_counter() - start_time
+        if not lazy:
+            for name in WINDOW_CLASSES:
+                self.get_window(name)
         self.advancedFiltersUsed = False
         self.filters = dict()
         self.mainMenu.begin(self)
+        self.startupTimes["Launch to main menu"] = time.perf_counter() - start_time
+        print(self.get_startup_report())
         self.app.exec_()
 
+    def get_window(self, name):
+        """
+        Gets a window, importing it's module and building it if it hasn't been used yet.
+        :param name: the attribute name of the window
+        :type name: str
+        :return: the window object
+        """
+        if name not in self.windows:
+            start = time.perf_counter()
+            className = WINDOW_CLASSES[name]
+            self.windows[name] = getattr(import_visual(className), className)()
+            self.startupTimes[className] = time.perf_counter() - start
+        return self.windows[name]
+
+    def hide_window(self, name):
+        """
+        Hides a window, if it has been built.
+        :param name: the attribute name of the window
+        :type name: str
+        """
+        if name in self.windows:
+            self.windows[name].window.hide()
+
+    def get_startup_report(self):
+        """
+        Gets how long each startup step and window build has taken so far.
+        :return: a string of each step, with the time it took
+        """
+        output = "Startup times:\n"
+        for step, seconds in self.startupTimes.items():
+            output += f"    {step}: {seconds * 1000:.1f}ms\n"
+        return output
+
+    @property
+    def mainMenu(self):
+        return self.get_window("mainMenu")
+
+    @property
+    def selectorMenu(self):
+        return self.get_window("selectorMenu")
+
+    @property
+    def advancedFiltersMenu(self):
+        return self.get_window("advancedFiltersMenu")
+
+    @property
+    def confirmationScreen(self):
+        return self.get_window("confirmationScreen")
+
+    @property
+    def characterReview(self):
+        return self.get_window("characterReview")
+
+    @property
+    def visualDatabase(self):
+        return self.get_window("visualDatabase")
+
     def return_to_main_menu(self):
         """Returns to the main menu."""
-        self.visualDatabase.window.hide()
-        self.selectorMenu.window.hide()
+        self.hide_window("visualDatabase")
+        self.hide_window("selectorMenu")
         self.mainMenu.window.show()
 
     def start_selector_menu(self):
@@ -58,8 +138,8 @@ class VisualsController:
     def show_selector_menu(self):
         """Shows the selector menu, when returned to from the confirmation screen"""
         self.selectorMenu.window.show()
-        self.confirmationScreen.window.hide()
-        self.mainMenu.window.hide()
+        self.hide_window("confirmationScreen")
+        self.hide_window("mainMenu")
 
     def start_advanced_filters_menu(self):
         """
@@ -97,11 +177,13 @@ class VisualsController:
         self.selectorMenu.window.hide()
         self.confirmationScreen.window.show()
 
-    def load_character_review(self):
+    def load_character_review(self, session):
         """
         Starts up the character review menu.
+        :param session: the completed optimisation run to review
+        :type session: class: `Optimisation.OptimisationSession`
         """
-        self.characterReview.begin(self)
+        self.characterReview.begin(self, session)
         self.confirmationScreen.window.hide()
         self.characterReview.window.show()
 
@@ -111,7 +193,7 @@ class VisualsController:
         :param chromosome: the character for the sheet to visualise
         :type chromosome: class: `CharacterElements.Chromosome`
         """
-        CharacterSheet.CharacterSheet(self, chromosome)
+        import_visual("CharacterSheet").CharacterSheet(self, chromosome)
 
     def open_view_popup(self, info, table):
         """
@@ -121,7 +203,7 @@ class VisualsController:
         :param table: the table the info is from
         :type table: str
         """
-        DataPiece.DataPiece(self, info, table)
+        import_visual("DataPiece").DataPiece(self, info, table)
 
     def data_piece_deleted(self):
         """
@@ -1,5 +1,11 @@
+import sys
+import time
+
+# taken before anything else is imported, so the startup report includes the time spent importing
+startTime = time.perf_counter()
+
+from Code.Database import CoreDatabase
 from Database import DataConverter
-from Optimisation import ChromosomeController
 from Visuals import VisualsController
 
 
@@ -7,14 +13,23 @@ visuals = VisualsController.VisualsController()
 
 
 def testing():
+    from Optimisation import ChromosomeController
     ChromosomeController.begin()
 
 
 def begin():
     """
-    Begins the program.
+    Begins the program. Unless --eager is passed, the equipment and spell catalogues and each window are only loaded
+    when they're first needed. If --profile-sql is passed, every database statement is recorded, and a report of
+    them is printed upon exiting.
     """
-    DataConverter.create_all_equipment()
-    visuals.begin()
+    if "--profile-sql" in sys.argv:
+        CoreDatabase.enable_profiling(report_at_exit=True)
+    eager = "--eager" in sys.argv
+    if eager:
+        DataConverter.load_catalogues()
+    visuals.begin(lazy=not eager, start_time=startTime)
+
 
-begin()
+if __name__ == "__main__":
+    begin()